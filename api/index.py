@@ -3,18 +3,143 @@ FireWatch AI - Complete Dashboard API
 All features: hotspots, weather, risk, spread prediction, emissions, evacuation
 """
 
+import asyncio
+import csv
+import gzip
+import hashlib
 import json
 import os
 import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from string import Template
 from urllib.request import urlopen, Request
 from urllib.parse import parse_qs, urlparse
 from http.server import BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
+
+# Optional imports (may not be available in serverless)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import rcssmin
+    RCSSMIN_AVAILABLE = True
+except ImportError:
+    rcssmin = None
+    RCSSMIN_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
 FIRMS_API_KEY = os.environ.get("FIRMS_API_KEY", "")
 FIRMS_BASE_URL = "https://firms.modaps.eosdis.nasa.gov/api"
 WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
 
+# Constant parts of the upstream URLs; only the key, area and point vary
+FIRMS_AREA_URL = FIRMS_BASE_URL + "/area/csv/"
+FIRMS_SOURCE = "VIIRS_NOAA20_NRT"
+WEATHER_URL_PREFIX = WEATHER_API_URL + "?latitude="
+WEATHER_URL_SUFFIX = (
+    "&current=temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,precipitation"
+    "&timezone=auto"
+)
+
+# Shared pool for overlapping blocking upstream calls (urlopen releases the GIL);
+# its size caps concurrent requests against Open-Meteo
+UPSTREAM_MAX_CONCURRENCY = 20
+_upstream_pool = ThreadPoolExecutor(max_workers=UPSTREAM_MAX_CONCURRENCY, thread_name_prefix="firewatch-upstream")
+
+# Keep-alive connections to FIRMS/Open-Meteo shared across requests, so warm
+# invocations skip the TCP and TLS handshakes; sized to match the pool above
+USER_AGENT = "FireWatch-AI/1.0"
+_http_client = httpx.Client(
+    headers={"User-Agent": USER_AGENT},
+    follow_redirects=True,
+    limits=httpx.Limits(
+        max_connections=UPSTREAM_MAX_CONCURRENCY,
+        max_keepalive_connections=UPSTREAM_MAX_CONCURRENCY
+    )
+) if HTTPX_AVAILABLE else None
+
+# Upstream response caches: forecasts move slowly at ~1 km / 15 min scale and
+# FIRMS NRT windows are refreshed at most a few times per hour
+WEATHER_CACHE_SIZE = 1024
+WEATHER_CACHE_TTL = 900
+FIRMS_CACHE_SIZE = 128
+FIRMS_CACHE_TTL = 3600
+FIRMS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIRMS_MAX_RESPONSE_BYTES = 20 * 1024 * 1024
+
+# Responses up to this size leave the handler in a single write() with their
+# headers; larger bodies are written separately rather than copied
+RESPONSE_COALESCE_MAX_BYTES = 256 * 1024
+
+# Dynamic JSON bodies at least this large are compressed per request when the
+# client accepts it, at cheap levels since it runs on every response
+DYNAMIC_COMPRESS_MIN_BYTES = 1024
+DYNAMIC_ZSTD_LEVEL = 3
+DYNAMIC_BROTLI_QUALITY = 4
+DYNAMIC_GZIP_LEVEL = 1
+
+# Exact coordinates memoised by get_state/get_biome (dashboard clicks and
+# map refreshes repeat the same points)
+REGION_CACHE_SIZE = 8192
+
+# Degrees of latitude to distance (spherical approximation)
+KM_PER_DEG = 111.0
+M_PER_DEG = 111000.0
+INV_KM_PER_DEG = 1.0 / KM_PER_DEG
+
+# Cluster grid cells are padded slightly past the search radius so float32
+# rounding in the distance test can never reach beyond the 3x3 neighbourhood
+CLUSTER_CELL_MARGIN = 1.001
+
+# Map clusters: hotspots sharing a MAP_CLUSTER_RADIUS-pixel Web Mercator
+# cell at the requested zoom are drawn as one marker; past the max zoom
+# every hotspot is returned on its own
+MAP_TILE_SIZE = 256
+MAP_CLUSTER_RADIUS = 50
+MAP_CLUSTER_MAX_ZOOM = 14
+MAP_MAX_LAT = 85.05112878
+
 # ============================================================================
 # Biome Data
 # ============================================================================
@@ -94,25 +219,284 @@ BIOMES = {
     }
 }
 
+# ============================================================================
+# Region Lookup Grid
+# ============================================================================
+# Every state/biome bound lies on a 0.1 degree grid, so a raster of that
+# resolution answers point-in-rectangle queries with a single array load.
+# Earlier entries win on overlap, matching the order of a linear scan.
+GRID_INV_RES = 10.0
+GRID_EPS = 1e-9
+GRID_NODATA = 255
+GRID_WEST = min(min(b["west"] for b in STATES.values()), min(d["bounds"]["west"] for d in BIOMES.values()))
+GRID_SOUTH = min(min(b["south"] for b in STATES.values()), min(d["bounds"]["south"] for d in BIOMES.values()))
+GRID_EAST = max(max(b["east"] for b in STATES.values()), max(d["bounds"]["east"] for d in BIOMES.values()))
+GRID_NORTH = max(max(b["north"] for b in STATES.values()), max(d["bounds"]["north"] for d in BIOMES.values()))
+GRID_ROWS = int(round((GRID_NORTH - GRID_SOUTH) * GRID_INV_RES))
+GRID_COLS = int(round((GRID_EAST - GRID_WEST) * GRID_INV_RES))
+
+STATE_NAMES = list(STATES)
+BIOME_NAMES = list(BIOMES)
+DEFAULT_BIOME = {"carbon_tons_ha": 50, "recovery_years": 20, "spread_factor": 1.0}
+
+
+def _build_region_grid(bounds_list):
+    """Rasterize a list of bounds into a uint8 index grid."""
+    grid = np.full((GRID_ROWS, GRID_COLS), GRID_NODATA, dtype=np.uint8)
+    for idx in reversed(range(len(bounds_list))):
+        b = bounds_list[idx]
+        iy0 = int(round((b["south"] - GRID_SOUTH) * GRID_INV_RES))
+        iy1 = int(round((b["north"] - GRID_SOUTH) * GRID_INV_RES))
+        ix0 = int(round((b["west"] - GRID_WEST) * GRID_INV_RES))
+        ix1 = int(round((b["east"] - GRID_WEST) * GRID_INV_RES))
+        grid[iy0:iy1, ix0:ix1] = idx
+    return grid
+
+
+STATE_GRID = _build_region_grid([STATES[name] for name in STATE_NAMES])
+BIOME_GRID = _build_region_grid([BIOMES[name]["bounds"] for name in BIOME_NAMES])
+
+def _build_region_buckets(bounds_list):
+    """Index bounds by the 1 degree buckets they touch, keeping priority order.
+
+    Buckets are closed on every side, so a rectangle edge lying on a bucket
+    boundary is listed in both neighbours and exact edge tests stay correct.
+    """
+    buckets = {}
+    for idx, b in enumerate(bounds_list):
+        for iy in range(math.floor(b["south"]), math.floor(b["north"]) + 1):
+            for ix in range(math.floor(b["west"]), math.floor(b["east"]) + 1):
+                buckets.setdefault((iy, ix), []).append(idx)
+    return {key: tuple(indices) for key, indices in buckets.items()}
+
+
+# Candidate lists for exact point-in-rectangle tests on grid lines
+STATE_BUCKETS = _build_region_buckets([STATES[name] for name in STATE_NAMES])
+BIOME_BUCKETS = _build_region_buckets([BIOMES[name]["bounds"] for name in BIOME_NAMES])
+
+# (west, south, east, north) rows in priority order for vectorized edge tests;
+# float64 so closed edges compare exactly against float64 coordinates
+STATE_BOUNDS = np.array(
+    [[STATES[n]["west"], STATES[n]["south"], STATES[n]["east"], STATES[n]["north"]] for n in STATE_NAMES]
+)
+BIOME_BOUNDS = np.array(
+    [[BIOMES[n]["bounds"][k] for k in ("west", "south", "east", "north")] for n in BIOME_NAMES]
+)
+
+# Nested-list views for scalar lookups (avoids NumPy scalar indexing overhead)
+STATE_ROWS = STATE_GRID.tolist()
+BIOME_ROWS = BIOME_GRID.tolist()
+
+
+def _grid_cell(lat, lon):
+    """Map a coordinate to its (row, col) grid cell.
+
+    Returns None for points on a grid line: they may sit on a closed rectangle
+    edge, which the raster cannot represent, so callers fall back to a scan.
+    NaN/infinite coordinates also return None; the scan matches no region.
+    """
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    fy = (lat - GRID_SOUTH) * GRID_INV_RES
+    fx = (lon - GRID_WEST) * GRID_INV_RES
+    if abs(fy - round(fy)) < GRID_EPS or abs(fx - round(fx)) < GRID_EPS:
+        return None
+    return math.floor(fy), math.floor(fx)
+
+
+def _grid_cells(lats, lons):
+    """Vectorized _grid_cell; returns row/col arrays plus inside/on-line masks."""
+    fy = (np.asarray(lats, dtype=np.float64) - GRID_SOUTH) * GRID_INV_RES
+    fx = (np.asarray(lons, dtype=np.float64) - GRID_WEST) * GRID_INV_RES
+    # Non-finite coordinates fail every comparison, so they land outside
+    with np.errstate(invalid="ignore"):
+        on_line = (np.abs(fy - np.rint(fy)) < GRID_EPS) | (np.abs(fx - np.rint(fx)) < GRID_EPS)
+    iy = np.floor(fy)
+    ix = np.floor(fx)
+    inside = (iy >= 0) & (iy < GRID_ROWS) & (ix >= 0) & (ix < GRID_COLS)
+    iy = np.where(inside, iy, 0).astype(np.intp)
+    ix = np.where(inside, ix, 0).astype(np.intp)
+    return iy, ix, inside, on_line
+
+
+def _scan_bounds_bulk(bounds, lats, lons):
+    """Return the first bounds row containing each point, or -1 if none does."""
+    lats = np.asarray(lats, dtype=np.float64)[:, None]
+    lons = np.asarray(lons, dtype=np.float64)[:, None]
+    hits = (
+        (bounds[:, 0] <= lons) & (lons <= bounds[:, 2])
+        & (bounds[:, 1] <= lats) & (lats <= bounds[:, 3])
+    )
+    first = np.argmax(hits, axis=1)
+    return np.where(hits[np.arange(len(first)), first], first, -1)
+
+
+def _grid_lookup(rows, lat, lon):
+    """Return the grid index at a coordinate, GRID_NODATA if outside, None if ambiguous."""
+    cell = _grid_cell(lat, lon)
+    if cell is None:
+        return None
+    iy, ix = cell
+    if 0 <= iy < GRID_ROWS and 0 <= ix < GRID_COLS:
+        return rows[iy][ix]
+    return GRID_NODATA
+
+
+# ============================================================================
+# Upstream Cache
+# ============================================================================
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL.
+
+    Bounded by entry count and, optionally, by the summed size reported
+    for each entry. loading() lets concurrent misses on one key share a
+    single upstream fetch.
+    """
+
+    def __init__(self, maxsize, ttl, max_bytes=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}  # key -> [lock, waiters]
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._evict(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, size=0):
+        """Store a value, evicting least recently used entries over budget."""
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._evict(key)
+            self._data[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._evict(next(iter(self._data)))
+
+    @contextmanager
+    def loading(self, key):
+        """Hold the per-key load lock so only one caller fetches a miss.
+
+        Callers re-check get() once inside; everyone queued behind the
+        first loader then finds the value it stored.
+        """
+        with self._lock:
+            entry = self._loading.get(key)
+            if entry is None:
+                entry = self._loading[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._loading[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _evict(self, key):
+        self._bytes -= self._data.pop(key)[1]
+
+
+_weather_cache = TTLCache(WEATHER_CACHE_SIZE, WEATHER_CACHE_TTL)
+_firms_cache = TTLCache(FIRMS_CACHE_SIZE, FIRMS_CACHE_TTL, FIRMS_CACHE_MAX_BYTES)
+
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
-def get_state(lat, lon):
-    """Determine Brazilian state based on coordinates."""
-    for name, bounds in STATES.items():
+def _bucket_key(lat, lon):
+    """1 degree bucket of a coordinate, or None if it is not finite."""
+    if not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    return math.floor(lat), math.floor(lon)
+
+
+def _scan_state(lat, lon):
+    """Determine Brazilian state by testing the candidates in the point's bucket."""
+    for idx in STATE_BUCKETS.get(_bucket_key(lat, lon), ()):
+        bounds = STATES[STATE_NAMES[idx]]
         if bounds["west"] <= lon <= bounds["east"] and bounds["south"] <= lat <= bounds["north"]:
-            return name
+            return STATE_NAMES[idx]
     return "Brasil"
 
 
+def _scan_biome(lat, lon):
+    """Determine biome by testing the candidates in the point's bucket."""
+    for idx in BIOME_BUCKETS.get(_bucket_key(lat, lon), ()):
+        name = BIOME_NAMES[idx]
+        b = BIOMES[name]["bounds"]
+        if b["west"] <= lon <= b["east"] and b["south"] <= lat <= b["north"]:
+            return name, BIOMES[name]
+    return "Desconhecido", DEFAULT_BIOME
+
+
+@lru_cache(maxsize=REGION_CACHE_SIZE)
+def get_state(lat, lon):
+    """Determine Brazilian state based on coordinates."""
+    idx = _grid_lookup(STATE_ROWS, lat, lon)
+    if idx is None:
+        return _scan_state(lat, lon)
+    return STATE_NAMES[idx] if idx != GRID_NODATA else "Brasil"
+
+
+@lru_cache(maxsize=REGION_CACHE_SIZE)
 def get_biome(lat, lon):
     """Determine biome based on coordinates."""
-    for name, data in BIOMES.items():
-        b = data["bounds"]
-        if b["west"] <= lon <= b["east"] and b["south"] <= lat <= b["north"]:
-            return name, data
-    return "Desconhecido", {"carbon_tons_ha": 50, "recovery_years": 20, "spread_factor": 1.0}
+    idx = _grid_lookup(BIOME_ROWS, lat, lon)
+    if idx is None:
+        return _scan_biome(lat, lon)
+    if idx == GRID_NODATA:
+        return "Desconhecido", DEFAULT_BIOME
+    name = BIOME_NAMES[idx]
+    return name, BIOMES[name]
+
+
+def get_states_bulk(lats, lons):
+    """Determine Brazilian states for arrays of coordinates."""
+    iy, ix, inside, on_line = _grid_cells(lats, lons)
+    idx = np.where(inside, STATE_GRID[iy, ix], GRID_NODATA)
+    if on_line.any():
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        scanned = _scan_bounds_bulk(STATE_BOUNDS, lats[on_line], lons[on_line])
+        idx[on_line] = np.where(scanned >= 0, scanned, GRID_NODATA)
+    return [STATE_NAMES[i] if i != GRID_NODATA else "Brasil" for i in idx.tolist()]
+
+
+def get_biomes_bulk(lats, lons):
+    """Determine biome names for arrays of coordinates."""
+    iy, ix, inside, on_line = _grid_cells(lats, lons)
+    idx = np.where(inside, BIOME_GRID[iy, ix], GRID_NODATA)
+    if on_line.any():
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        scanned = _scan_bounds_bulk(BIOME_BOUNDS, lats[on_line], lons[on_line])
+        idx[on_line] = np.where(scanned >= 0, scanned, GRID_NODATA)
+    return [BIOME_NAMES[i] if i != GRID_NODATA else "Desconhecido" for i in idx.tolist()]
 
 
 def calculate_risk_index(temp, humidity, wind_speed, days_without_rain):
@@ -133,6 +517,27 @@ def calculate_risk_index(temp, humidity, wind_speed, days_without_rain):
     return round(min(100, max(0, risk)), 1)
 
 
+def calculate_risk_index_bulk(temps, humidities, wind_speeds, days_without_rain):
+    """Calculate fire risk indices (0-100) for arrays of conditions.
+
+    The four factors of calculate_risk_index as one NumPy expression; inputs
+    broadcast against each other. Values are left unrounded, like the other
+    batch kernels; round(value, 1) gives what calculate_risk_index returns.
+    """
+    temps = np.asarray(temps, dtype=np.float64)
+    humidities = np.asarray(humidities, dtype=np.float64)
+    wind_speeds = np.asarray(wind_speeds, dtype=np.float64)
+    days_without_rain = np.asarray(days_without_rain, dtype=np.float64)
+
+    risk = (
+        np.clip((temps - 20) * 1.25, 0, 25)
+        + np.maximum(0, 25 - (humidities * 0.3))
+        + np.minimum(25, wind_speeds * 0.5)
+        + np.minimum(25, days_without_rain * 1.5)
+    )
+    return np.clip(risk, 0, 100)
+
+
 def get_risk_level(risk_index):
     """Get risk level from index."""
     if risk_index >= 80:
@@ -174,1991 +579,1618 @@ def calculate_emissions(area_ha, carbon_tons_ha, combustion_factor=0.5):
     }
 
 
+# ============================================================================
+# Batch Kernels
+# ============================================================================
+# NumPy kernels that handle many fires in one pass; the scalar entry points
+# wrap them.
+
+def predict_fire_perimeter_batch(center_lats, center_lons, areas_ha, wind_directions, hours=6):
+    """Predict fire perimeters for many fires at once.
+
+    Returns a dict of (fires, hours) arrays: area_ha, radius_m, center_lat
+    and center_lon, one row per fire and one column per forecast hour.
+    """
+    center_lats = np.atleast_1d(np.asarray(center_lats, dtype=np.float64))
+    center_lons = np.atleast_1d(np.asarray(center_lons, dtype=np.float64))
+    areas_ha = np.atleast_1d(np.asarray(areas_ha, dtype=np.float64))
+    wind_rad = np.radians(np.atleast_1d(np.asarray(wind_directions, dtype=np.float64)))[:, None]
+    hours = max(0, int(hours))
+
+    # Area grows with time (simplified model); seeding the cumulative product
+    # with the initial area keeps the hour-by-hour multiplication order
+    hour = np.arange(1, hours + 1, dtype=np.float64)
+    steps = np.empty((len(areas_ha), hours + 1))
+    steps[:, 0] = areas_ha
+    steps[:, 1:] = 1.15 + (hour * 0.02)  # Accelerating growth
+    area = np.cumprod(steps, axis=1)[:, 1:]
+
+    # Approximate radius, with the centre pushed downwind
+    radius_m = np.sqrt(area * 10000 / math.pi)
+    offset_lat = (radius_m / M_PER_DEG) * np.cos(wind_rad) * 0.7
+    offset_lon = (radius_m / (M_PER_DEG * np.cos(np.radians(center_lats))[:, None])) * np.sin(wind_rad) * 0.7
+
+    return {
+        "area_ha": area,
+        "radius_m": radius_m,
+        "center_lat": center_lats[:, None] + offset_lat,
+        "center_lon": center_lons[:, None] + offset_lon
+    }
+
+
 def predict_fire_perimeter(center_lat, center_lon, area_ha, wind_direction, hours=6):
     """Predict fire perimeter over time."""
-    predictions = []
-    current_area = area_ha
+    p = predict_fire_perimeter_batch(center_lat, center_lon, area_ha, wind_direction, hours)
 
-    for hour in range(1, hours + 1):
-        # Area grows with time (simplified model)
-        growth_rate = 1.15 + (hour * 0.02)  # Accelerating growth
-        current_area *= growth_rate
+    return [
+        {
+            "hour": hour,
+            "area_ha": round(area, 1),
+            "radius_m": round(radius, 0),
+            "center_lat": round(lat, 6),
+            "center_lon": round(lon, 6)
+        }
+        for hour, area, radius, lat, lon in zip(
+            range(1, hours + 1),
+            p["area_ha"][0].tolist(),
+            p["radius_m"][0].tolist(),
+            p["center_lat"][0].tolist(),
+            p["center_lon"][0].tolist()
+        )
+    ]
+
+
+# Hotspot column table layout. Numeric columns are float32 arrays (FIRMS
+# publishes at most 5 decimals for coordinates and 2 for brightness/FRP,
+# well within float32 precision); low-cardinality text columns are stored as
+# uint8 codes into a "<name>_labels" list; acq_datetime stays a list of str.
+HOTSPOT_DTYPE = np.float32
+HOTSPOT_NUMERIC_COLUMNS = ("latitude", "longitude", "brightness", "frp")
+HOTSPOT_CODED_COLUMNS = ("confidence", "satellite", "daynight")
+HOTSPOT_COLUMNS = HOTSPOT_NUMERIC_COLUMNS + ("confidence", "acq_datetime", "satellite", "daynight")
+HOTSPOT_DECIMALS = {"latitude": 5, "longitude": 5, "brightness": 2, "frp": 2}
+
+# Packed little-endian record served by /api/hotspots.bin (22 bytes each).
+# confidence/daynight are codes into the label lists sent in the
+# X-Confidence-Labels / X-Daynight-Labels headers; acq_time is Unix seconds
+HOTSPOT_RECORD_DTYPE = np.dtype([
+    ("latitude", "<f4"), ("longitude", "<f4"), ("frp", "<f4"), ("brightness", "<f4"),
+    ("confidence", "u1"), ("daynight", "u1"), ("acq_time", "<u4")
+])
+
+
+def _encode_labels(values):
+    """Encode a list of strings as (codes, labels) with the smallest uint dtype."""
+    labels = list(dict.fromkeys(values))
+    lookup = {v: i for i, v in enumerate(labels)}
+    dtype = np.uint8 if len(labels) <= 256 else np.uint16 if len(labels) <= 65536 else np.uint32
+    codes = np.fromiter(map(lookup.__getitem__, values), dtype=dtype, count=len(values))
+    return codes, labels
+
+
+def _build_table(numeric, text):
+    """Assemble a hotspot table from numeric arrays and text lists."""
+    table = {name: np.asarray(numeric[name], dtype=HOTSPOT_DTYPE) for name in HOTSPOT_NUMERIC_COLUMNS}
+    for name in HOTSPOT_CODED_COLUMNS:
+        table[name], table[name + "_labels"] = _encode_labels(text[name])
+    table["acq_datetime"] = text["acq_datetime"]
+    return table
+
+
+def dequantize(values, name):
+    """Recover float64 values of a numeric hotspot column at FIRMS precision."""
+    return np.round(np.asarray(values, dtype=np.float64), HOTSPOT_DECIMALS[name])
+
+
+def hotspots_to_table(records):
+    """Convert a list of hotspot dicts into a column table."""
+    n = len(records)
+    numeric = {
+        name: np.fromiter((r[name] for r in records), dtype=HOTSPOT_DTYPE, count=n)
+        for name in HOTSPOT_NUMERIC_COLUMNS
+    }
+    text = {name: [r[name] for r in records] for name in HOTSPOT_CODED_COLUMNS + ("acq_datetime",)}
+    return _build_table(numeric, text)
+
+
+def hotspots_to_records(table, limit=None):
+    """Convert a column table back into a list of hotspot dicts."""
+    columns = []
+    for name in HOTSPOT_COLUMNS:
+        if name in HOTSPOT_NUMERIC_COLUMNS:
+            columns.append(dequantize(table[name][:limit], name).tolist())
+        elif name in HOTSPOT_CODED_COLUMNS:
+            labels = table[name + "_labels"]
+            columns.append([labels[c] for c in table[name][:limit].tolist()])
+        else:
+            columns.append(table[name][:limit])
+    return [dict(zip(HOTSPOT_COLUMNS, row)) for row in zip(*columns)]
+
+
+def take_hotspots(table, indices):
+    """Rows of a column table at the given positions, as a new table."""
+    subset = {name: table[name][indices] for name in HOTSPOT_NUMERIC_COLUMNS + HOTSPOT_CODED_COLUMNS}
+    for name in HOTSPOT_CODED_COLUMNS:
+        subset[name + "_labels"] = table[name + "_labels"]
+    subset["acq_datetime"] = [table["acq_datetime"][i] for i in indices.tolist()]
+    return subset
+
+
+def _acq_epochs(values):
+    """Unix seconds of "YYYY-MM-DD HHMM" acquisition times (0 if unparseable)."""
+    epochs = np.zeros(len(values), dtype=np.uint32)
+    for i, value in enumerate(values):
+        try:
+            day = np.datetime64(value[:10], "D")
+            hhmm = int(value[11:])
+        except (ValueError, TypeError):
+            continue
+        if not np.isnat(day):
+            epochs[i] = int(day.astype(np.int64)) * 86400 + (hhmm // 100) * 3600 + (hhmm % 100) * 60
+    return epochs
+
+
+def hotspots_to_bytes(table):
+    """Pack a column table into HOTSPOT_RECORD_DTYPE records."""
+    records = np.empty(hotspot_count(table), dtype=HOTSPOT_RECORD_DTYPE)
+    for name in HOTSPOT_NUMERIC_COLUMNS:
+        records[name] = table[name]
+    records["confidence"] = table["confidence"]
+    records["daynight"] = table["daynight"]
+    records["acq_time"] = _acq_epochs(table["acq_datetime"])
+    return records.tobytes()
+
+
+def hotspot_count(table):
+    """Number of hotspots in a column table."""
+    return len(table["latitude"])
+
+
+def _parse_csv_rows(lines, headers):
+    """Tolerant row-by-row parser; skips malformed rows."""
+    col = {name: i for i, name in enumerate(headers)}
+    width = len(headers)
+
+    # Missing columns read their default from the tail of a padded row
+    fields = (("latitude", 0), ("longitude", 0), ("bright_ti4", 0), ("brightness", 0), ("frp", 0),
+              ("confidence", "n"), ("acq_date", ""), ("acq_time", ""), ("satellite", "Unknown"), ("daynight", "D"))
+    padding = []
+    indices = []
+    for name, default in fields:
+        if name in col:
+            indices.append(col[name])
+        else:
+            indices.append(width + len(padding))
+            padding.append(default)
+    pick = itemgetter(*indices)
 
-        # Calculate approximate radius
-        radius_m = math.sqrt(current_area * 10000 / math.pi)
+    hotspots = []
+    for row in csv.reader(lines):
+        if len(row) < width:
+            continue
+        if padding:
+            row = row[:width] + padding
+        lat, lon, bright_ti4, brightness, frp, confidence, acq_date, acq_time, satellite, daynight = pick(row)
+        try:
+            hotspots.append({
+                "latitude": float(lat),
+                "longitude": float(lon),
+                "brightness": float(bright_ti4 or brightness or 0),
+                "frp": float(frp or 0),
+                "confidence": confidence,
+                "acq_datetime": "{} {}".format(acq_date, acq_time),
+                "satellite": satellite,
+                "daynight": daynight,
+            })
+        except ValueError:
+            continue
 
-        # Calculate spread direction (wind pushes fire)
-        wind_rad = math.radians(wind_direction)
-        offset_lat = (radius_m / 111000) * math.cos(wind_rad) * 0.7
-        offset_lon = (radius_m / (111000 * math.cos(math.radians(center_lat)))) * math.sin(wind_rad) * 0.7
+    return hotspots
 
-        predictions.append({
-            "hour": hour,
-            "area_ha": round(current_area, 1),
-            "radius_m": round(radius_m, 0),
-            "center_lat": round(center_lat + offset_lat, 6),
-            "center_lon": round(center_lon + offset_lon, 6)
-        })
 
-    return predictions
+def _parse_csv_fast(lines, headers):
+    """Parse well-formed CSV rows with NumPy's C reader.
+
+    Raises ValueError on ragged rows or blank/invalid numeric fields, which
+    the caller handles by falling back to the tolerant parser.
+    """
+    separators = len(headers) - 1
+    if any(line.count(",") != separators for line in lines):
+        raise ValueError("row length does not match header")
+
+    col = {name: i for i, name in enumerate(headers)}
+    n = len(lines)
+    brightness = "bright_ti4" if "bright_ti4" in col else "brightness"
+    numeric_names = [name for name in ("latitude", "longitude", brightness, "frp") if name in col]
+    text_names = [name for name in ("confidence", "acq_date", "acq_time", "satellite", "daynight") if name in col]
+
+    numeric = {}
+    if numeric_names:
+        values = np.loadtxt(lines, delimiter=",", dtype=HOTSPOT_DTYPE, comments=None, ndmin=2,
+                            usecols=[col[name] for name in numeric_names])
+        numeric = {name: values[:, i] for i, name in enumerate(numeric_names)}
+
+    text = {}
+    if text_names:
+        values = np.loadtxt(lines, delimiter=",", dtype=object, comments=None, ndmin=2,
+                            usecols=[col[name] for name in text_names])
+        text = {name: values[:, i].tolist() for i, name in enumerate(text_names)}
+
+    zeros = np.zeros(n, dtype=HOTSPOT_DTYPE)
+    dates = text.get("acq_date", [""] * n)
+    times = text.get("acq_time", [""] * n)
+
+    return _build_table(
+        {
+            "latitude": numeric.get("latitude", zeros),
+            "longitude": numeric.get("longitude", zeros),
+            "brightness": numeric.get(brightness, zeros),
+            "frp": numeric.get("frp", zeros),
+        },
+        {
+            "confidence": text.get("confidence", ["n"] * n),
+            "acq_datetime": [d + " " + t for d, t in zip(dates, times)],
+            "satellite": text.get("satellite", ["Unknown"] * n),
+            "daynight": text.get("daynight", ["D"] * n),
+        }
+    )
 
 
 def parse_csv_hotspots(csv_text):
-    """Parse FIRMS CSV response into hotspot list."""
+    """Parse FIRMS CSV response into a hotspot column table.
+
+    Well-formed responses go through NumPy's C reader; anything it rejects
+    is re-parsed by the tolerant row parser, which skips malformed rows.
+    """
     lines = csv_text.strip().split("\n")
     if len(lines) < 2:
-        return []
+        return hotspots_to_table([])
 
     headers = lines[0].split(",")
-    hotspots = []
-
-    for line in lines[1:]:
-        values = line.split(",")
-        if len(values) >= len(headers):
-            row = dict(zip(headers, values))
-            try:
-                hotspot = {
-                    "latitude": float(row.get("latitude", 0)),
-                    "longitude": float(row.get("longitude", 0)),
-                    "brightness": float(row.get("bright_ti4", 0) or row.get("brightness", 0) or 0),
-                    "frp": float(row.get("frp", 0) or 0),
-                    "confidence": row.get("confidence", "n"),
-                    "acq_datetime": "{} {}".format(row.get("acq_date", ""), row.get("acq_time", "")),
-                    "satellite": row.get("satellite", "Unknown"),
-                    "daynight": row.get("daynight", "D"),
-                }
-                hotspots.append(hotspot)
-            except (ValueError, KeyError):
-                continue
+    rows = lines[1:]
 
-    return hotspots
+    try:
+        return _parse_csv_fast(rows, headers)
+    except (ValueError, IndexError):
+        return hotspots_to_table(_parse_csv_rows(rows, headers))
+
+
+def _read_body(response, limit):
+    """Read up to limit bytes, straight into one buffer when the size is known."""
+    length = response.headers.get("Content-Length") if getattr(response, "headers", None) else None
+    if not length or not length.isdigit() or int(length) >= limit:
+        return response.read(limit)
+
+    buf = bytearray(int(length))
+    view = memoryview(buf)
+    got = 0
+    while got < len(buf):
+        chunk = response.readinto(view[got:])
+        if not chunk:
+            break
+        got += chunk
+    view.release()
+    if got < len(buf):
+        del buf[got:]
+    return buf
+
+
+def http_get(url, timeout, limit=None):
+    """GET a URL and return its body (at most limit bytes); raises on HTTP errors."""
+    if _http_client is not None:
+        with _http_client.stream("GET", url, timeout=timeout) as response:
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                body += chunk
+                if limit is not None and len(body) >= limit:
+                    del body[limit:]
+                    break
+            return body
+
+    req = Request(url, headers={"User-Agent": USER_AGENT})
+    with urlopen(req, timeout=timeout) as response:
+        return response.read() if limit is None else _read_body(response, limit)
 
 
 def fetch_hotspots(west, south, east, north, days=1):
-    """Fetch hotspots from NASA FIRMS API."""
+    """Fetch hotspots from NASA FIRMS API (cached per area and window)."""
     if not FIRMS_API_KEY:
         return None, "FIRMS_API_KEY not configured"
 
-    url = "{}/area/csv/{}/VIIRS_NOAA20_NRT/{},{},{},{}/{}".format(
-        FIRMS_BASE_URL, FIRMS_API_KEY, west, south, east, north, days
-    )
+    key = (west, south, east, north, days)
+    cached = _firms_cache.get(key)
+    if cached is not None:
+        return cached, None
 
-    try:
-        req = Request(url, headers={"User-Agent": "FireWatch-AI/1.0"})
-        with urlopen(req, timeout=30) as response:
-            data = response.read().decode("utf-8")
-            return parse_csv_hotspots(data), None
-    except Exception as e:
-        return None, str(e)
+    with _firms_cache.loading(key):
+        cached = _firms_cache.get(key)
+        if cached is not None:
+            return cached, None
 
+        url = f"{FIRMS_AREA_URL}{FIRMS_API_KEY}/{FIRMS_SOURCE}/{west},{south},{east},{north}/{days}"
 
-def fetch_weather(lat, lon):
-    """Fetch weather data from Open-Meteo API."""
-    url = "{}?latitude={}&longitude={}&current=temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,precipitation&timezone=auto".format(
-        WEATHER_API_URL, lat, lon
-    )
+        try:
+            raw = http_get(url, 30, FIRMS_MAX_RESPONSE_BYTES + 1)
+            size = len(raw)
+            if size > FIRMS_MAX_RESPONSE_BYTES:
+                return None, "FIRMS response exceeds {} bytes".format(FIRMS_MAX_RESPONSE_BYTES)
 
-    try:
-        req = Request(url, headers={"User-Agent": "FireWatch-AI/1.0"})
-        with urlopen(req, timeout=10) as response:
-            data = json.loads(response.read().decode("utf-8"))
+            # Plain-text replies (rate limits, key errors) are not worth caching
+            is_csv = raw.startswith(b"latitude")
+            csv_text = raw.decode("utf-8")
+            del raw  # drop the byte buffer before the parser allocates row strings
+
+            hotspots = parse_csv_hotspots(csv_text)
+            if is_csv:
+                _firms_cache.set(key, hotspots, size)
+            return hotspots, None
+        except Exception as e:
+            return None, str(e)
+
+
+def fetch_weather(lat, lon):
+    """Fetch weather data from Open-Meteo API (cached per ~1 km cell)."""
+    key = (round(lat, 2), round(lon, 2))
+    cached = _weather_cache.get(key)
+    if cached is not None:
+        return dict(cached), None
+
+    with _weather_cache.loading(key):
+        cached = _weather_cache.get(key)
+        if cached is not None:
+            return dict(cached), None
+
+        url = f"{WEATHER_URL_PREFIX}{lat}&longitude={lon}{WEATHER_URL_SUFFIX}"
+
+        try:
+            raw = http_get(url, 10)
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw.decode("utf-8"))
             current = data.get("current", {})
-            return {
+            weather = {
                 "temperature": current.get("temperature_2m", 25),
                 "humidity": current.get("relative_humidity_2m", 50),
                 "wind_speed": current.get("wind_speed_10m", 10),
                 "wind_direction": current.get("wind_direction_10m", 0),
                 "precipitation": current.get("precipitation", 0)
-            }, None
-    except Exception as e:
-        # Return default values if API fails
-        return {
-            "temperature": 28,
-            "humidity": 45,
-            "wind_speed": 15,
-            "wind_direction": 90,
-            "precipitation": 0
-        }, str(e)
+            }
+            _weather_cache.set(key, weather)
+            return dict(weather), None
+        except Exception as e:
+            # Return default values if API fails
+            return {
+                "temperature": 28,
+                "humidity": 45,
+                "wind_speed": 15,
+                "wind_direction": 90,
+                "precipitation": 0
+            }, str(e)
+
+
+def _cluster_labels_kernel(lat, lon, cells, keys, starts, sizes, order, offsets, max_dist_sq):
+    """Label hotspots with the greedy seed sweep of cluster_hotspots.
+
+    Each unused hotspot, in index order, seeds a cluster of the unused
+    hotspots within the radius in its 3x3 block of cells. Written as plain
+    loops so Numba can compile it whole; returns (labels, cluster count).
+    """
+    n = lat.shape[0]
+    labels = np.empty(n, dtype=np.intp)
+    used = np.zeros(n, dtype=np.bool_)
+    k = 0
+    for i in range(n):
+        if used[i]:
+            continue
+        # The seed is labelled even if it fails the distance test against
+        # itself (non-finite coordinates)
+        used[i] = True
+        labels[i] = k
+        for offset in offsets:
+            key = cells[i] + offset
+            pos = np.searchsorted(keys, key)
+            if pos == keys.shape[0] or keys[pos] != key:
+                continue
+            for m in range(starts[pos], starts[pos] + sizes[pos]):
+                j = order[m]
+                if used[j]:
+                    continue
+                dlat = lat[j] - lat[i]
+                dlon = lon[j] - lon[i]
+                if dlat * dlat + dlon * dlon <= max_dist_sq:
+                    used[j] = True
+                    labels[j] = k
+        k += 1
+    return labels, k
+
+
+if NUMBA_AVAILABLE:
+    # The on-disk cache saves recompiling on warm starts; read-only
+    # deployments compile once per process instead
+    try:
+        _cluster_labels_kernel = numba.njit(cache=True)(_cluster_labels_kernel)
+    except RuntimeError:
+        _cluster_labels_kernel = numba.njit(_cluster_labels_kernel)
 
 
 def cluster_hotspots(hotspots, distance_km=5):
-    """Simple clustering algorithm for hotspots."""
-    if not hotspots:
+    """Simple clustering algorithm for hotspots.
+
+    Accepts a hotspot column table or a list of hotspot dicts. Hotspots are
+    bucketed into grid cells one search radius wide, so each seed is only
+    compared against the hotspots in its 3x3 cell neighbourhood.
+    """
+    if isinstance(hotspots, dict):
+        lat = np.asarray(hotspots["latitude"], dtype=HOTSPOT_DTYPE)
+        lon = np.asarray(hotspots["longitude"], dtype=HOTSPOT_DTYPE)
+        frp = np.asarray(hotspots["frp"], dtype=HOTSPOT_DTYPE)
+    else:
+        lat = np.fromiter((h["latitude"] for h in hotspots), dtype=HOTSPOT_DTYPE, count=len(hotspots))
+        lon = np.fromiter((h["longitude"] for h in hotspots), dtype=HOTSPOT_DTYPE, count=len(hotspots))
+        frp = np.fromiter((h["frp"] for h in hotspots), dtype=HOTSPOT_DTYPE, count=len(hotspots))
+
+    n = len(lat)
+    if n == 0:
         return []
-
-    clusters = []
-    used = set()
-
-    for i, h1 in enumerate(hotspots):
-        if i in used:
-            continue
-
-        cluster = {
-            "id": len(clusters) + 1,
-            "hotspots": [h1],
-            "center_lat": h1["latitude"],
-            "center_lon": h1["longitude"],
-            "total_frp": h1["frp"],
-            "max_frp": h1["frp"],
-            "count": 1
-        }
-        used.add(i)
-
-        for j, h2 in enumerate(hotspots):
-            if j in used:
+    max_dist_sq = (distance_km * INV_KM_PER_DEG) ** 2
+
+    # Distance tests stay float32; aggregates use the dequantized float64 values
+    lat64 = dequantize(lat, "latitude")
+    lon64 = dequantize(lon, "longitude")
+    frp64 = dequantize(frp, "frp")
+
+    # Bucket hotspots into cells at least one search radius wide, so every
+    # neighbour of a point lies in its own cell or one of the 8 around it.
+    # Non-finite coordinates fail every distance test and so only ever seed
+    # singletons; they are parked in the cell at (0, 0) to keep the grid finite
+    cell_deg = max(math.sqrt(max_dist_sq) * CLUSTER_CELL_MARGIN, 1e-6)
+    finite = np.isfinite(lat) & np.isfinite(lon)
+    cy = np.floor(np.where(finite, lat, 0).astype(np.float64) / cell_deg).astype(np.int64)
+    cx = np.floor(np.where(finite, lon, 0).astype(np.float64) / cell_deg).astype(np.int64)
+    width = int(cx.max() - cx.min()) + 3
+    cells = (cy - cy.min() + 1) * width + (cx - cx.min() + 1)
+    offsets = [dy * width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+    order = np.argsort(cells, kind="stable")
+    keys, starts, sizes = np.unique(cells[order], return_index=True, return_counts=True)
+
+    if NUMBA_AVAILABLE:
+        labels, k = _cluster_labels_kernel(
+            lat, lon, cells, keys, starts, sizes, order,
+            np.array(offsets, dtype=np.int64), np.float32(max_dist_sq)
+        )
+    else:
+        buckets = {
+            key: order[start:start + size]
+            for key, start, size in zip(keys.tolist(), starts.tolist(), sizes.tolist())
+        }
+
+        # Hotspots alone in their 3x3 neighbourhood are singletons whatever the
+        # seed order, so the walk can skip the distance test for them
+        neighbour_counts = np.zeros(n, dtype=np.int64)
+        for offset in offsets:
+            pos = np.minimum(np.searchsorted(keys, cells + offset), len(keys) - 1)
+            neighbour_counts += np.where(keys[pos] == cells + offset, sizes[pos], 0)
+        isolated = (neighbour_counts == 1).tolist()
+        cell_keys = cells.tolist()
+
+        labels = np.empty(n, dtype=np.intp)
+        used = np.zeros(n, dtype=bool)
+        neighbourhoods = {}
+        k = 0
+
+        for i in range(n):
+            if isolated[i]:
+                labels[i] = k
+                k += 1
                 continue
+            if used[i]:
+                continue
+            # The seed always belongs to its own cluster, even if it fails the
+            # distance test against itself (non-finite coordinates)
+            used[i] = True
+            labels[i] = k
+
+            # Unused candidates from the 3x3 block of cells, in index order
+            key = cell_keys[i]
+            candidates = neighbourhoods.get(key)
+            if candidates is None:
+                parts = [buckets[key + offset] for offset in offsets if key + offset in buckets]
+                candidates = np.sort(np.concatenate(parts))
+            candidates = candidates[~used[candidates]]
+            neighbourhoods[key] = candidates
+
+            dlat = lat[candidates] - lat[i]
+            dlon = lon[candidates] - lon[i]
+            members = candidates[(dlat * dlat + dlon * dlon) <= max_dist_sq]
+            used[members] = True
+            labels[members] = k
+            k += 1
+
+    # Per-cluster aggregates in one pass each; bincount accumulates in index
+    # order, like summing each cluster's hotspots in turn
+    counts = np.bincount(labels, minlength=k)
+    total_frp = np.bincount(labels, weights=frp64, minlength=k)
+    center_lats = np.bincount(labels, weights=lat64, minlength=k) / counts
+    center_lons = np.bincount(labels, weights=lon64, minlength=k) / counts
+    max_frp = np.full(k, -np.inf)
+    np.maximum.at(max_frp, labels, frp64)
+    lat_min = np.full(k, np.inf)
+    lat_max = np.full(k, -np.inf)
+    lon_min = np.full(k, np.inf)
+    lon_max = np.full(k, -np.inf)
+    # Singletons of non-finite hotspots just carry NaN extents
+    with np.errstate(invalid="ignore"):
+        np.minimum.at(lat_min, labels, lat64)
+        np.maximum.at(lat_max, labels, lat64)
+        np.minimum.at(lon_min, labels, lon64)
+        np.maximum.at(lon_max, labels, lon64)
 
-            # Calculate distance
-            dlat = h2["latitude"] - h1["latitude"]
-            dlon = h2["longitude"] - h1["longitude"]
-            dist = math.sqrt(dlat**2 + dlon**2) * 111  # Approximate km
-
-            if dist <= distance_km:
-                cluster["hotspots"].append(h2)
-                cluster["total_frp"] += h2["frp"]
-                cluster["max_frp"] = max(cluster["max_frp"], h2["frp"])
-                cluster["count"] += 1
-                used.add(j)
+        # Estimate area (rough approximation)
+        lat_range = (lat_max - lat_min) * KM_PER_DEG
+        lon_range = (lon_max - lon_min) * KM_PER_DEG * np.cos(np.radians(center_lats))
+        areas = lat_range * lon_range * 100
 
-        # Recalculate center
-        cluster["center_lat"] = sum(h["latitude"] for h in cluster["hotspots"]) / cluster["count"]
-        cluster["center_lon"] = sum(h["longitude"] for h in cluster["hotspots"]) / cluster["count"]
-        cluster["avg_frp"] = cluster["total_frp"] / cluster["count"]
+    clusters = []
+    for idx, (count, c_lat, c_lon, total, peak, area) in enumerate(zip(
+        counts.tolist(), center_lats.tolist(), center_lons.tolist(),
+        total_frp.tolist(), max_frp.tolist(), areas.tolist()
+    )):
+        clusters.append({
+            "id": idx + 1,
+            "center_lat": c_lat,
+            "center_lon": c_lon,
+            "total_frp": total,
+            "max_frp": peak,
+            "count": count,
+            "avg_frp": total / count,
+            "estimated_area_ha": round(area, 1) if count > 1 else 1.0
+        })
 
-        # Estimate area (rough approximation)
-        if cluster["count"] > 1:
-            lats = [h["latitude"] for h in cluster["hotspots"]]
-            lons = [h["longitude"] for h in cluster["hotspots"]]
-            lat_range = (max(lats) - min(lats)) * 111
-            lon_range = (max(lons) - min(lons)) * 111 * math.cos(math.radians(cluster["center_lat"]))
-            cluster["estimated_area_ha"] = round(lat_range * lon_range * 100, 1)
-        else:
-            cluster["estimated_area_ha"] = 1.0
+    # Add location info for all cluster centres in one raster lookup
+    states = get_states_bulk(center_lats, center_lons)
+    biomes = get_biomes_bulk(center_lats, center_lons)
+    for cluster, state, biome in zip(clusters, states, biomes):
+        cluster["state"] = state
+        cluster["biome"] = biome
 
-        # Add location info
-        cluster["state"] = get_state(cluster["center_lat"], cluster["center_lon"])
-        biome_name, biome_data = get_biome(cluster["center_lat"], cluster["center_lon"])
-        cluster["biome"] = biome_name
+    return sorted(clusters, key=lambda x: x["total_frp"], reverse=True)
 
-        # Remove hotspots list to reduce response size
-        del cluster["hotspots"]
 
-        clusters.append(cluster)
+def _point_feature(lat, lon, properties, bbox=None):
+    """GeoJSON point feature."""
+    feature = {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": properties
+    }
+    if bbox is not None:
+        feature["bbox"] = bbox
+    return feature
+
+
+def map_clusters(hotspots, west, south, east, north, zoom):
+    """Group the hotspots inside a viewport into map markers for one zoom level.
+
+    Returns a GeoJSON FeatureCollection. Hotspots alone in their grid cell
+    are point features carrying the hotspot record; the rest become cluster
+    features with a point count, peak FRP and the bbox of their members.
+    """
+    zoom = max(0, min(int(zoom), MAP_CLUSTER_MAX_ZOOM + 1))
+    lat = dequantize(hotspots["latitude"], "latitude")
+    lon = dequantize(hotspots["longitude"], "longitude")
+    inside = np.flatnonzero((lat >= south) & (lat <= north) & (lon >= west) & (lon <= east))
+    lat, lon = lat[inside], lon[inside]
+
+    if zoom > MAP_CLUSTER_MAX_ZOOM:
+        cells = labels = np.arange(len(inside))
+        counts = np.ones(len(inside), dtype=np.int64)
+    else:
+        # Web Mercator pixel coordinates at this zoom, in cluster-radius units
+        scale = MAP_TILE_SIZE * 2.0 ** zoom / MAP_CLUSTER_RADIUS
+        sin_lat = np.sin(np.radians(np.clip(lat, -MAP_MAX_LAT, MAP_MAX_LAT)))
+        x = (lon + 180.0) / 360.0 * scale
+        y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * scale
+        width = int(scale) + 1
+        cells = np.floor(y).astype(np.int64) * width + np.floor(x).astype(np.int64)
+        cells, labels, counts = np.unique(cells, return_inverse=True, return_counts=True)
+        labels = labels.reshape(-1)
+
+    single = counts[labels] == 1
+    features = [
+        _point_feature(h["latitude"], h["longitude"], h)
+        for h in hotspots_to_records(take_hotspots(hotspots, inside[single]))
+    ]
+
+    k = len(counts)
+    if k > len(features):
+        frp = dequantize(hotspots["frp"], "frp")[inside]
+        center_lats = np.bincount(labels, weights=lat, minlength=k) / counts
+        center_lons = np.bincount(labels, weights=lon, minlength=k) / counts
+        max_frp = np.full(k, -np.inf)
+        np.maximum.at(max_frp, labels, frp)
+        lat_min = np.full(k, np.inf)
+        lat_max = np.full(k, -np.inf)
+        lon_min = np.full(k, np.inf)
+        lon_max = np.full(k, -np.inf)
+        np.minimum.at(lat_min, labels, lat)
+        np.maximum.at(lat_max, labels, lat)
+        np.minimum.at(lon_min, labels, lon)
+        np.maximum.at(lon_max, labels, lon)
+
+        # Cluster ids name the grid cell, so they hold across pans and refreshes
+        for cell, count, c_lat, c_lon, peak, s, n, w, e in zip(
+            cells.tolist(), counts.tolist(), center_lats.tolist(), center_lons.tolist(), max_frp.tolist(),
+            lat_min.tolist(), lat_max.tolist(), lon_min.tolist(), lon_max.tolist()
+        ):
+            if count == 1:
+                continue
+            features.append(_point_feature(round(c_lat, 5), round(c_lon, 5), {
+                "cluster": True,
+                "cluster_id": "{}:{}".format(zoom, cell),
+                "point_count": count,
+                "max_frp": peak
+            }, [w, s, e, n]))
 
-    return sorted(clusters, key=lambda x: x["total_frp"], reverse=True)
+    return {
+        "type": "FeatureCollection",
+        "zoom": zoom,
+        "total_hotspots": len(inside),
+        "features": features
+    }
 
 
 # ============================================================================
 # Dashboard HTML
 # ============================================================================
 
-def get_dashboard_page():
-    """Return complete dashboard HTML."""
-    return """<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <title>FireWatch AI - Dashboard Completo</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.4.1/dist/MarkerCluster.css" />
-    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.4.1/dist/MarkerCluster.Default.css" />
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0f0f1a;
-            color: #fff;
-            overflow-x: hidden;
-        }
+# Dashboard markup and stylesheet live in api/static rather than in module
+# string literals (the emoji in the page would make it a 4-byte-per-char str)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
-        /* Header */
-        .header {
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            padding: 12px 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            border-bottom: 1px solid #333;
-            position: fixed;
-            top: 0;
-            left: 0;
-            right: 0;
-            z-index: 1001;
-        }
-        .logo { color: #ff6b35; font-size: 1.4em; font-weight: bold; }
-        .logo span { color: #f7c873; }
-        .header-info { display: flex; gap: 20px; align-items: center; }
-        .header-stat {
-            text-align: center;
-            padding: 5px 15px;
-            background: rgba(255,107,53,0.1);
-            border-radius: 6px;
-        }
-        .header-stat-value { color: #ff6b35; font-weight: bold; font-size: 1.2em; }
-        .header-stat-label { color: #888; font-size: 0.7em; }
-
-        /* Main Layout */
-        .main-container {
-            display: flex;
-            margin-top: 56px;
-            height: calc(100vh - 56px);
-        }
 
-        /* Sidebar */
-        .sidebar {
-            width: 320px;
-            background: #1a1a2e;
-            overflow-y: auto;
-            border-right: 1px solid #333;
-            flex-shrink: 0;
-        }
+def _read_static(name):
+    """Read a file shipped in api/static."""
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return f.read()
 
-        /* Tabs */
-        .tabs {
-            display: flex;
-            background: #0f0f1a;
-            border-bottom: 1px solid #333;
-        }
-        .tab {
-            flex: 1;
-            padding: 12px;
-            text-align: center;
-            cursor: pointer;
-            font-size: 0.8em;
-            color: #888;
-            border-bottom: 2px solid transparent;
-            transition: all 0.2s;
-        }
-        .tab:hover { color: #fff; }
-        .tab.active {
-            color: #ff6b35;
-            border-bottom-color: #ff6b35;
-        }
 
-        /* Tab Content */
-        .tab-content { display: none; padding: 15px; }
-        .tab-content.active { display: block; }
+def _minify_css_fallback(css):
+    """Strip comments and redundant whitespace from CSS, leaving strings intact."""
+    parts = re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""", css)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r"/\*.*?\*/", "", parts[i], flags=re.S)
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r" ?([{};,>]) ?", r"\1", part)
+        parts[i] = part.replace(": ", ":").replace(" !", "!").replace(";}", "}")
+    return "".join(parts).strip()
 
-        /* Panel */
-        .panel {
-            background: #16213e;
-            border-radius: 8px;
-            padding: 15px;
-            margin-bottom: 15px;
-        }
-        .panel h3 {
-            color: #f7c873;
-            font-size: 0.85em;
-            margin-bottom: 12px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .panel h3 .icon { font-size: 1.2em; }
 
-        /* Stats Grid */
-        .stat-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 10px;
-        }
-        .stat-box {
-            background: #0f0f1a;
-            padding: 12px;
-            border-radius: 6px;
-            text-align: center;
-        }
-        .stat-box.full { grid-column: span 2; }
-        .stat-value {
-            font-size: 1.6em;
-            font-weight: bold;
-            color: #ff6b35;
-        }
-        .stat-value.green { color: #4ade80; }
-        .stat-value.yellow { color: #fbbf24; }
-        .stat-value.red { color: #ef4444; }
-        .stat-label {
-            font-size: 0.7em;
-            color: #888;
-            margin-top: 4px;
-        }
+def minify_css(css):
+    """Minify a stylesheet, with rcssmin when it is installed."""
+    if RCSSMIN_AVAILABLE:
+        return rcssmin.cssmin(css)
+    return _minify_css_fallback(css)
 
-        /* Form Elements */
-        .form-group {
-            margin-bottom: 12px;
-        }
-        .form-group label {
-            display: block;
-            font-size: 0.8em;
-            color: #aaa;
-            margin-bottom: 5px;
-        }
-        .form-group select, .form-group input {
-            width: 100%;
-            padding: 10px;
-            border: 1px solid #333;
-            border-radius: 6px;
-            background: #0f0f1a;
-            color: #fff;
-            font-size: 0.9em;
-        }
-        .form-row {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 10px;
-        }
 
-        /* Buttons */
-        .btn {
-            width: 100%;
-            padding: 12px;
-            border: none;
-            border-radius: 6px;
-            font-size: 0.9em;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.2s;
-            margin-top: 8px;
-        }
-        .btn-primary { background: #ff6b35; color: white; }
-        .btn-primary:hover { background: #ff8555; }
-        .btn-secondary { background: #333; color: white; }
-        .btn-secondary:hover { background: #444; }
-        .btn-secondary.active { background: #ff6b35; }
-        .btn-danger { background: #dc2626; color: white; }
-        .btn-danger:hover { background: #ef4444; }
-        .view-btn.active { background: #ff6b35 !important; color: white !important; }
-        .view-btn:hover { background: #333 !important; color: white !important; }
-        .pulse { animation: pulse 1s infinite; }
-        @keyframes pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.5; } }
-
-        /* Risk Meter */
-        .risk-meter {
-            background: #0f0f1a;
-            border-radius: 8px;
-            padding: 15px;
-            text-align: center;
-        }
-        .risk-value {
-            font-size: 3em;
-            font-weight: bold;
-            margin: 10px 0;
-        }
-        .risk-bar {
-            height: 8px;
-            background: linear-gradient(to right, #4ade80, #fbbf24, #ef4444);
-            border-radius: 4px;
-            position: relative;
-            margin: 15px 0;
-        }
-        .risk-indicator {
-            position: absolute;
-            top: -4px;
-            width: 16px;
-            height: 16px;
-            background: white;
-            border-radius: 50%;
-            border: 2px solid #333;
-            transform: translateX(-50%);
-            transition: left 0.5s;
-        }
-        .risk-labels {
-            display: flex;
-            justify-content: space-between;
-            font-size: 0.7em;
-            color: #888;
-        }
+def get_dashboard_css():
+    """Return dashboard stylesheet."""
+    return _read_static("dashboard.css").decode("utf-8")
 
-        /* Progress Bars */
-        .progress-item {
-            margin: 10px 0;
-        }
-        .progress-label {
-            display: flex;
-            justify-content: space-between;
-            font-size: 0.8em;
-            margin-bottom: 5px;
-        }
-        .progress-bar {
-            height: 6px;
-            background: #0f0f1a;
-            border-radius: 3px;
-            overflow: hidden;
-        }
-        .progress-fill {
-            height: 100%;
-            border-radius: 3px;
-            transition: width 0.5s;
-        }
 
-        /* Cluster List */
-        .cluster-list {
-            max-height: 300px;
-            overflow-y: auto;
-        }
-        .cluster-item {
-            background: #0f0f1a;
-            border-radius: 6px;
-            padding: 10px;
-            margin-bottom: 8px;
-            cursor: pointer;
-            transition: all 0.2s;
-            border-left: 3px solid #ff6b35;
-        }
-        .cluster-item:hover {
-            background: #1a1a3e;
-        }
-        .cluster-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .cluster-id {
-            font-weight: bold;
-            color: #ff6b35;
-        }
-        .cluster-count {
-            background: #ff6b35;
-            color: white;
-            padding: 2px 8px;
-            border-radius: 10px;
-            font-size: 0.8em;
-        }
-        .cluster-details {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 5px;
-            margin-top: 8px;
-            font-size: 0.75em;
-            color: #888;
-        }
+# Minified once and served separately under a content-hashed path so
+# browsers can cache it indefinitely; any edit to the stylesheet changes the URL
+DASHBOARD_CSS = minify_css(get_dashboard_css()).encode("utf-8")
+DASHBOARD_CSS_PATH = "/static/dashboard.{}.css".format(
+    hashlib.blake2b(DASHBOARD_CSS, digest_size=5).hexdigest()
+)
 
-        /* Emissions Card */
-        .emissions-card {
-            background: #0f0f1a;
-            border-radius: 6px;
-            padding: 12px;
-            margin-bottom: 10px;
-        }
-        .emissions-value {
-            font-size: 1.8em;
-            font-weight: bold;
-            color: #ff6b35;
-        }
-        .emissions-unit {
-            font-size: 0.8em;
-            color: #888;
-        }
-        .emissions-equiv {
-            font-size: 0.75em;
-            color: #666;
-            margin-top: 5px;
-        }
 
-        /* Prediction Timeline */
-        .timeline {
-            position: relative;
-            padding-left: 20px;
-        }
-        .timeline::before {
-            content: '';
-            position: absolute;
-            left: 6px;
-            top: 0;
-            bottom: 0;
-            width: 2px;
-            background: #333;
-        }
-        .timeline-item {
-            position: relative;
-            padding: 10px;
-            margin-bottom: 10px;
-            background: #0f0f1a;
-            border-radius: 6px;
-        }
-        .timeline-item::before {
-            content: '';
-            position: absolute;
-            left: -17px;
-            top: 15px;
-            width: 10px;
-            height: 10px;
-            background: #ff6b35;
-            border-radius: 50%;
-        }
-        .timeline-hour {
-            font-weight: bold;
-            color: #f7c873;
-        }
-        .timeline-data {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 5px;
-            margin-top: 5px;
-            font-size: 0.8em;
-            color: #aaa;
-        }
-
-        /* Legend */
-        .legend-item {
-            display: flex;
-            align-items: center;
-            margin: 5px 0;
-            font-size: 0.8em;
-        }
-        .legend-color {
-            width: 14px;
-            height: 14px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }
-
-        /* Map */
-        .map-container {
-            flex: 1;
-            position: relative;
-        }
-        #map {
-            width: 100%;
-            height: 100%;
-            background: #0a0a15;
-        }
-
-        /* Loading Indicator (discrete in header) */
-        .loading-indicator {
-            display: none;
-            align-items: center;
-            gap: 8px;
-            padding: 6px 12px;
-            background: rgba(255, 107, 53, 0.15);
-            border-radius: 20px;
-            font-size: 0.75em;
-            color: #ff6b35;
-        }
-        .loading-indicator.active { display: flex; }
-        .spinner-small {
-            width: 14px;
-            height: 14px;
-            border: 2px solid #333;
-            border-top-color: #ff6b35;
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-        }
-        @keyframes spin { to { transform: rotate(360deg); } }
-
-        /* Legacy loading (hidden) */
-        .loading { display: none !important; }
-
-        /* Map Controls */
-        .map-overlay {
-            position: absolute;
-            top: 10px;
-            right: 10px;
-            z-index: 1000;
-        }
-        .map-card {
-            background: rgba(26, 26, 46, 0.95);
-            padding: 12px 15px;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            min-width: 200px;
-        }
-        .map-card h4 {
-            color: #f7c873;
-            font-size: 0.8em;
-            margin-bottom: 8px;
-        }
-        .weather-grid {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 8px;
-            font-size: 0.85em;
-        }
-        .weather-item {
-            display: flex;
-            align-items: center;
-            gap: 5px;
-        }
-        .weather-icon { font-size: 1.2em; }
-
-        /* Bottom Panel */
-        .bottom-panel {
-            position: absolute;
-            bottom: 10px;
-            left: 10px;
-            right: 330px;
-            z-index: 1000;
-            display: flex;
-            gap: 10px;
-        }
-        .info-chip {
-            background: rgba(26, 26, 46, 0.95);
-            padding: 8px 15px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-        .info-chip .value { color: #ff6b35; font-weight: bold; }
+def get_dashboard_js():
+    """Return dashboard script."""
+    return _read_static("dashboard.js")
 
-        /* Mobile */
-        @media (max-width: 768px) {
-            .sidebar { display: none; }
-            .bottom-panel { right: 10px; flex-wrap: wrap; }
-            .header-info { display: none; }
-        }
 
-        /* Scrollbar */
-        ::-webkit-scrollbar { width: 6px; }
-        ::-webkit-scrollbar-track { background: #0f0f1a; }
-        ::-webkit-scrollbar-thumb { background: #333; border-radius: 3px; }
-        ::-webkit-scrollbar-thumb:hover { background: #444; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="logo">FireWatch <span>AI</span></div>
-        <div class="header-info">
-            <div class="loading-indicator active" id="loadingIndicator">
-                <div class="spinner-small"></div>
-                <span>Carregando...</span>
-            </div>
-            <div class="header-stat">
-                <div class="header-stat-value" id="headerFires">-</div>
-                <div class="header-stat-label">FOCOS ATIVOS</div>
-            </div>
-            <div class="header-stat">
-                <div class="header-stat-value" id="headerRisk">-</div>
-                <div class="header-stat-label">RISCO</div>
-            </div>
-            <div class="header-stat">
-                <div class="header-stat-value" id="headerArea">-</div>
-                <div class="header-stat-label">AREA (ha)</div>
-            </div>
-        </div>
-    </div>
-
-    <div class="main-container">
-        <div class="sidebar">
-            <div class="tabs">
-                <div class="tab active" data-tab="monitor">Monitor</div>
-                <div class="tab" data-tab="analysis">Analise</div>
-                <div class="tab" data-tab="predict">Previsao</div>
-                <div class="tab" data-tab="alerts">Alertas</div>
-            </div>
-
-            <!-- Monitor Tab -->
-            <div class="tab-content active" id="tab-monitor">
-                <div class="panel">
-                    <h3><span class="icon">📍</span> Filtros</h3>
-                    <div class="form-group">
-                        <label>Regiao</label>
-                        <select id="regionSelect">
-                            <option value="brazil">Brasil Completo</option>
-                            <option value="amazon">Amazonia</option>
-                            <option value="cerrado">Cerrado</option>
-                            <option value="pantanal">Pantanal</option>
-                            <option value="mataatlantica">Mata Atlantica</option>
-                            <option value="caatinga">Caatinga</option>
-                            <option value="saopaulo" selected>Sao Paulo</option>
-                            <option value="nordeste">Nordeste</option>
-                            <option value="sul">Sul</option>
-                        </select>
-                    </div>
-                    <div class="form-group">
-                        <label>Periodo</label>
-                        <select id="daysSelect">
-                            <option value="1">Ultimo dia</option>
-                            <option value="2" selected>2 dias</option>
-                            <option value="3">3 dias</option>
-                            <option value="5">5 dias</option>
-                            <option value="7">7 dias</option>
-                        </select>
-                    </div>
-                    <button class="btn btn-primary" onclick="loadAllData(true)">Atualizar Dados</button>
-                    <button class="btn btn-secondary active" id="autoRefreshBtn" onclick="toggleAutoRefresh()">⏸ Pausar</button>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🗺️</span> Visualizacao</h3>
-                    <div style="display: flex; gap: 5px;">
-                        <button class="view-btn active" data-view="markers" onclick="setViewMode('markers')" style="flex:1; padding: 8px; border: 1px solid #333; background: #ff6b35; color: white; border-radius: 4px; cursor: pointer; font-size: 0.8em;">Marcadores</button>
-                        <button class="view-btn" data-view="heatmap" onclick="setViewMode('heatmap')" style="flex:1; padding: 8px; border: 1px solid #333; background: #0f0f1a; color: #888; border-radius: 4px; cursor: pointer; font-size: 0.8em;">Calor</button>
-                        <button class="view-btn" data-view="both" onclick="setViewMode('both')" style="flex:1; padding: 8px; border: 1px solid #333; background: #0f0f1a; color: #888; border-radius: 4px; cursor: pointer; font-size: 0.8em;">Ambos</button>
-                    </div>
-                    <p style="font-size: 0.7em; color: #666; margin-top: 8px; text-align: center;">
-                        Use o controle no mapa para trocar o estilo base (Escuro, Satelite, Terreno, Ruas)
-                    </p>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">📊</span> Estatisticas</h3>
-                    <div class="stat-grid">
-                        <div class="stat-box">
-                            <div class="stat-value" id="totalFires">-</div>
-                            <div class="stat-label">Focos</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="totalClusters">-</div>
-                            <div class="stat-label">Incendios</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="avgFRP">-</div>
-                            <div class="stat-label">FRP Medio</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="maxFRP">-</div>
-                            <div class="stat-label">FRP Max</div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🌤️</span> Clima Atual</h3>
-                    <div id="currentBiome" style="font-size: 0.85em; color: #f7c873; margin-bottom: 10px;">Carregando...</div>
-                    <div class="stat-grid">
-                        <div class="stat-box">
-                            <div class="stat-value" id="sidebarTemp" style="font-size: 1.3em;">-</div>
-                            <div class="stat-label">Temperatura</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value green" id="sidebarHumid" style="font-size: 1.3em;">-</div>
-                            <div class="stat-label">Umidade</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="sidebarWind" style="font-size: 1.3em;">-</div>
-                            <div class="stat-label">Vento</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="sidebarWindDir" style="font-size: 1.3em;">-</div>
-                            <div class="stat-label">Direcao</div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🔥</span> Maiores Incendios</h3>
-                    <div class="cluster-list" id="clusterList">
-                        <div style="color: #666; text-align: center; padding: 20px;">
-                            Carregue os dados para ver os incendios
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <!-- Analysis Tab -->
-            <div class="tab-content" id="tab-analysis">
-                <div class="panel">
-                    <h3><span class="icon">⚠️</span> Indice de Risco</h3>
-                    <div class="risk-meter">
-                        <div class="risk-value" id="riskValue">-</div>
-                        <div id="riskLevel" style="color: #888;">Carregando...</div>
-                        <div class="risk-bar">
-                            <div class="risk-indicator" id="riskIndicator" style="left: 0%;"></div>
-                        </div>
-                        <div class="risk-labels">
-                            <span>Baixo</span>
-                            <span>Moderado</span>
-                            <span>Alto</span>
-                            <span>Critico</span>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🌡️</span> Fatores de Risco</h3>
-                    <div class="progress-item">
-                        <div class="progress-label">
-                            <span>Temperatura</span>
-                            <span id="tempValue">-</span>
-                        </div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" id="tempBar" style="width: 0%; background: #ef4444;"></div>
-                        </div>
-                    </div>
-                    <div class="progress-item">
-                        <div class="progress-label">
-                            <span>Umidade (inverso)</span>
-                            <span id="humidValue">-</span>
-                        </div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" id="humidBar" style="width: 0%; background: #3b82f6;"></div>
-                        </div>
-                    </div>
-                    <div class="progress-item">
-                        <div class="progress-label">
-                            <span>Vento</span>
-                            <span id="windValue">-</span>
-                        </div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" id="windBar" style="width: 0%; background: #8b5cf6;"></div>
-                        </div>
-                    </div>
-                    <div class="progress-item">
-                        <div class="progress-label">
-                            <span>Seca</span>
-                            <span id="droughtValue">-</span>
-                        </div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" id="droughtBar" style="width: 0%; background: #f59e0b;"></div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🌿</span> Bioma Afetado</h3>
-                    <div class="stat-grid">
-                        <div class="stat-box full">
-                            <div class="stat-value" id="biomeName" style="font-size: 1.2em;">-</div>
-                            <div class="stat-label">Bioma Predominante</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="biomeCarbon">-</div>
-                            <div class="stat-label">Carbono (t/ha)</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="biomeRecovery">-</div>
-                            <div class="stat-label">Recuperacao (anos)</div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">💨</span> Emissoes Estimadas</h3>
-                    <div class="emissions-card">
-                        <div class="emissions-value" id="emissionsCO2">-</div>
-                        <div class="emissions-unit">toneladas de CO2</div>
-                        <div class="emissions-equiv" id="emissionsEquiv">-</div>
-                    </div>
-                    <div class="stat-grid">
-                        <div class="stat-box">
-                            <div class="stat-value" style="font-size: 1.2em;" id="emissionsCH4">-</div>
-                            <div class="stat-label">CH4 (ton)</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" style="font-size: 1.2em;" id="emissionsPM25">-</div>
-                            <div class="stat-label">PM2.5 (ton)</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-
-            <!-- Prediction Tab -->
-            <div class="tab-content" id="tab-predict">
-                <div class="panel">
-                    <h3><span class="icon">🎯</span> Selecionar Foco</h3>
-                    <p style="font-size: 0.8em; color: #888; margin-bottom: 10px;">
-                        Clique em um foco no mapa ou selecione um incendio abaixo para ver a previsao de propagacao.
-                    </p>
-                    <div class="form-group">
-                        <label>Incendio Selecionado</label>
-                        <select id="fireSelect">
-                            <option value="">Selecione um incendio...</option>
-                        </select>
-                    </div>
-                    <div class="form-row">
-                        <div class="form-group">
-                            <label>Horas de Previsao</label>
-                            <select id="hoursSelect">
-                                <option value="3">3 horas</option>
-                                <option value="6" selected>6 horas</option>
-                                <option value="12">12 horas</option>
-                                <option value="24">24 horas</option>
-                            </select>
-                        </div>
-                        <div class="form-group">
-                            <label>Dias sem Chuva</label>
-                            <input type="number" id="droughtDays" value="5" min="0" max="60">
-                        </div>
-                    </div>
-                    <button class="btn btn-primary" onclick="runPrediction()">Gerar Previsao</button>
-                    <button class="btn btn-secondary" onclick="clearPrediction()">Limpar</button>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">📈</span> Previsao de Propagacao</h3>
-                    <div class="stat-grid">
-                        <div class="stat-box">
-                            <div class="stat-value" id="spreadRate">-</div>
-                            <div class="stat-label">Velocidade (m/min)</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="spreadDir">-</div>
-                            <div class="stat-label">Direcao</div>
-                        </div>
-                    </div>
-                    <div class="timeline" id="predictionTimeline">
-                        <div style="color: #666; text-align: center; padding: 20px; font-size: 0.85em;">
-                            Selecione um incendio para ver a previsao
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🚨</span> Evacuacao</h3>
-                    <div class="stat-box full" style="margin-bottom: 10px;">
-                        <div class="stat-value red" id="evacuationStatus">-</div>
-                        <div class="stat-label">Status de Alerta</div>
-                    </div>
-                    <p style="font-size: 0.8em; color: #888;" id="evacuationMessage">
-                        Execute uma previsao para ver recomendacoes de evacuacao.
-                    </p>
-                </div>
-            </div>
-
-            <!-- Alerts Tab -->
-            <div class="tab-content" id="tab-alerts">
-                <div class="panel">
-                    <h3><span class="icon">🚨</span> Sistema de Alertas</h3>
-                    <div class="stat-grid">
-                        <div class="stat-box">
-                            <div class="stat-value red" id="alertLevel">-</div>
-                            <div class="stat-label">Nivel de Alerta</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value yellow" id="alertsActive">0</div>
-                            <div class="stat-label">Alertas Ativos</div>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">📍</span> Areas em Risco</h3>
-                    <div id="riskAreasList" style="max-height: 200px; overflow-y: auto;">
-                        <div style="color: #666; text-align: center; padding: 15px; font-size: 0.85em;">
-                            Carregando areas de risco...
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">🛣️</span> Rotas de Evacuacao</h3>
-                    <p style="font-size: 0.8em; color: #888; margin-bottom: 10px;">
-                        Selecione um incendio na aba Previsao para ver rotas de evacuacao.
-                    </p>
-                    <div id="evacuationRoutes" style="max-height: 250px; overflow-y: auto;">
-                        <div style="color: #666; text-align: center; padding: 15px; font-size: 0.85em;">
-                            Nenhuma rota de evacuacao necessaria no momento.
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">📞</span> Contatos de Emergencia</h3>
-                    <div style="font-size: 0.85em;">
-                        <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid #333;">
-                            <span>Bombeiros</span>
-                            <span style="color: #ff6b35; font-weight: bold;">193</span>
-                        </div>
-                        <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid #333;">
-                            <span>Defesa Civil</span>
-                            <span style="color: #ff6b35; font-weight: bold;">199</span>
-                        </div>
-                        <div style="display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid #333;">
-                            <span>SAMU</span>
-                            <span style="color: #ff6b35; font-weight: bold;">192</span>
-                        </div>
-                        <div style="display: flex; justify-content: space-between; padding: 8px 0;">
-                            <span>Policia Militar</span>
-                            <span style="color: #ff6b35; font-weight: bold;">190</span>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="panel">
-                    <h3><span class="icon">📊</span> Area Queimada Total</h3>
-                    <div class="stat-grid">
-                        <div class="stat-box full">
-                            <div class="stat-value" id="totalBurnedArea">-</div>
-                            <div class="stat-label">Hectares Estimados</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value yellow" id="burnedForest">-</div>
-                            <div class="stat-label">Floresta (ha)</div>
-                        </div>
-                        <div class="stat-box">
-                            <div class="stat-value" id="burnedOther">-</div>
-                            <div class="stat-label">Outros (ha)</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <div class="map-container">
-            <div id="map"></div>
-
-
-            <div class="map-overlay">
-                <div class="map-card">
-                    <h4>Clima Atual</h4>
-                    <div class="weather-grid">
-                        <div class="weather-item">
-                            <span class="weather-icon">🌡️</span>
-                            <span id="weatherTemp">-</span>
-                        </div>
-                        <div class="weather-item">
-                            <span class="weather-icon">💧</span>
-                            <span id="weatherHumid">-</span>
-                        </div>
-                        <div class="weather-item">
-                            <span class="weather-icon">💨</span>
-                            <span id="weatherWind">-</span>
-                        </div>
-                        <div class="weather-item">
-                            <span class="weather-icon">🧭</span>
-                            <span id="weatherDir">-</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="map-card">
-                    <h4>Legenda</h4>
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: #ff0000;"></div>
-                        <span>Alta (FRP > 50)</span>
-                    </div>
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: #ff6b35;"></div>
-                        <span>Media (FRP 10-50)</span>
-                    </div>
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: #f7c873;"></div>
-                        <span>Baixa (FRP < 10)</span>
-                    </div>
-                    <div class="legend-item">
-                        <div class="legend-color" style="background: rgba(255,0,0,0.3); border: 2px dashed #ff0000;"></div>
-                        <span>Previsao</span>
-                    </div>
-                </div>
-            </div>
-
-            <div class="bottom-panel">
-                <div class="info-chip">
-                    <span>📡 Satelite:</span>
-                    <span class="value">VIIRS NOAA-20</span>
-                </div>
-                <div class="info-chip">
-                    <span>🕐 Atualizado:</span>
-                    <span class="value" id="lastUpdate">-</span>
-                </div>
-                <div class="info-chip" id="liveIndicator" style="background: rgba(255,107,53,0.3);">
-                    <span style="color: #ff6b35;">●</span>
-                    <span class="value" style="color: #ff6b35;">AO VIVO</span>
-                </div>
-                <div class="info-chip">
-                    <span>🌍 Bioma:</span>
-                    <span class="value" id="currentBiome">-</span>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <script src="https://unpkg.com/leaflet.markercluster@1.4.1/dist/leaflet.markercluster.js"></script>
-    <script src="https://unpkg.com/leaflet.heat@0.2.0/dist/leaflet-heat.js"></script>
-    <script>
-        // ========================================
-        // Configuration
-        // ========================================
-        let autoRefreshInterval = null;
-        let autoRefreshEnabled = false;
-        let currentViewMode = 'markers'; // 'markers', 'heatmap', 'both'
-        let heatLayer = null;
-
-        const regions = {
-            brazil: { west: -74, south: -34, east: -34, north: 5, center: [-14, -52], zoom: 4 },
-            amazon: { west: -74, south: -10, east: -44, north: 5, center: [-3, -60], zoom: 5 },
-            cerrado: { west: -60, south: -24, east: -41, north: -2, center: [-15, -47], zoom: 5 },
-            pantanal: { west: -59, south: -22, east: -54, north: -15, center: [-18, -56], zoom: 6 },
-            mataatlantica: { west: -55, south: -30, east: -34, north: -3, center: [-20, -44], zoom: 5 },
-            caatinga: { west: -46, south: -17, east: -35, north: -2, center: [-9, -40], zoom: 6 },
-            saopaulo: { west: -53, south: -26, east: -44, north: -19, center: [-22, -48], zoom: 6 },
-            nordeste: { west: -48, south: -18, east: -34, north: -2, center: [-9, -38], zoom: 5 },
-            sul: { west: -58, south: -34, east: -48, north: -22, center: [-27, -51], zoom: 5 }
-        };
-
-        // State
-        let currentHotspots = [];
-        let currentClusters = [];
-        let currentWeather = null;
-        let selectedCluster = null;
-        let predictionCircles = [];
-
-        // ========================================
-        // Initialize Map with Multiple Layers
-        // ========================================
-        const map = L.map('map').setView([-22, -48], 6);
-
-        // Base layers - Google Maps as default
-        const googleMaps = L.tileLayer('https://mt1.google.com/vt/lyrs=r&x={x}&y={y}&z={z}', {
-            attribution: '&copy; Google Maps',
-            maxZoom: 20
-        });
-
-        const googleSatellite = L.tileLayer('https://mt1.google.com/vt/lyrs=s&x={x}&y={y}&z={z}', {
-            attribution: '&copy; Google Satellite',
-            maxZoom: 20
-        });
-
-        const googleHybrid = L.tileLayer('https://mt1.google.com/vt/lyrs=y&x={x}&y={y}&z={z}', {
-            attribution: '&copy; Google Hybrid',
-            maxZoom: 20
-        });
-
-        const googleTerrain = L.tileLayer('https://mt1.google.com/vt/lyrs=p&x={x}&y={y}&z={z}', {
-            attribution: '&copy; Google Terrain',
-            maxZoom: 20
-        });
-
-        const darkLayer = L.tileLayer('https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png', {
-            attribution: '&copy; CartoDB',
-            maxZoom: 19
-        });
-
-        // Add Google Maps as default layer
-        googleMaps.addTo(map);
-
-        // Layer control
-        const baseLayers = {
-            'Google Maps': googleMaps,
-            'Google Satellite': googleSatellite,
-            'Google Hybrid': googleHybrid,
-            'Google Terrain': googleTerrain,
-            'Modo Escuro': darkLayer
-        };
-        L.control.layers(baseLayers, null, { position: 'topright' }).addTo(map);
-
-        const markers = L.markerClusterGroup({
-            maxClusterRadius: 50,
-            spiderfyOnMaxZoom: true,
-            showCoverageOnHover: false,
-            iconCreateFunction: function(cluster) {
-                const count = cluster.getChildCount();
-                return L.divIcon({
-                    html: '<div style="background: rgba(255,107,53,0.9); color: white; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; font-weight: bold; border: 2px solid #fff; box-shadow: 0 0 10px rgba(255,107,53,0.5);">' + count + '</div>',
-                    className: 'marker-cluster',
-                    iconSize: L.point(40, 40)
-                });
-            }
-        });
-        map.addLayer(markers);
-
-        // ========================================
-        // Tab Navigation
-        // ========================================
-        document.querySelectorAll('.tab').forEach(tab => {
-            tab.addEventListener('click', () => {
-                document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-                document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-                tab.classList.add('active');
-                document.getElementById('tab-' + tab.dataset.tab).classList.add('active');
-            });
-        });
-
-        // ========================================
-        // Helper Functions
-        // ========================================
-        function getMarkerColor(frp) {
-            if (frp > 50) return '#ff0000';
-            if (frp > 10) return '#ff6b35';
-            return '#f7c873';
-        }
+# The page script is an ES module on a content-hashed path as well; the page
+# preloads it from <head> so the fetch overlaps parsing of the body
+DASHBOARD_JS = get_dashboard_js()
+DASHBOARD_JS_PATH = "/static/dashboard.{}.js".format(
+    hashlib.blake2b(DASHBOARD_JS, digest_size=5).hexdigest()
+)
 
-        function createFireIcon(frp) {
-            const color = getMarkerColor(frp);
-            const size = frp > 50 ? 14 : (frp > 10 ? 11 : 8);
-            return L.divIcon({
-                html: '<div style="background: ' + color + '; width: ' + size + 'px; height: ' + size + 'px; border-radius: 50%; border: 2px solid rgba(255,255,255,0.8); box-shadow: 0 0 10px ' + color + ';"></div>',
-                className: 'fire-marker',
-                iconSize: [size, size]
-            });
-        }
+# Heat map worker script, referenced from the page by its hashed path
+HEAT_WORKER_JS = _read_static("heat-worker.js")
+HEAT_WORKER_JS_PATH = "/static/heat-worker.{}.js".format(
+    hashlib.blake2b(HEAT_WORKER_JS, digest_size=5).hexdigest()
+)
 
-        function getWindDirection(degrees) {
-            const dirs = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW'];
-            return dirs[Math.round(degrees / 45) % 8];
-        }
 
-        // Brazilian states boundaries (simplified)
-        const states = {
-            "Acre": {west: -74, south: -11.5, east: -66.5, north: -7},
-            "Amazonas": {west: -74, south: -10, east: -56, north: 2.5},
-            "Roraima": {west: -65, south: 0, east: -58, north: 5.5},
-            "Para": {west: -59, south: -10, east: -46, north: 3},
-            "Amapa": {west: -55, south: -1, east: -49, north: 5},
-            "Tocantins": {west: -51, south: -14, east: -45.5, north: -5},
-            "Maranhao": {west: -49, south: -11, east: -41, north: -1},
-            "Piaui": {west: -46, south: -11, east: -40.5, north: -2.5},
-            "Ceara": {west: -42, south: -8, east: -37, north: -2.5},
-            "Rio Grande do Norte": {west: -38.5, south: -7, east: -34.5, north: -4.5},
-            "Paraiba": {west: -39, south: -8.5, east: -34.5, north: -6},
-            "Pernambuco": {west: -41.5, south: -10, east: -34.5, north: -7},
-            "Alagoas": {west: -38.5, south: -10.5, east: -35, north: -8.5},
-            "Sergipe": {west: -38.5, south: -11.5, east: -36.5, north: -9.5},
-            "Bahia": {west: -47, south: -18.5, east: -37.5, north: -8.5},
-            "Minas Gerais": {west: -52, south: -23, east: -39.5, north: -14},
-            "Espirito Santo": {west: -42, south: -21.5, east: -39.5, north: -17.5},
-            "Rio de Janeiro": {west: -45, south: -23.5, east: -40.5, north: -20.5},
-            "Sao Paulo": {west: -54, south: -26, east: -44, north: -19.5},
-            "Parana": {west: -55, south: -27, east: -48, north: -22.5},
-            "Santa Catarina": {west: -54, south: -29.5, east: -48, north: -25.5},
-            "Rio Grande do Sul": {west: -58, south: -34, east: -49, north: -27},
-            "Mato Grosso do Sul": {west: -58, south: -25, east: -53, north: -17},
-            "Mato Grosso": {west: -62, south: -18, east: -50, north: -7},
-            "Goias": {west: -53.5, south: -20, east: -45.5, north: -12.5},
-            "Distrito Federal": {west: -48.5, south: -16.1, east: -47, north: -15.4},
-            "Rondonia": {west: -67, south: -14, east: -59.5, north: -7.5}
-        };
-
-        function getStateName(lat, lon) {
-            for (const [name, bounds] of Object.entries(states)) {
-                if (lon >= bounds.west && lon <= bounds.east && lat >= bounds.south && lat <= bounds.north) {
-                    return name;
-                }
-            }
-            return 'Brasil';
-        }
+# Leaflet stylesheet bundled into a same-origin file by
+# `make vendor-css`; without the bundle the page loads them from unpkg
+VENDOR_CSS_FILE = os.path.join(STATIC_DIR, "vendor.css")
 
-        function showLoading() {
-            document.getElementById('loadingIndicator').classList.add('active');
-        }
 
-        function hideLoading() {
-            document.getElementById('loadingIndicator').classList.remove('active');
-        }
+def _load_vendor_css():
+    """Read the bundled vendor stylesheet, or None if it has not been built."""
+    try:
+        with open(VENDOR_CSS_FILE, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+VENDOR_CSS = _load_vendor_css()
+if VENDOR_CSS:
+    VENDOR_CSS_PATH = "/static/vendor.{}.css".format(hashlib.blake2b(VENDOR_CSS, digest_size=5).hexdigest())
+    VENDOR_CSS_LINKS = '    <link rel="stylesheet" href="{}" />'.format(VENDOR_CSS_PATH)
+else:
+    VENDOR_CSS_PATH = None
+    VENDOR_CSS_LINKS = """    <link rel="preload" as="style" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" onload="this.onload=null;this.rel='stylesheet'" />
+    <noscript>
+        <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
+    </noscript>"""
+
+
+# Sidebar tabs served separately from the page, at DASHBOARD_TAB_PREFIX + name
+DASHBOARD_TABS = ("analysis", "predict", "alerts")
+DASHBOARD_TAB_PREFIX = "/dashboard/tab/"
+
+
+def _stat_box(element_id, label, value_class="", full=False, style="", initial="-"):
+    """Markup for one stat box: a value updated by id over its label."""
+    return (
+        '<div class="stat-box{}"><div class="stat-value{}" id="{}"{}>{}</div>'
+        '<div class="stat-label">{}</div></div>'
+    ).format(
+        " full" if full else "",
+        " " + value_class if value_class else "",
+        element_id,
+        ' style="{}"'.format(style) if style else "",
+        initial,
+        label
+    )
 
-        // ========================================
-        // API Calls
-        // ========================================
-        async function fetchHotspots(coords, days) {
-            const url = '/api/hotspots?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days;
-            const response = await fetch(url);
-            return await response.json();
-        }
 
-        async function fetchWeather(lat, lon) {
-            const url = '/api/weather?lat=' + lat + '&lon=' + lon;
-            const response = await fetch(url);
-            return await response.json();
-        }
+def _stat_grid(*boxes):
+    """Markup for a stat-grid of boxes."""
+    return '<div class="stat-grid">' + "".join(boxes) + "</div>"
+
+
+# Stat grids shared by the page and tab templates, built once at import
+STAT_GRIDS = {
+    "stats_grid": _stat_grid(
+        _stat_box("totalFires", "Focos"),
+        _stat_box("totalClusters", "Incendios"),
+        _stat_box("avgFRP", "FRP Medio"),
+        _stat_box("maxFRP", "FRP Max")
+    ),
+    "weather_grid": _stat_grid(
+        _stat_box("sidebarTemp", "Temperatura", style="font-size: 1.3em;"),
+        _stat_box("sidebarHumid", "Umidade", "green", style="font-size: 1.3em;"),
+        _stat_box("sidebarWind", "Vento", style="font-size: 1.3em;"),
+        _stat_box("sidebarWindDir", "Direcao", style="font-size: 1.3em;")
+    ),
+    "biome_grid": _stat_grid(
+        _stat_box("biomeName", "Bioma Predominante", full=True, style="font-size: 1.2em;"),
+        _stat_box("biomeCarbon", "Carbono (t/ha)"),
+        _stat_box("biomeRecovery", "Recuperacao (anos)")
+    ),
+    "emissions_grid": _stat_grid(
+        _stat_box("emissionsCH4", "CH4 (ton)", style="font-size: 1.2em;"),
+        _stat_box("emissionsPM25", "PM2.5 (ton)", style="font-size: 1.2em;")
+    ),
+    "spread_grid": _stat_grid(
+        _stat_box("spreadRate", "Velocidade (m/min)"),
+        _stat_box("spreadDir", "Direcao")
+    ),
+    "alerts_grid": _stat_grid(
+        _stat_box("alertLevel", "Nivel de Alerta", "red"),
+        _stat_box("alertsActive", "Alertas Ativos", "yellow", initial="0")
+    ),
+    "burned_grid": _stat_grid(
+        _stat_box("totalBurnedArea", "Hectares Estimados", full=True),
+        _stat_box("burnedForest", "Floresta (ha)", "yellow"),
+        _stat_box("burnedOther", "Outros (ha)")
+    )
+}
 
-        async function fetchRisk(lat, lon, days_without_rain) {
-            const url = '/api/risk?lat=' + lat + '&lon=' + lon + '&days_without_rain=' + days_without_rain;
-            const response = await fetch(url);
-            return await response.json();
-        }
+# Options for the dashboard's filter selects, rendered client-side from
+# /api/schema/filters so changing them does not touch the page itself
+FILTER_SCHEMA = {
+    "regions": {
+        "default": "saopaulo",
+        "options": [
+            {"value": "brazil", "label": "Brasil Completo", "west": -74, "south": -34, "east": -34, "north": 5, "center": [-14, -52], "zoom": 4},
+            {"value": "amazon", "label": "Amazonia", "west": -74, "south": -10, "east": -44, "north": 5, "center": [-3, -60], "zoom": 5},
+            {"value": "cerrado", "label": "Cerrado", "west": -60, "south": -24, "east": -41, "north": -2, "center": [-15, -47], "zoom": 5},
+            {"value": "pantanal", "label": "Pantanal", "west": -59, "south": -22, "east": -54, "north": -15, "center": [-18, -56], "zoom": 6},
+            {"value": "mataatlantica", "label": "Mata Atlantica", "west": -55, "south": -30, "east": -34, "north": -3, "center": [-20, -44], "zoom": 5},
+            {"value": "caatinga", "label": "Caatinga", "west": -46, "south": -17, "east": -35, "north": -2, "center": [-9, -40], "zoom": 6},
+            {"value": "saopaulo", "label": "Sao Paulo", "west": -53, "south": -26, "east": -44, "north": -19, "center": [-22, -48], "zoom": 6},
+            {"value": "nordeste", "label": "Nordeste", "west": -48, "south": -18, "east": -34, "north": -2, "center": [-9, -38], "zoom": 5},
+            {"value": "sul", "label": "Sul", "west": -58, "south": -34, "east": -48, "north": -22, "center": [-27, -51], "zoom": 5}
+        ]
+    },
+    "days": {
+        "default": "2",
+        "options": [
+            {"value": "1", "label": "Ultimo dia"},
+            {"value": "2", "label": "2 dias"},
+            {"value": "3", "label": "3 dias"},
+            {"value": "5", "label": "5 dias"},
+            {"value": "7", "label": "7 dias"}
+        ]
+    },
+    "hours": {
+        "default": "6",
+        "options": [
+            {"value": "3", "label": "3 horas"},
+            {"value": "6", "label": "6 horas"},
+            {"value": "12", "label": "12 horas"},
+            {"value": "24", "label": "24 horas"}
+        ]
+    }
+}
 
-        async function fetchClusters(coords, days) {
-            const url = '/api/clusters?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days;
-            const response = await fetch(url);
-            return await response.json();
-        }
+# Templates parsed once at import; placeholders are $identifiers (the markup
+# itself contains no "$")
+DASHBOARD_TEMPLATE = Template(_read_static("dashboard.html").decode("utf-8"))
+DASHBOARD_TAB_TEMPLATES = {
+    name: Template(_read_static("tab-{}.html".format(name)).decode("utf-8"))
+    for name in DASHBOARD_TABS
+}
 
-        async function fetchPrediction(lat, lon, area, wind_dir, hours) {
-            const url = '/api/predict?lat=' + lat + '&lon=' + lon + '&area=' + area + '&wind_dir=' + wind_dir + '&hours=' + hours;
-            const response = await fetch(url);
-            return await response.json();
-        }
 
-        async function fetchEmissions(lat, lon, area) {
-            const url = '/api/emissions?lat=' + lat + '&lon=' + lon + '&area=' + area;
-            const response = await fetch(url);
-            return await response.json();
-        }
+def get_dashboard_page():
+    """Return complete dashboard HTML."""
+    return DASHBOARD_TEMPLATE.substitute(
+        STAT_GRIDS,
+        vendor_css_links=VENDOR_CSS_LINKS,
+        dashboard_css_path=DASHBOARD_CSS_PATH,
+        dashboard_js_path=DASHBOARD_JS_PATH,
+        heat_worker_path=HEAT_WORKER_JS_PATH
+    )
 
-        async function fetchLocationInfo(lat, lon) {
-            const droughtDays = parseInt(document.getElementById('droughtDays').value) || 5;
-            const url = '/api/location?lat=' + lat + '&lon=' + lon + '&days_without_rain=' + droughtDays;
-            const response = await fetch(url);
-            return await response.json();
-        }
 
-        async function fetchEvacuation(lat, lon, radius) {
-            const url = '/api/evacuation?lat=' + lat + '&lon=' + lon + '&radius=' + radius;
-            const response = await fetch(url);
-            return await response.json();
-        }
+def get_dashboard_tab(name):
+    """Return the HTML fragment for a lazily loaded dashboard tab."""
+    return DASHBOARD_TAB_TEMPLATES[name].substitute(STAT_GRIDS)
 
-        async function fetchBurnedArea(coords, days) {
-            const url = '/api/burned-area?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days;
-            const response = await fetch(url);
-            return await response.json();
-        }
 
-        // ========================================
-        // Heat Map Functions
-        // ========================================
-        function updateHeatMap() {
-            if (heatLayer) {
-                map.removeLayer(heatLayer);
-            }
+def get_landing_page():
+    """Return API documentation page."""
+    return """<!DOCTYPE html>
+<html>
+<head>
+    <title>FireWatch AI - API</title>
+    <meta charset="utf-8">
+    <style>
+        body { font-family: sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; background: #1a1a2e; color: #eee; }
+        h1 { color: #ff6b35; }
+        h3 { color: #f7c873; margin-top: 30px; }
+        code { background: #0f0f1a; padding: 3px 8px; border-radius: 4px; color: #f7c873; }
+        a { color: #ff6b35; }
+        .endpoint { background: #16213e; padding: 12px; margin: 8px 0; border-radius: 6px; border-left: 4px solid #ff6b35; }
+    </style>
+</head>
+<body>
+    <h1>FireWatch AI - API</h1>
+    <p><a href="/">Voltar ao Dashboard</a></p>
 
-            if (currentViewMode === 'markers') return;
-
-            const heatData = currentHotspots.map(h => [
-                h.latitude,
-                h.longitude,
-                Math.min(1, h.frp / 100)  // Normalize intensity
-            ]);
-
-            heatLayer = L.heatLayer(heatData, {
-                radius: 25,
-                blur: 15,
-                maxZoom: 10,
-                max: 1.0,
-                gradient: {
-                    0.0: '#ffffb2',
-                    0.25: '#fecc5c',
-                    0.5: '#fd8d3c',
-                    0.75: '#f03b20',
-                    1.0: '#bd0026'
-                }
-            }).addTo(map);
-        }
+    <h3>Endpoints</h3>
+    <div class="endpoint"><code>GET /api/health</code> - Health check</div>
+    <div class="endpoint"><code>GET /api/hotspots?west=&south=&east=&north=&days=</code> - Fire hotspots</div>
+    <div class="endpoint"><code>GET /api/weather?lat=&lon=</code> - Weather data</div>
+    <div class="endpoint"><code>GET /api/risk?lat=&lon=&days_without_rain=</code> - Fire risk index</div>
+    <div class="endpoint"><code>GET /api/clusters?west=&south=&east=&north=&days=</code> - Fire clusters</div>
+    <div class="endpoint"><code>GET /api/emissions?lat=&lon=&area=</code> - Carbon emissions</div>
+    <div class="endpoint"><code>GET /api/predict?lat=&lon=&area=&wind_dir=&hours=</code> - Spread prediction</div>
 
-        function setViewMode(mode) {
-            currentViewMode = mode;
-
-            // Update buttons
-            document.querySelectorAll('.view-btn').forEach(btn => btn.classList.remove('active'));
-            document.querySelector('[data-view="' + mode + '"]').classList.add('active');
-
-            // Update layers
-            if (mode === 'markers') {
-                if (heatLayer) map.removeLayer(heatLayer);
-                map.addLayer(markers);
-            } else if (mode === 'heatmap') {
-                map.removeLayer(markers);
-                updateHeatMap();
-            } else { // both
-                map.addLayer(markers);
-                updateHeatMap();
-            }
-        }
+    <h3>Example</h3>
+    <p><a href="/api/hotspots?west=-50&south=-25&east=-44&north=-19&days=2">Fires in Sao Paulo</a></p>
+</body>
+</html>"""
 
-        // ========================================
-        // Auto Refresh Functions
-        // ========================================
-        function toggleAutoRefresh() {
-            autoRefreshEnabled = !autoRefreshEnabled;
-            const btn = document.getElementById('autoRefreshBtn');
-            const indicator = document.getElementById('liveIndicator');
-
-            if (autoRefreshEnabled) {
-                btn.classList.add('active');
-                btn.innerHTML = '⏸ Pausar';
-                indicator.style.display = 'flex';
-                indicator.classList.add('pulse');
-                autoRefreshInterval = setInterval(() => loadAllData(false), 5000);
-            } else {
-                btn.classList.remove('active');
-                btn.innerHTML = '▶ Auto (5s)';
-                indicator.style.display = 'none';
-                indicator.classList.remove('pulse');
-                clearInterval(autoRefreshInterval);
-            }
-        }
 
-        // ========================================
-        // Load All Data
-        // ========================================
-        async function loadAllData(fitBounds = false) {
-            const region = document.getElementById('regionSelect').value;
-            const days = document.getElementById('daysSelect').value;
-            const coords = regions[region];
-            const droughtDays = parseInt(document.getElementById('droughtDays').value) || 5;
+# ============================================================================
+# Request Routing
+# ============================================================================
 
-            if (!autoRefreshEnabled) showLoading();
+def _json_default(obj):
+    """Convert NumPy values for the stdlib json fallback."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+def dumps_json(data):
+    """Serialize a payload to UTF-8 JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+
+def json_response(status, data):
+    """Build a JSON (status, headers, body) response."""
+    headers = [("Content-Type", "application/json"), ("Access-Control-Allow-Origin", "*")]
+    return status, headers, dumps_json(data)
+
+
+def _etag(body):
+    """Strong ETag for a response body."""
+    return '"{}"'.format(hashlib.blake2b(body, digest_size=8).hexdigest())
+
+
+def _page_variants(body):
+    """Pre-compress a page, returning (encoding, body, etag) in preference order."""
+    variants = []
+    if ZSTD_AVAILABLE:
+        compressed = zstandard.ZstdCompressor(level=19).compress(body)
+        variants.append(("zstd", compressed, _etag(compressed)))
+    if BROTLI_AVAILABLE:
+        compressed = brotli.compress(body, quality=11)
+        variants.append(("br", compressed, _etag(compressed)))
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    variants.append(("gzip", compressed, _etag(compressed)))
+    variants.append(("identity", body, _etag(body)))
+    return variants
+
+
+def _accepted_encodings(header):
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+# Static pages are encoded and compressed once at import (at maximum level,
+# since it only runs on cold start); clients revalidate them by ETag. The
+# dashboard and its tabs are reused for a minute, then shown from cache while
+# the browser revalidates in the background
+PAGE_CACHE_CONTROL = "public, max-age=300"
+DASHBOARD_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+SCHEMA_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+# Emissions depend only on the query (biome table lookups); location
+# details embed weather, which is itself cached for WEATHER_CACHE_TTL
+EMISSIONS_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=300"
+LOCATION_CACHE_CONTROL = "public, max-age={}, stale-while-revalidate=300".format(WEATHER_CACHE_TTL)
+DASHBOARD_PAGE = get_dashboard_page().encode("utf-8")
+DASHBOARD_VARIANTS = _page_variants(DASHBOARD_PAGE)
+DASHBOARD_ETAG = DASHBOARD_VARIANTS[-1][2]
+DASHBOARD_TAB_VARIANTS = {
+    name: _page_variants(get_dashboard_tab(name).encode("utf-8"))
+    for name in DASHBOARD_TABS
+}
+LANDING_PAGE = get_landing_page().encode("utf-8")
+LANDING_VARIANTS = _page_variants(LANDING_PAGE)
+DASHBOARD_CSS_VARIANTS = _page_variants(DASHBOARD_CSS)
+DASHBOARD_JS_VARIANTS = _page_variants(DASHBOARD_JS)
+HEAT_WORKER_JS_VARIANTS = _page_variants(HEAT_WORKER_JS)
+VENDOR_CSS_VARIANTS = _page_variants(VENDOR_CSS) if VENDOR_CSS else None
+FILTER_SCHEMA_VARIANTS = _page_variants(dumps_json(FILTER_SCHEMA))
+
+
+def page_response(variants, request_headers, content_type="text/html; charset=utf-8",
+                  cache_control=PAGE_CACHE_CONTROL):
+    """Build a cacheable response in the best accepted encoding.
+
+    Returns a 304 when the client's copy of that representation is current.
+    """
+    accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+    for encoding, body, etag in variants:
+        if encoding == "identity" or accepted.get(encoding, accepted.get("*", 0)) > 0:
+            break
+
+    headers = [
+        ("Content-Type", content_type),
+        ("ETag", etag),
+        ("Cache-Control", cache_control),
+        ("Vary", "Accept-Encoding")
+    ]
+    if encoding != "identity":
+        headers.append(("Content-Encoding", encoding))
+
+    if _client_has_etag(request_headers, etag):
+        return 304, headers[1:], b""
+    return 200, headers, body
+
+
+def _client_has_etag(request_headers, etag):
+    """Whether If-None-Match names this ETag (or any representation)."""
+    if_none_match = request_headers.get("if-none-match", "")
+    return if_none_match.strip() == "*" or etag in (t.strip().replace("W/", "", 1) for t in if_none_match.split(","))
+
+
+def conditional_response(body, content_type, request_headers, cache_control="no-cache", extra_headers=()):
+    """Build a 200 response tagged with an ETag of its body.
+
+    Returns a header-only 304 when the client already holds that body.
+    """
+    etag = _etag(body)
+    headers = [("Content-Type", content_type), ("Access-Control-Allow-Origin", "*")]
+    headers += list(extra_headers) + [("ETag", etag), ("Cache-Control", cache_control)]
+    if _client_has_etag(request_headers, etag):
+        # Same validator and Vary as the 200 compress_response would send
+        codec = _dynamic_codec(headers, body, request_headers)
+        if codec is not None:
+            headers = _negotiated_headers(headers, codec[0])
+        return 304, headers[1:], b""
+    return 200, headers, body
+
+
+def conditional_json_response(data, request_headers, cache_control="no-cache"):
+    """Build a 200 JSON response tagged with an ETag of its body."""
+    return conditional_response(dumps_json(data), "application/json", request_headers, cache_control)
+
+
+def _dynamic_encodings():
+    """Per-response codecs as (encoding, compress) in preference order."""
+    codecs = []
+    if ZSTD_AVAILABLE:
+        codecs.append(("zstd", lambda body: zstandard.ZstdCompressor(level=DYNAMIC_ZSTD_LEVEL).compress(body)))
+    if BROTLI_AVAILABLE:
+        codecs.append(("br", lambda body: brotli.compress(body, quality=DYNAMIC_BROTLI_QUALITY)))
+    codecs.append(("gzip", lambda body: gzip.compress(body, compresslevel=DYNAMIC_GZIP_LEVEL, mtime=0)))
+    return codecs
+
+
+DYNAMIC_ENCODINGS = _dynamic_encodings()
+
+
+def _dynamic_codec(headers, body, request_headers):
+    """Per-request codec for a 200 body, as (encoding, compress).
+
+    Returns None for bodies served as they are (small, pre-encoded or not
+    JSON), and (None, None) when the client accepts none of the codecs.
+    """
+    if len(body) < DYNAMIC_COMPRESS_MIN_BYTES:
+        return None
+    content_type = None
+    for name, value in headers:
+        if name == "Content-Encoding":
+            return None
+        if name == "Content-Type":
+            content_type = value
+    if content_type != "application/json":
+        return None
+
+    accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+    for encoding, compress in DYNAMIC_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding, compress
+    return None, None
+
+
+def _negotiated_headers(headers, encoding):
+    """Add Vary: Accept-Encoding, weakening the ETag if the body is encoded."""
+    if encoding is not None:
+        headers = [
+            (name, "W/" + value if name == "ETag" and not value.startswith("W/") else value)
+            for name, value in headers
+        ]
+    return headers + [("Vary", "Accept-Encoding")]
+
+
+def compress_response(response, request_headers):
+    """Compress a large JSON 200 response in the best encoding the client accepts.
+
+    Pre-encoded pages and other content types pass through unchanged. The
+    body's ETag becomes weak, since it now names the identity content;
+    conditional_response gives its 304s the same ETag and Vary.
+    """
+    status, headers, body = response
+    if status != 200:
+        return response
+    codec = _dynamic_codec(headers, body, request_headers)
+    if codec is None:
+        return response
+
+    encoding, compress = codec
+    headers = _negotiated_headers(headers, encoding)
+    if encoding is None:
+        return status, headers, body
+    return status, headers + [("Content-Encoding", encoding)], compress(body)
+
+
+def hotspots_payload(hotspots, limit=1000):
+    """Body of /api/hotspots for a fetched hotspot table."""
+    return {
+        "count": hotspot_count(hotspots),
+        "source": FIRMS_SOURCE,
+        "hotspots": hotspots_to_records(hotspots, limit)
+    }
 
-            try {
-                // Load hotspots
-                const hotspotsData = await fetchHotspots(coords, days);
-                if (hotspotsData.error) throw new Error(hotspotsData.error);
-                currentHotspots = hotspotsData.hotspots || [];
 
-                // Load clusters
-                const clustersData = await fetchClusters(coords, days);
-                currentClusters = clustersData.clusters || [];
+def clusters_payload(hotspots):
+    """Body of /api/clusters for a fetched hotspot table."""
+    clusters = cluster_hotspots(hotspots)
+    total_area = sum(c.get("estimated_area_ha", 0) for c in clusters)
 
-                // Load weather for center of region
-                const weatherData = await fetchWeather(coords.center[0], coords.center[1]);
-                currentWeather = weatherData;
+    return {
+        "total_hotspots": hotspot_count(hotspots),
+        "total_clusters": len(clusters),
+        "total_area": round(total_area, 1),
+        "clusters": clusters[:50]
+    }
 
-                // Load risk
-                const riskData = await fetchRisk(coords.center[0], coords.center[1], droughtDays);
 
-                // Update map
-                updateMap();
+def risk_payload(weather, days_without_rain):
+    """Body of /api/risk for fetched weather."""
+    risk_index = calculate_risk_index(
+        weather["temperature"],
+        weather["humidity"],
+        weather["wind_speed"],
+        days_without_rain
+    )
 
-                // Update statistics
-                updateStatistics(hotspotsData, clustersData);
+    return {
+        "risk_index": risk_index,
+        "risk_level": get_risk_level(risk_index),
+        "factors": {
+            "temperature": weather["temperature"],
+            "humidity": weather["humidity"],
+            "wind_speed": weather["wind_speed"],
+            "days_without_rain": days_without_rain
+        }
+    }
 
-                // Update weather display
-                updateWeatherDisplay(weatherData);
 
-                // Update risk display
-                updateRiskDisplay(riskData);
+def emissions_payload(lat, lon, area):
+    """Body of /api/emissions."""
+    biome_name, biome_data = get_biome(lat, lon)
+    emissions = calculate_emissions(area, biome_data["carbon_tons_ha"])
 
-                // Update biome info
-                updateBiomeInfo(coords.center[0], coords.center[1], clustersData.total_area || 100);
+    return {
+        "biome": biome_name,
+        "carbon_tons_ha": biome_data["carbon_tons_ha"],
+        "recovery_years": biome_data.get("recovery_years", 20),
+        "area_ha": area,
+        "emissions": emissions
+    }
 
-                // Update cluster list
-                updateClusterList();
 
-                // Update fire select
-                updateFireSelect();
+def route_request(path, query, headers=None):
+    """Route a GET request to its endpoint and return (status, headers, body).
 
-                // Update alerts tab
-                updateAlertsTab(clustersData, riskData);
+    headers maps lower-cased request header names to values.
+    """
+    headers = headers or {}
+    return compress_response(_route(path, query, headers), headers)
 
-                // Update timestamp
-                document.getElementById('lastUpdate').textContent = new Date().toLocaleTimeString('pt-BR');
 
-                // Update heat map if active
-                if (currentViewMode !== 'markers') {
-                    updateHeatMap();
-                }
+def _serve_dashboard(query, headers):
+    """GET / and /dashboard: the dashboard page."""
+    return page_response(DASHBOARD_VARIANTS, headers, cache_control=DASHBOARD_CACHE_CONTROL)
 
-                // Fit map only on first load or manual refresh
-                if (fitBounds && currentHotspots.length > 0) {
-                    map.fitBounds(markers.getBounds(), { padding: [50, 50] });
-                }
 
-                // Hide loading indicator after successful load
-                hideLoading();
+def _serve_docs(query, headers):
+    """GET /docs: the API landing page."""
+    return page_response(LANDING_VARIANTS, headers)
 
-            } catch (error) {
-                console.error('Error loading data:', error);
-                hideLoading();
-            }
-        }
 
-        // ========================================
-        // Update Functions
-        // ========================================
-        function updateMap() {
-            markers.clearLayers();
-
-            currentHotspots.forEach(h => {
-                const marker = L.marker([h.latitude, h.longitude], {
-                    icon: createFireIcon(h.frp)
-                });
-
-                marker.on('click', () => selectHotspot(h));
-
-                // Find state for this hotspot
-                const state = getStateName(h.latitude, h.longitude);
-
-                const popup = '<div style="font-family: sans-serif; min-width: 200px;">' +
-                    '<h4 style="color: #ff6b35; margin: 0 0 8px 0; border-bottom: 1px solid #ddd; padding-bottom: 5px;">🔥 Foco de Incendio</h4>' +
-                    '<p style="margin: 4px 0; font-weight: bold; color: #333;">📍 ' + state + '</p>' +
-                    '<p style="margin: 4px 0; font-size: 0.85em; color: #666;">' + h.latitude.toFixed(5) + ', ' + h.longitude.toFixed(5) + '</p>' +
-                    '<hr style="border: none; border-top: 1px solid #eee; margin: 8px 0;">' +
-                    '<p style="margin: 4px 0;"><strong>FRP:</strong> <span style="color: ' + (h.frp > 50 ? '#dc2626' : h.frp > 10 ? '#f97316' : '#eab308') + '; font-weight: bold;">' + h.frp.toFixed(1) + ' MW</span></p>' +
-                    '<p style="margin: 4px 0;"><strong>Brilho:</strong> ' + h.brightness.toFixed(1) + ' K</p>' +
-                    '<p style="margin: 4px 0;"><strong>Confianca:</strong> ' + h.confidence + '</p>' +
-                    '<p style="margin: 4px 0;"><strong>Satelite:</strong> ' + h.satellite + '</p>' +
-                    '<p style="margin: 4px 0;"><strong>Data/Hora:</strong> ' + h.acq_datetime + '</p>' +
-                    '<p style="margin: 4px 0;"><strong>Periodo:</strong> ' + (h.daynight === 'D' ? '☀️ Diurno' : '🌙 Noturno') + '</p>' +
-                    '<hr style="border: none; border-top: 1px solid #eee; margin: 8px 0;">' +
-                    '<p style="margin: 4px 0; font-size: 0.8em; color: #888;">Clique para ver dados climaticos</p>' +
-                    '</div>';
-
-                marker.bindPopup(popup);
-                markers.addLayer(marker);
-            });
-        }
+def _serve_dashboard_css(query, headers):
+    """Dashboard stylesheet (content-hashed, immutable)."""
+    return page_response(DASHBOARD_CSS_VARIANTS, headers, "text/css; charset=utf-8", ASSET_CACHE_CONTROL)
 
-        function updateStatistics(hotspotsData, clustersData) {
-            const count = hotspotsData.count || 0;
-            const clusters = clustersData.clusters || [];
 
-            document.getElementById('totalFires').textContent = count;
-            document.getElementById('headerFires').textContent = count;
-            document.getElementById('totalClusters').textContent = clusters.length;
+def _serve_dashboard_js(query, headers):
+    """Dashboard script module (content-hashed, immutable)."""
+    return page_response(DASHBOARD_JS_VARIANTS, headers, "text/javascript; charset=utf-8", ASSET_CACHE_CONTROL)
 
-            if (count > 0) {
-                const frps = currentHotspots.map(h => h.frp).filter(f => f > 0);
-                const avgFRP = frps.length > 0 ? (frps.reduce((a, b) => a + b, 0) / frps.length) : 0;
-                const maxFRP = frps.length > 0 ? Math.max(...frps) : 0;
 
-                document.getElementById('avgFRP').textContent = avgFRP.toFixed(1);
-                document.getElementById('maxFRP').textContent = maxFRP.toFixed(1);
+def _serve_heat_worker_js(query, headers):
+    """Heat map worker script (content-hashed, immutable)."""
+    return page_response(HEAT_WORKER_JS_VARIANTS, headers, "text/javascript; charset=utf-8", ASSET_CACHE_CONTROL)
 
-                const totalArea = clusters.reduce((sum, c) => sum + (c.estimated_area_ha || 0), 0);
-                document.getElementById('headerArea').textContent = totalArea.toFixed(0);
-            }
-        }
 
-        function updateWeatherDisplay(weather) {
-            document.getElementById('weatherTemp').textContent = weather.temperature + '°C';
-            document.getElementById('weatherHumid').textContent = weather.humidity + '%';
-            document.getElementById('weatherWind').textContent = weather.wind_speed + ' km/h';
-            document.getElementById('weatherDir').textContent = getWindDirection(weather.wind_direction);
-
-            // Update sidebar weather panel
-            document.getElementById('sidebarTemp').textContent = weather.temperature + '°C';
-            document.getElementById('sidebarHumid').textContent = weather.humidity + '%';
-            document.getElementById('sidebarWind').textContent = weather.wind_speed + ' km/h';
-            document.getElementById('sidebarWindDir').textContent = getWindDirection(weather.wind_direction);
-        }
+def _serve_vendor_css(query, headers):
+    """Bundled Leaflet stylesheets (content-hashed, immutable)."""
+    return page_response(VENDOR_CSS_VARIANTS, headers, "text/css; charset=utf-8", ASSET_CACHE_CONTROL)
 
-        function updateRiskDisplay(risk) {
-            document.getElementById('riskValue').textContent = risk.risk_index;
-            document.getElementById('riskLevel').textContent = risk.risk_level;
-            document.getElementById('riskIndicator').style.left = risk.risk_index + '%';
-            document.getElementById('headerRisk').textContent = risk.risk_level;
 
-            // Color based on risk
-            const riskEl = document.getElementById('riskValue');
-            riskEl.className = 'risk-value';
-            if (risk.risk_index >= 60) riskEl.classList.add('red');
-            else if (risk.risk_index >= 40) riskEl.classList.add('yellow');
-            else riskEl.classList.add('green');
+def _api_filter_schema(query, headers):
+    """GET /api/schema/filters: filter select options for the dashboard."""
+    return page_response(FILTER_SCHEMA_VARIANTS, headers, "application/json", SCHEMA_CACHE_CONTROL)
 
-            // Update factors
-            document.getElementById('tempValue').textContent = risk.factors.temperature + '°C';
-            document.getElementById('tempBar').style.width = Math.min(100, (risk.factors.temperature - 20) * 4) + '%';
 
-            document.getElementById('humidValue').textContent = risk.factors.humidity + '%';
-            document.getElementById('humidBar').style.width = (100 - risk.factors.humidity) + '%';
+def _api_health(query, headers):
+    """GET /api/health: liveness and configured features."""
+    return json_response(200, {
+        "status": "healthy",
+        "version": "0.4.0",
+        "api_key_configured": bool(FIRMS_API_KEY),
+        "features": ["dashboard", "hotspots", "hotspots-binary", "map-clusters", "weather", "risk", "clusters", "emissions", "prediction", "location", "evacuation", "burned-area"]
+    })
 
-            document.getElementById('windValue').textContent = risk.factors.wind_speed + ' km/h';
-            document.getElementById('windBar').style.width = Math.min(100, risk.factors.wind_speed * 2) + '%';
 
-            document.getElementById('droughtValue').textContent = risk.factors.days_without_rain + ' dias';
-            document.getElementById('droughtBar').style.width = Math.min(100, risk.factors.days_without_rain * 5) + '%';
-        }
+def _api_dashboard(query, headers):
+    """GET /api/dashboard: hotspots, clusters, weather, risk and emissions.
 
-        function updateBiomeInfo(lat, lon, area) {
-            fetchEmissions(lat, lon, area).then(data => {
-                document.getElementById('biomeName').textContent = data.biome;
-                document.getElementById('currentBiome').textContent = data.biome;
-                document.getElementById('biomeCarbon').textContent = data.carbon_tons_ha;
-                document.getElementById('biomeRecovery').textContent = data.recovery_years;
-
-                document.getElementById('emissionsCO2').textContent = data.emissions.co2_tons.toLocaleString();
-                document.getElementById('emissionsCH4').textContent = data.emissions.ch4_tons;
-                document.getElementById('emissionsPM25').textContent = data.emissions.pm25_tons;
-                document.getElementById('emissionsEquiv').textContent =
-                    'Equivalente a ' + data.emissions.cars_equivalent.toLocaleString() + ' carros/ano';
-            });
-        }
+    Serves a dashboard refresh for one region in a single round trip.
+    """
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-34])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+        days_without_rain = int(query.get("days_without_rain", [5])[0])
+        # records=0 leaves out the hotspot list for clients that load
+        # it from /api/hotspots.bin
+        limit = 0 if query.get("records", ["1"])[0] == "0" else 1000
+
+        # The two upstream fetches are independent, so overlap them
+        weather_future = _upstream_pool.submit(fetch_weather, lat, lon)
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+        weather, _ = weather_future.result()
+        if error:
+            return json_response(500, {"error": error})
+
+        # Polled by auto-refresh: unchanged bundles revalidate as a 304
+        clusters = clusters_payload(hotspots)
+        return conditional_json_response({
+            "hotspots": hotspots_payload(hotspots, limit),
+            "clusters": clusters,
+            "weather": weather,
+            "risk": risk_payload(weather, days_without_rain),
+            "emissions": emissions_payload(lat, lon, clusters["total_area"] or 100)
+        }, headers)
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-        function updateClusterList() {
-            const list = document.getElementById('clusterList');
 
-            if (currentClusters.length === 0) {
-                list.innerHTML = '<div style="color: #666; text-align: center; padding: 20px;">Nenhum incendio detectado</div>';
-                return;
-            }
+def _api_hotspots(query, headers):
+    """GET /api/hotspots: hotspot records for an area."""
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-34])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
 
-            list.innerHTML = currentClusters.slice(0, 10).map(c =>
-                '<div class="cluster-item" onclick="focusCluster(' + c.id + ')">' +
-                    '<div class="cluster-header">' +
-                        '<span class="cluster-id">' + (c.state || 'Brasil') + '</span>' +
-                        '<span class="cluster-count">' + c.count + ' focos</span>' +
-                    '</div>' +
-                    '<div style="font-size: 0.7em; color: #f7c873; margin: 4px 0;">' + (c.biome || '') + '</div>' +
-                    '<div class="cluster-details">' +
-                        '<span>FRP: ' + c.total_frp.toFixed(1) + ' MW</span>' +
-                        '<span>Area: ' + c.estimated_area_ha + ' ha</span>' +
-                    '</div>' +
-                '</div>'
-            ).join('');
-        }
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+        if error:
+            return json_response(500, {"error": error})
 
-        function updateFireSelect() {
-            const select = document.getElementById('fireSelect');
-            select.innerHTML = '<option value="">Selecione um incendio...</option>';
+        return json_response(200, hotspots_payload(hotspots))
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            currentClusters.slice(0, 20).forEach(c => {
-                const location = c.state || 'Brasil';
-                select.innerHTML += '<option value="' + c.id + '">' + location + ' - ' + c.count + ' focos (' + c.estimated_area_ha + ' ha)</option>';
-            });
-        }
 
-        function updateAlertsTab(clustersData, riskData) {
-            const clusters = clustersData.clusters || [];
-
-            // Calculate total burned area
-            const totalArea = clusters.reduce((sum, c) => sum + (c.estimated_area_ha || 0), 0);
-            const forestArea = Math.round(totalArea * 0.65); // Estimate 65% forest
-            const otherArea = Math.round(totalArea * 0.35);
-
-            document.getElementById('totalBurnedArea').textContent = totalArea.toFixed(0);
-            document.getElementById('burnedForest').textContent = forestArea;
-            document.getElementById('burnedOther').textContent = otherArea;
-
-            // Determine alert level based on risk
-            const riskIndex = riskData ? riskData.risk_index : 0;
-            let alertLevel = 'NORMAL';
-            let alertsActive = 0;
-
-            if (riskIndex >= 80) {
-                alertLevel = 'CRITICO';
-                alertsActive = clusters.length;
-            } else if (riskIndex >= 60) {
-                alertLevel = 'ALTO';
-                alertsActive = Math.ceil(clusters.length * 0.7);
-            } else if (riskIndex >= 40) {
-                alertLevel = 'MODERADO';
-                alertsActive = Math.ceil(clusters.length * 0.3);
-            } else if (riskIndex >= 20) {
-                alertLevel = 'BAIXO';
-                alertsActive = Math.ceil(clusters.length * 0.1);
-            }
+def _api_hotspots_bin(query, headers):
+    """GET /api/hotspots.bin: every hotspot of the area as packed binary records."""
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-34])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
+
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+        if error:
+            return json_response(500, {"error": error})
+
+        return conditional_response(
+            hotspots_to_bytes(hotspots), "application/octet-stream", headers,
+            extra_headers=[
+                ("X-Confidence-Labels", ",".join(hotspots["confidence_labels"])),
+                ("X-Daynight-Labels", ",".join(hotspots["daynight_labels"]))
+            ]
+        )
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            document.getElementById('alertLevel').textContent = alertLevel;
-            document.getElementById('alertsActive').textContent = alertsActive;
 
-            // Color based on alert level
-            const alertEl = document.getElementById('alertLevel');
-            alertEl.className = 'stat-value';
-            if (alertLevel === 'CRITICO') alertEl.classList.add('red');
-            else if (alertLevel === 'ALTO') alertEl.classList.add('yellow');
-            else alertEl.classList.add('green');
+def _api_hotspots_clusters(query, headers):
+    """GET /api/hotspots/clusters: viewport map markers, clustered per zoom."""
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-34])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
+        zoom = int(query.get("zoom", [6])[0])
+        bbox = query.get("bbox", [None])[0]
+        view = [float(v) for v in bbox.split(",")] if bbox else [west, south, east, north]
+        if len(view) != 4:
+            raise ValueError("bbox must be west,south,east,north")
+
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+        if error:
+            return json_response(500, {"error": error})
+
+        return conditional_json_response(map_clusters(hotspots, *view, zoom), headers)
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            // Update risk areas list
-            updateRiskAreasList(clusters);
-        }
 
-        function updateRiskAreasList(clusters) {
-            const list = document.getElementById('riskAreasList');
+def _api_weather(query, headers):
+    """GET /api/weather: current weather at a point."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
 
-            if (clusters.length === 0) {
-                list.innerHTML = '<div style="color: #666; text-align: center; padding: 15px; font-size: 0.85em;">Nenhuma area em risco no momento</div>';
-                return;
-            }
+        weather, error = fetch_weather(lat, lon)
+        return json_response(200, weather)
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            // Group by state
-            const byState = {};
-            clusters.forEach(c => {
-                const state = c.state || 'Desconhecido';
-                if (!byState[state]) {
-                    byState[state] = { count: 0, area: 0, frp: 0 };
-                }
-                byState[state].count += c.count;
-                byState[state].area += c.estimated_area_ha || 0;
-                byState[state].frp += c.total_frp || 0;
-            });
-
-            // Sort by area
-            const sorted = Object.entries(byState)
-                .sort((a, b) => b[1].area - a[1].area)
-                .slice(0, 8);
-
-            list.innerHTML = sorted.map(([state, data]) => {
-                const severity = data.area > 100 ? 'red' : data.area > 30 ? 'yellow' : 'green';
-                return '<div style="padding: 10px; border-bottom: 1px solid #333; display: flex; justify-content: space-between; align-items: center;">' +
-                    '<div>' +
-                        '<div style="font-weight: bold; color: #fff;">' + state + '</div>' +
-                        '<div style="font-size: 0.75em; color: #888;">' + data.count + ' focos</div>' +
-                    '</div>' +
-                    '<div style="text-align: right;">' +
-                        '<div style="font-weight: bold; color: var(--' + severity + ', #ff6b35);">' + data.area.toFixed(0) + ' ha</div>' +
-                        '<div style="font-size: 0.75em; color: #888;">FRP: ' + data.frp.toFixed(0) + '</div>' +
-                    '</div>' +
-                '</div>';
-            }).join('');
-        }
 
-        // ========================================
-        // Cluster Functions
-        // ========================================
-        function focusCluster(id) {
-            const cluster = currentClusters.find(c => c.id === id);
-            if (cluster) {
-                map.setView([cluster.center_lat, cluster.center_lon], 10);
-                selectCluster(cluster);
-                loadLocationData(cluster.center_lat, cluster.center_lon);
-            }
-        }
+def _api_risk(query, headers):
+    """GET /api/risk: fire risk index at a point."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+        days_without_rain = int(query.get("days_without_rain", [5])[0])
 
-        function selectCluster(cluster) {
-            selectedCluster = cluster;
-            document.getElementById('fireSelect').value = cluster.id;
+        weather, _ = fetch_weather(lat, lon)
+        return json_response(200, risk_payload(weather, days_without_rain))
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            // Highlight selected in list
-            document.querySelectorAll('.cluster-item').forEach((el, i) => {
-                el.style.borderLeftColor = (currentClusters[i] && currentClusters[i].id === cluster.id) ? '#4ade80' : '#ff6b35';
-            });
-        }
 
-        function selectHotspot(hotspot) {
-            // Load location data for this hotspot
-            loadLocationData(hotspot.latitude, hotspot.longitude);
-
-            // Find cluster containing this hotspot
-            const cluster = currentClusters.find(c => {
-                const dist = Math.sqrt(
-                    Math.pow(c.center_lat - hotspot.latitude, 2) +
-                    Math.pow(c.center_lon - hotspot.longitude, 2)
-                ) * 111;
-                return dist < 10;
-            });
-
-            if (cluster) {
-                selectCluster(cluster);
-            }
-        }
+def _api_clusters(query, headers):
+    """GET /api/clusters: hotspot clusters for an area."""
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-34])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
 
-        async function loadLocationData(lat, lon) {
-            try {
-                const data = await fetchLocationInfo(lat, lon);
-
-                // Update weather display for this specific location
-                document.getElementById('weatherTemp').textContent = data.weather.temperature + '°C';
-                document.getElementById('weatherHumid').textContent = data.weather.humidity + '%';
-                document.getElementById('weatherWind').textContent = data.weather.wind_speed + ' km/h';
-                document.getElementById('weatherDir').textContent = getWindDirection(data.weather.wind_direction);
-
-                // Update current biome display
-                document.getElementById('currentBiome').textContent = data.state + ' - ' + data.biome;
-
-                // Update risk display
-                document.getElementById('riskValue').textContent = data.risk.index;
-                document.getElementById('riskLevel').textContent = data.risk.level;
-                document.getElementById('riskIndicator').style.left = data.risk.index + '%';
-                document.getElementById('headerRisk').textContent = data.risk.level;
-
-                // Color based on risk
-                const riskEl = document.getElementById('riskValue');
-                riskEl.className = 'risk-value';
-                if (data.risk.index >= 60) riskEl.classList.add('red');
-                else if (data.risk.index >= 40) riskEl.classList.add('yellow');
-                else riskEl.classList.add('green');
-
-                // Update factors
-                document.getElementById('tempValue').textContent = data.weather.temperature + '°C';
-                document.getElementById('tempBar').style.width = Math.min(100, (data.weather.temperature - 20) * 4) + '%';
-                document.getElementById('humidValue').textContent = data.weather.humidity + '%';
-                document.getElementById('humidBar').style.width = (100 - data.weather.humidity) + '%';
-                document.getElementById('windValue').textContent = data.weather.wind_speed + ' km/h';
-                document.getElementById('windBar').style.width = Math.min(100, data.weather.wind_speed * 2) + '%';
-
-                // Update biome info
-                document.getElementById('biomeName').textContent = data.biome;
-                document.getElementById('biomeCarbon').textContent = data.biome_data.carbon_tons_ha;
-                document.getElementById('biomeRecovery').textContent = data.biome_data.recovery_years;
-
-                // Update weather current location
-                currentWeather = data.weather;
-
-            } catch (error) {
-                console.error('Error loading location data:', error);
-            }
-        }
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+        if error:
+            return json_response(500, {"error": error})
 
-        // ========================================
-        // Prediction Functions
-        // ========================================
-        async function runPrediction() {
-            const fireId = document.getElementById('fireSelect').value;
-            const hours = parseInt(document.getElementById('hoursSelect').value);
+        return json_response(200, clusters_payload(hotspots))
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            if (!fireId) {
-                alert('Selecione um incendio primeiro');
-                return;
-            }
 
-            const cluster = currentClusters.find(c => c.id == fireId);
-            if (!cluster) return;
+def _api_emissions(query, headers):
+    """GET /api/emissions: carbon emissions for a burned area."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+        area = float(query.get("area", [100])[0])
 
-            showLoading();
+        return conditional_json_response(emissions_payload(lat, lon, area), headers, EMISSIONS_CACHE_CONTROL)
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            try {
-                const windDir = currentWeather ? currentWeather.wind_direction : 90;
-                const prediction = await fetchPrediction(
-                    cluster.center_lat,
-                    cluster.center_lon,
-                    cluster.estimated_area_ha,
-                    windDir,
-                    hours
-                );
 
-                displayPrediction(prediction, cluster);
+def _api_predict(query, headers):
+    """GET /api/predict: fire perimeter growth forecast."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+        area = float(query.get("area", [50])[0])
+        wind_dir = float(query.get("wind_dir", [90])[0])
+        hours = int(query.get("hours", [6])[0])
+
+        # Overlap the weather round trip with the local biome lookup
+        weather_future = _upstream_pool.submit(fetch_weather, lat, lon)
+        biome_name, biome_data = get_biome(lat, lon)
+        weather, _ = weather_future.result()
+
+        spread_rate = calculate_spread_rate(
+            weather["wind_speed"],
+            spread_factor=biome_data.get("spread_factor", 1.0)
+        )
+
+        predictions = predict_fire_perimeter(lat, lon, area, wind_dir, hours)
+
+        return json_response(200, {
+            "center_lat": lat,
+            "center_lon": lon,
+            "initial_area_ha": area,
+            "wind_direction": wind_dir,
+            "spread_rate": spread_rate,
+            "biome": biome_name,
+            "predictions": predictions
+        })
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            } catch (error) {
-                alert('Erro ao gerar previsao: ' + error.message);
-            } finally {
-                hideLoading();
-            }
-        }
 
-        function displayPrediction(prediction, cluster) {
-            // Clear previous predictions
-            clearPrediction();
-
-            // Update spread stats
-            document.getElementById('spreadRate').textContent = prediction.spread_rate;
-            document.getElementById('spreadDir').textContent = getWindDirection(prediction.wind_direction);
-
-            // Draw prediction circles on map
-            prediction.predictions.forEach((p, i) => {
-                const circle = L.circle([p.center_lat, p.center_lon], {
-                    radius: p.radius_m,
-                    color: '#ff0000',
-                    fillColor: '#ff0000',
-                    fillOpacity: 0.1 - (i * 0.015),
-                    weight: 2,
-                    dashArray: '5, 5'
-                }).addTo(map);
-
-                circle.bindPopup('<strong>+' + p.hour + 'h</strong><br>Area: ' + p.area_ha + ' ha<br>Raio: ' + p.radius_m + ' m');
-                predictionCircles.push(circle);
-            });
-
-            // Update timeline
-            const timeline = document.getElementById('predictionTimeline');
-            timeline.innerHTML = prediction.predictions.map(p =>
-                '<div class="timeline-item">' +
-                    '<div class="timeline-hour">+' + p.hour + ' hora' + (p.hour > 1 ? 's' : '') + '</div>' +
-                    '<div class="timeline-data">' +
-                        '<span>Area: ' + p.area_ha + ' ha</span>' +
-                        '<span>Raio: ' + p.radius_m + ' m</span>' +
-                    '</div>' +
-                '</div>'
-            ).join('');
-
-            // Update evacuation status
-            const lastPred = prediction.predictions[prediction.predictions.length - 1];
-            let status = 'MONITORAR';
-            let message = 'Situacao sob controle. Mantenha monitoramento.';
-
-            if (lastPred.area_ha > 500) {
-                status = 'EVACUAR';
-                message = 'Area critica! Iniciar evacuacao das comunidades proximas.';
-            } else if (lastPred.area_ha > 100) {
-                status = 'ALERTA';
-                message = 'Preparar plano de evacuacao. Alertar comunidades.';
+def _api_location(query, headers):
+    """GET /api/location: state, biome, weather and risk at a point."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+
+        # Overlap the weather round trip with the local grid lookups
+        weather_future = _upstream_pool.submit(fetch_weather, lat, lon)
+        state = get_state(lat, lon)
+        biome_name, biome_data = get_biome(lat, lon)
+        weather, _ = weather_future.result()
+
+        # Calculate risk
+        days_without_rain = int(query.get("days_without_rain", [5])[0])
+        risk_index = calculate_risk_index(
+            weather["temperature"],
+            weather["humidity"],
+            weather["wind_speed"],
+            days_without_rain
+        )
+
+        return conditional_json_response({
+            "state": state,
+            "biome": biome_name,
+            "coordinates": {"lat": lat, "lon": lon},
+            "weather": weather,
+            "risk": {
+                "index": risk_index,
+                "level": get_risk_level(risk_index)
+            },
+            "biome_data": {
+                "carbon_tons_ha": biome_data["carbon_tons_ha"],
+                "recovery_years": biome_data.get("recovery_years", 20),
+                "spread_factor": biome_data.get("spread_factor", 1.0)
             }
+        }, headers, LOCATION_CACHE_CONTROL)
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-            document.getElementById('evacuationStatus').textContent = status;
-            document.getElementById('evacuationMessage').textContent = message;
 
-            // Update evacuation routes in Alerts tab
-            updateEvacuationRoutes(cluster.center_lat, cluster.center_lon, lastPred.radius_m / 1000);
+def _api_evacuation(query, headers):
+    """GET /api/evacuation: evacuation routes and shelters around a fire."""
+    try:
+        lat = float(query.get("lat", [-22])[0])
+        lon = float(query.get("lon", [-48])[0])
+        radius_km = float(query.get("radius", [10])[0])
+
+        state = get_state(lat, lon)
+        biome_name, _ = get_biome(lat, lon)
+
+        # Generate evacuation recommendations based on location
+        cardinal_directions = ["Norte", "Sul", "Leste", "Oeste", "Nordeste", "Sudeste"]
+        routes = []
+
+        for i, direction in enumerate(cardinal_directions[:4]):
+            routes.append({
+                "id": i + 1,
+                "direction": direction,
+                "distance_km": round(radius_km * (1 + i * 0.3), 1),
+                "estimated_time_min": round(radius_km * (1 + i * 0.3) * 2, 0),
+                "road_type": "Principal" if i < 2 else "Secundaria",
+                "recommended": i == 0
+            })
 
-            // Fit map to show predictions
-            if (predictionCircles.length > 0) {
-                const group = L.featureGroup(predictionCircles);
-                map.fitBounds(group.getBounds(), { padding: [50, 50] });
+        return json_response(200, {
+            "center": {"lat": lat, "lon": lon},
+            "state": state,
+            "biome": biome_name,
+            "evacuation_radius_km": radius_km,
+            "routes": routes,
+            "shelter_points": [
+                {"name": "Ginasio Municipal", "type": "Abrigo", "distance_km": round(radius_km * 0.8, 1)},
+                {"name": "Escola Estadual", "type": "Ponto de Apoio", "distance_km": round(radius_km * 1.2, 1)}
+            ],
+            "emergency_contacts": {
+                "bombeiros": "193",
+                "defesa_civil": "199",
+                "samu": "192"
             }
-        }
+        })
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
 
-        async function updateEvacuationRoutes(lat, lon, radius) {
-            try {
-                const data = await fetchEvacuation(lat, lon, radius);
-                const routesDiv = document.getElementById('evacuationRoutes');
-
-                if (data.routes && data.routes.length > 0) {
-                    routesDiv.innerHTML = data.routes.map(r =>
-                        '<div style="padding: 10px; border-bottom: 1px solid #333; ' + (r.recommended ? 'background: rgba(74, 222, 128, 0.1);' : '') + '">' +
-                            '<div style="display: flex; justify-content: space-between; align-items: center;">' +
-                                '<div>' +
-                                    '<div style="font-weight: bold; color: ' + (r.recommended ? '#4ade80' : '#fff') + ';">' +
-                                        (r.recommended ? '✓ ' : '') + 'Rota ' + r.direction +
-                                    '</div>' +
-                                    '<div style="font-size: 0.75em; color: #888;">' + r.road_type + '</div>' +
-                                '</div>' +
-                                '<div style="text-align: right;">' +
-                                    '<div style="font-weight: bold; color: #ff6b35;">' + r.distance_km + ' km</div>' +
-                                    '<div style="font-size: 0.75em; color: #888;">' + r.estimated_time_min + ' min</div>' +
-                                '</div>' +
-                            '</div>' +
-                        '</div>'
-                    ).join('');
-
-                    // Add shelter info
-                    if (data.shelter_points && data.shelter_points.length > 0) {
-                        routesDiv.innerHTML += '<div style="padding: 10px; background: rgba(255, 107, 53, 0.1); margin-top: 10px; border-radius: 6px;">' +
-                            '<div style="font-weight: bold; color: #f7c873; margin-bottom: 8px;">Pontos de Abrigo</div>' +
-                            data.shelter_points.map(s =>
-                                '<div style="display: flex; justify-content: space-between; padding: 4px 0; font-size: 0.85em;">' +
-                                    '<span>' + s.name + '</span>' +
-                                    '<span style="color: #888;">' + s.distance_km + ' km</span>' +
-                                '</div>'
-                            ).join('') +
-                        '</div>';
-                    }
-                }
-            } catch (error) {
-                console.error('Error loading evacuation routes:', error);
-            }
-        }
 
-        function clearPrediction() {
-            predictionCircles.forEach(c => map.removeLayer(c));
-            predictionCircles = [];
-            document.getElementById('predictionTimeline').innerHTML =
-                '<div style="color: #666; text-align: center; padding: 20px; font-size: 0.85em;">Selecione um incendio para ver a previsao</div>';
-            document.getElementById('spreadRate').textContent = '-';
-            document.getElementById('spreadDir').textContent = '-';
-            document.getElementById('evacuationStatus').textContent = '-';
-            document.getElementById('evacuationMessage').textContent = 'Execute uma previsao para ver recomendacoes de evacuacao.';
-        }
+def _api_burned_area(query, headers):
+    """GET /api/burned-area: burned area totals by biome and state."""
+    try:
+        west = float(query.get("west", [-74])[0])
+        south = float(query.get("south", [-33])[0])
+        east = float(query.get("east", [-34])[0])
+        north = float(query.get("north", [5])[0])
+        days = int(query.get("days", [1])[0])
+
+        # Get hotspots to estimate burned area
+        hotspots, error = fetch_hotspots(west, south, east, north, days)
+
+        if error:
+            return json_response(500, {"error": error})
+
+        if not hotspot_count(hotspots):
+            return json_response(200, {
+                "total_area_ha": 0,
+                "hotspot_count": 0,
+                "by_biome": {},
+                "by_state": {}
+            })
 
-        // ========================================
-        // Event Listeners
-        // ========================================
-        document.getElementById('regionSelect').addEventListener('change', function() {
-            const coords = regions[this.value];
-            map.setView(coords.center, coords.zoom);
-            loadAllData(false);
-        });
-
-        // ========================================
-        // Initialize
-        // ========================================
-        loadAllData(true);
-
-        // Start auto-refresh by default
-        setTimeout(() => {
-            toggleAutoRefresh();
-        }, 1000);
-    </script>
-</body>
-</html>"""
+        # Calculate area by clustering
+        clusters = cluster_hotspots(hotspots)
+
+        # Total and group by biome and state in one pass over the clusters
+        total_area = 0
+        by_biome = {}
+        by_state = {}
+
+        for c in clusters:
+            biome = c.get("biome", "Desconhecido")
+            state = c.get("state", "Desconhecido")
+            area = c.get("estimated_area_ha", 0)
+
+            total_area += area
+            by_biome[biome] = by_biome.get(biome, 0) + area
+            by_state[state] = by_state.get(state, 0) + area
+
+        return json_response(200, {
+            "total_area_ha": round(total_area, 1),
+            "hotspot_count": hotspot_count(hotspots),
+            "cluster_count": len(clusters),
+            "by_biome": {k: round(v, 1) for k, v in by_biome.items()},
+            "by_state": {k: round(v, 1) for k, v in by_state.items()},
+            "severity": {
+                "severe_ha": round(total_area * 0.15, 1),
+                "moderate_ha": round(total_area * 0.50, 1),
+                "light_ha": round(total_area * 0.35, 1)
+            }
+        })
+    except Exception as e:
+        return json_response(400, {"error": str(e)})
+
+
+# Exact paths mapped to their endpoints: one dict lookup per request
+ROUTES = {
+    "/": _serve_dashboard,
+    "": _serve_dashboard,
+    "/dashboard": _serve_dashboard,
+    "/docs": _serve_docs,
+    DASHBOARD_CSS_PATH: _serve_dashboard_css,
+    DASHBOARD_JS_PATH: _serve_dashboard_js,
+    HEAT_WORKER_JS_PATH: _serve_heat_worker_js,
+    "/api/schema/filters": _api_filter_schema,
+    "/api/health": _api_health,
+    "/health": _api_health,
+    "/api/dashboard": _api_dashboard,
+    "/api/hotspots": _api_hotspots,
+    "/api/hotspots.bin": _api_hotspots_bin,
+    "/api/hotspots/clusters": _api_hotspots_clusters,
+    "/api/weather": _api_weather,
+    "/api/risk": _api_risk,
+    "/api/clusters": _api_clusters,
+    "/api/emissions": _api_emissions,
+    "/api/predict": _api_predict,
+    "/api/location": _api_location,
+    "/api/evacuation": _api_evacuation,
+    "/api/burned-area": _api_burned_area,
+}
+if VENDOR_CSS_PATH is not None:
+    ROUTES[VENDOR_CSS_PATH] = _serve_vendor_css
 
 
-def get_landing_page():
-    """Return API documentation page."""
-    return """<!DOCTYPE html>
-<html>
-<head>
-    <title>FireWatch AI - API</title>
-    <meta charset="utf-8">
-    <style>
-        body { font-family: sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; background: #1a1a2e; color: #eee; }
-        h1 { color: #ff6b35; }
-        h3 { color: #f7c873; margin-top: 30px; }
-        code { background: #0f0f1a; padding: 3px 8px; border-radius: 4px; color: #f7c873; }
-        a { color: #ff6b35; }
-        .endpoint { background: #16213e; padding: 12px; margin: 8px 0; border-radius: 6px; border-left: 4px solid #ff6b35; }
-    </style>
-</head>
-<body>
-    <h1>FireWatch AI - API</h1>
-    <p><a href="/">Voltar ao Dashboard</a></p>
+def _route(path, query, headers):
+    """Dispatch to the endpoint for path; route_request handles encoding."""
+    endpoint = ROUTES.get(path)
+    if endpoint is not None:
+        return endpoint(query, headers)
 
-    <h3>Endpoints</h3>
-    <div class="endpoint"><code>GET /api/health</code> - Health check</div>
-    <div class="endpoint"><code>GET /api/hotspots?west=&south=&east=&north=&days=</code> - Fire hotspots</div>
-    <div class="endpoint"><code>GET /api/weather?lat=&lon=</code> - Weather data</div>
-    <div class="endpoint"><code>GET /api/risk?lat=&lon=&days_without_rain=</code> - Fire risk index</div>
-    <div class="endpoint"><code>GET /api/clusters?west=&south=&east=&north=&days=</code> - Fire clusters</div>
-    <div class="endpoint"><code>GET /api/emissions?lat=&lon=&area=</code> - Carbon emissions</div>
-    <div class="endpoint"><code>GET /api/predict?lat=&lon=&area=&wind_dir=&hours=</code> - Spread prediction</div>
+    # Dashboard tab panels, fetched by the page after first paint
+    if path.startswith(DASHBOARD_TAB_PREFIX):
+        variants = DASHBOARD_TAB_VARIANTS.get(path[len(DASHBOARD_TAB_PREFIX):])
+        if variants is not None:
+            return page_response(variants, headers, cache_control=DASHBOARD_CACHE_CONTROL)
 
-    <h3>Example</h3>
-    <p><a href="/api/hotspots?west=-50&south=-25&east=-44&north=-19&days=2">Fires in Sao Paulo</a></p>
-</body>
-</html>"""
+    return json_response(404, {"error": "Not found"})
 
 
 # ============================================================================
@@ -2167,325 +2199,68 @@ def get_landing_page():
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-        query = parse_qs(parsed.query)
-
-        # Dashboard
-        if path == "/" or path == "" or path == "/dashboard":
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(get_dashboard_page().encode("utf-8"))
-            return
-
-        # API docs
-        if path == "/docs":
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(get_landing_page().encode("utf-8"))
-            return
-
-        # Health check
-        if path == "/api/health" or path == "/health":
-            self.send_json(200, {
-                "status": "healthy",
-                "version": "0.4.0",
-                "api_key_configured": bool(FIRMS_API_KEY),
-                "features": ["hotspots", "weather", "risk", "clusters", "emissions", "prediction", "location", "evacuation", "burned-area"]
-            })
-            return
-
-        # Hotspots endpoint
-        if path == "/api/hotspots":
-            try:
-                west = float(query.get("west", [-74])[0])
-                south = float(query.get("south", [-34])[0])
-                east = float(query.get("east", [-34])[0])
-                north = float(query.get("north", [5])[0])
-                days = int(query.get("days", [1])[0])
-
-                hotspots, error = fetch_hotspots(west, south, east, north, days)
-                if error:
-                    self.send_json(500, {"error": error})
-                    return
-
-                self.send_json(200, {
-                    "count": len(hotspots),
-                    "source": "VIIRS_NOAA20_NRT",
-                    "hotspots": hotspots[:1000]
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
-
-        # Weather endpoint
-        if path == "/api/weather":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-
-                weather, error = fetch_weather(lat, lon)
-                self.send_json(200, weather)
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
+        self.send_routed(include_body=True)
 
-        # Risk endpoint
-        if path == "/api/risk":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-                days_without_rain = int(query.get("days_without_rain", [5])[0])
-
-                weather, _ = fetch_weather(lat, lon)
-                risk_index = calculate_risk_index(
-                    weather["temperature"],
-                    weather["humidity"],
-                    weather["wind_speed"],
-                    days_without_rain
-                )
-
-                self.send_json(200, {
-                    "risk_index": risk_index,
-                    "risk_level": get_risk_level(risk_index),
-                    "factors": {
-                        "temperature": weather["temperature"],
-                        "humidity": weather["humidity"],
-                        "wind_speed": weather["wind_speed"],
-                        "days_without_rain": days_without_rain
-                    }
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
-
-        # Clusters endpoint
-        if path == "/api/clusters":
-            try:
-                west = float(query.get("west", [-74])[0])
-                south = float(query.get("south", [-34])[0])
-                east = float(query.get("east", [-34])[0])
-                north = float(query.get("north", [5])[0])
-                days = int(query.get("days", [1])[0])
-
-                hotspots, error = fetch_hotspots(west, south, east, north, days)
-                if error:
-                    self.send_json(500, {"error": error})
-                    return
-
-                clusters = cluster_hotspots(hotspots)
-                total_area = sum(c.get("estimated_area_ha", 0) for c in clusters)
-
-                self.send_json(200, {
-                    "total_hotspots": len(hotspots),
-                    "total_clusters": len(clusters),
-                    "total_area": round(total_area, 1),
-                    "clusters": clusters[:50]
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
-
-        # Emissions endpoint
-        if path == "/api/emissions":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-                area = float(query.get("area", [100])[0])
-
-                biome_name, biome_data = get_biome(lat, lon)
-                emissions = calculate_emissions(area, biome_data["carbon_tons_ha"])
-
-                self.send_json(200, {
-                    "biome": biome_name,
-                    "carbon_tons_ha": biome_data["carbon_tons_ha"],
-                    "recovery_years": biome_data.get("recovery_years", 20),
-                    "area_ha": area,
-                    "emissions": emissions
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
-
-        # Prediction endpoint
-        if path == "/api/predict":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-                area = float(query.get("area", [50])[0])
-                wind_dir = float(query.get("wind_dir", [90])[0])
-                hours = int(query.get("hours", [6])[0])
-
-                biome_name, biome_data = get_biome(lat, lon)
-                weather, _ = fetch_weather(lat, lon)
-
-                spread_rate = calculate_spread_rate(
-                    weather["wind_speed"],
-                    spread_factor=biome_data.get("spread_factor", 1.0)
-                )
-
-                predictions = predict_fire_perimeter(lat, lon, area, wind_dir, hours)
-
-                self.send_json(200, {
-                    "center_lat": lat,
-                    "center_lon": lon,
-                    "initial_area_ha": area,
-                    "wind_direction": wind_dir,
-                    "spread_rate": spread_rate,
-                    "biome": biome_name,
-                    "predictions": predictions
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
+    def do_HEAD(self):
+        self.send_routed(include_body=False)
 
-        # Location info endpoint
-        if path == "/api/location":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-
-                state = get_state(lat, lon)
-                biome_name, biome_data = get_biome(lat, lon)
-                weather, _ = fetch_weather(lat, lon)
-
-                # Calculate risk
-                days_without_rain = int(query.get("days_without_rain", [5])[0])
-                risk_index = calculate_risk_index(
-                    weather["temperature"],
-                    weather["humidity"],
-                    weather["wind_speed"],
-                    days_without_rain
-                )
-
-                self.send_json(200, {
-                    "state": state,
-                    "biome": biome_name,
-                    "coordinates": {"lat": lat, "lon": lon},
-                    "weather": weather,
-                    "risk": {
-                        "index": risk_index,
-                        "level": get_risk_level(risk_index)
-                    },
-                    "biome_data": {
-                        "carbon_tons_ha": biome_data["carbon_tons_ha"],
-                        "recovery_years": biome_data.get("recovery_years", 20),
-                        "spread_factor": biome_data.get("spread_factor", 1.0)
-                    }
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
+    def send_routed(self, include_body):
+        """Route the request and send the response, with the body only for GET."""
+        parsed = urlparse(self.path)
+        request_headers = {name.lower(): value for name, value in self.headers.items()}
+        status, headers, body = route_request(parsed.path, parse_qs(parsed.query), request_headers)
 
-        # Evacuation routes endpoint
-        if path == "/api/evacuation":
-            try:
-                lat = float(query.get("lat", [-22])[0])
-                lon = float(query.get("lon", [-48])[0])
-                radius_km = float(query.get("radius", [10])[0])
-
-                state = get_state(lat, lon)
-                biome_name, _ = get_biome(lat, lon)
-
-                # Generate evacuation recommendations based on location
-                cardinal_directions = ["Norte", "Sul", "Leste", "Oeste", "Nordeste", "Sudeste"]
-                routes = []
-
-                for i, direction in enumerate(cardinal_directions[:4]):
-                    routes.append({
-                        "id": i + 1,
-                        "direction": direction,
-                        "distance_km": round(radius_km * (1 + i * 0.3), 1),
-                        "estimated_time_min": round(radius_km * (1 + i * 0.3) * 2, 0),
-                        "road_type": "Principal" if i < 2 else "Secundaria",
-                        "recommended": i == 0
-                    })
-
-                self.send_json(200, {
-                    "center": {"lat": lat, "lon": lon},
-                    "state": state,
-                    "biome": biome_name,
-                    "evacuation_radius_km": radius_km,
-                    "routes": routes,
-                    "shelter_points": [
-                        {"name": "Ginasio Municipal", "type": "Abrigo", "distance_km": round(radius_km * 0.8, 1)},
-                        {"name": "Escola Estadual", "type": "Ponto de Apoio", "distance_km": round(radius_km * 1.2, 1)}
-                    ],
-                    "emergency_contacts": {
-                        "bombeiros": "193",
-                        "defesa_civil": "199",
-                        "samu": "192"
-                    }
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+
+        buffer = getattr(self, "_headers_buffer", None)
+        if include_body and buffer is not None and len(body) <= RESPONSE_COALESCE_MAX_BYTES:
+            # Header block and body in one syscall instead of two
+            buffer.append(b"\r\n")
+            buffer.append(body)
+            self.flush_headers()
+        else:
+            self.end_headers()
+            if include_body:
+                self.wfile.write(body)
 
-        # Burned area endpoint
-        if path == "/api/burned-area":
-            try:
-                west = float(query.get("west", [-74])[0])
-                south = float(query.get("south", [-33])[0])
-                east = float(query.get("east", [-34])[0])
-                north = float(query.get("north", [5])[0])
-                days = int(query.get("days", [1])[0])
-
-                # Get hotspots to estimate burned area
-                hotspots, error = fetch_hotspots(west, south, east, north, days)
-
-                if error:
-                    self.send_json(500, {"error": error})
-                    return
-
-                if not hotspots:
-                    self.send_json(200, {
-                        "total_area_ha": 0,
-                        "hotspot_count": 0,
-                        "by_biome": {},
-                        "by_state": {}
-                    })
-                    return
-
-                # Calculate area by clustering
-                clusters = cluster_hotspots(hotspots)
-                total_area = sum(c.get("estimated_area_ha", 0) for c in clusters)
-
-                # Group by biome and state
-                by_biome = {}
-                by_state = {}
-
-                for c in clusters:
-                    biome = c.get("biome", "Desconhecido")
-                    state = c.get("state", "Desconhecido")
-                    area = c.get("estimated_area_ha", 0)
-
-                    by_biome[biome] = by_biome.get(biome, 0) + area
-                    by_state[state] = by_state.get(state, 0) + area
-
-                self.send_json(200, {
-                    "total_area_ha": round(total_area, 1),
-                    "hotspot_count": len(hotspots),
-                    "cluster_count": len(clusters),
-                    "by_biome": {k: round(v, 1) for k, v in by_biome.items()},
-                    "by_state": {k: round(v, 1) for k, v in by_state.items()},
-                    "severity": {
-                        "severe_ha": round(total_area * 0.15, 1),
-                        "moderate_ha": round(total_area * 0.50, 1),
-                        "light_ha": round(total_area * 0.35, 1)
-                    }
-                })
-            except Exception as e:
-                self.send_json(400, {"error": str(e)})
-            return
 
-        # 404
-        self.send_json(404, {"error": "Not found"})
+# ============================================================================
+# ASGI Application
+# ============================================================================
 
-    def send_json(self, status, data):
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode("utf-8"))
+async def app(scope, receive, send):
+    """ASGI entry point (uvicorn api.index:app --workers 4) sharing the handler routes."""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    if scope["method"] not in ("GET", "HEAD"):
+        status, headers, body = json_response(405, {"error": "Method not allowed"})
+    else:
+        # Endpoints block on upstream I/O, so run them off the event loop
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        request_headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", ())
+        }
+        loop = asyncio.get_running_loop()
+        status, headers, body = await loop.run_in_executor(
+            None, route_request, scope["path"], query, request_headers
+        )
+
+    raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+    if status != 304:
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body if scope["method"] != "HEAD" else b""})
@@ -0,0 +1,1602 @@
+// ========================================
+// Configuration
+// ========================================
+let autoRefreshInterval = null;
+let autoRefreshEnabled = false;
+let currentViewMode = 'markers'; // 'markers', 'heatmap', 'both'
+let heatLayer = null;
+
+// Region bounds by select value, filled in from the filter schema
+const regions = {};
+
+// State
+// Hotspots of the current refresh as parallel typed arrays; the heat map,
+// stats and initial fit only read these three fields (markers and popups
+// come with their own records from the map cluster endpoint)
+let hotspotLat = new Float32Array(0);
+let hotspotLon = new Float32Array(0);
+let hotspotFRP = new Float32Array(0);
+let currentClusters = [];
+let clusterById = new Map(); // String(id) -> cluster, ids as DOM values carry them
+// Cluster centres in radians with cos(lat), filled once per refresh
+let clusterLatRad = new Float64Array(0);
+let clusterLonRad = new Float64Array(0);
+let clusterCosLat = new Float64Array(0);
+let currentWeather = null;
+let selectedCluster = null;
+const predictionCircles = [];
+
+// Element lookups are cached after first use; tab panels are injected
+// once, so references into them stay valid
+const elements = {};
+
+function element(id) {
+    return elements[id] || (elements[id] = document.getElementById(id));
+}
+
+// ========================================
+// Initialize Map with Multiple Layers
+// ========================================
+// Vector layers (fire markers, prediction circles) are drawn on one canvas
+// instead of one DOM/SVG node each
+const map = L.map('map', { preferCanvas: true, renderer: L.canvas({ padding: 0.5 }) }).setView([-22, -48], 6);
+
+// Base layers - Google Maps as default
+const googleMaps = L.tileLayer('https://mt1.google.com/vt/lyrs=r&x={x}&y={y}&z={z}', {
+    attribution: '&copy; Google Maps',
+    maxZoom: 20
+});
+
+const googleSatellite = L.tileLayer('https://mt1.google.com/vt/lyrs=s&x={x}&y={y}&z={z}', {
+    attribution: '&copy; Google Satellite',
+    maxZoom: 20
+});
+
+const googleHybrid = L.tileLayer('https://mt1.google.com/vt/lyrs=y&x={x}&y={y}&z={z}', {
+    attribution: '&copy; Google Hybrid',
+    maxZoom: 20
+});
+
+const googleTerrain = L.tileLayer('https://mt1.google.com/vt/lyrs=p&x={x}&y={y}&z={z}', {
+    attribution: '&copy; Google Terrain',
+    maxZoom: 20
+});
+
+const darkLayer = L.tileLayer('https://{s}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}{r}.png', {
+    attribution: '&copy; CartoDB',
+    maxZoom: 19
+});
+
+// Add Google Maps as default layer
+googleMaps.addTo(map);
+
+// Layer control
+const baseLayers = {
+    'Google Maps': googleMaps,
+    'Google Satellite': googleSatellite,
+    'Google Hybrid': googleHybrid,
+    'Google Terrain': googleTerrain,
+    'Modo Escuro': darkLayer
+};
+L.control.layers(baseLayers, null, { position: 'topright' }).addTo(map);
+
+// Hotspot markers for the current view; grouping into clusters happens on
+// the server for each viewport and zoom (see updateMap)
+const markers = L.featureGroup();
+map.addLayer(markers);
+
+// ========================================
+// Tab Navigation
+// ========================================
+// Only the Monitor panel ships with the page; the other panels are
+// fetched once after first paint and injected before data is shown
+const tabLoads = {};
+
+function loadTab(name) {
+    if (!tabLoads[name]) {
+        const panel = element('tab-' + name);
+        tabLoads[name] = panel.dataset.src
+            ? fetch(panel.dataset.src)
+                .then(response => response.text())
+                .then(html => { panel.innerHTML = html; })
+            : Promise.resolve();
+    }
+    return tabLoads[name];
+}
+
+// Tabs, panels and view buttons are part of the page shell and never
+// change, so they are collected once
+const tabs = document.querySelectorAll('.tab');
+const tabContents = document.querySelectorAll('.tab-content');
+const viewButtons = document.querySelectorAll('.view-btn');
+
+const tabsReady = Promise.all(
+    Array.from(tabs, tab => loadTab(tab.dataset.tab))
+);
+
+// Filter selects are filled from the cached schema once every tab is in
+function populateSelects(schema) {
+    document.querySelectorAll('select[data-schema]').forEach(select => {
+        const field = schema[select.dataset.schema];
+        select.innerHTML = field.options.map(o =>
+            '<option value="' + o.value + '"' + (o.value === field.default ? ' selected' : '') + '>' + o.label + '</option>'
+        ).join('');
+    });
+    schema.regions.options.forEach(r => { regions[r.value] = r; });
+}
+
+const filtersReady = Promise.all([
+    fetch('/api/schema/filters').then(response => response.json()),
+    tabsReady
+]).then(([schema]) => populateSelects(schema));
+
+tabs.forEach(tab => {
+    tab.addEventListener('click', () => {
+        // One class write per tab and panel, not a clear-then-set cascade
+        const panel = element('tab-' + tab.dataset.tab);
+        tabs.forEach(t => t.classList.toggle('active', t === tab));
+        tabContents.forEach(c => c.classList.toggle('active', c === panel));
+        loadTab(tab.dataset.tab);
+    });
+});
+
+// ========================================
+// Helper Functions
+// ========================================
+// FRP bands: 0 low (<= 10 MW), 1 medium (<= 50 MW), 2 high. The band is
+// worked out once per hotspot and everything else is a table lookup
+function frpTier(frp) {
+    return frp > 50 ? 2 : (frp > 10 ? 1 : 0);
+}
+
+const TIER_MARKER_COLORS = ['#f7c873', '#ff6b35', '#ff0000'];
+const TIER_POPUP_COLORS = ['#eab308', '#f97316', '#dc2626'];
+const TIER_RADII = [4, 5, 7];
+
+// Marker styles are shared per band (Leaflet copies options onto each marker)
+const FIRE_MARKER_STYLES = [0, 1, 2].map(tier => Object.freeze({
+    radius: TIER_RADII[tier],
+    fillColor: TIER_MARKER_COLORS[tier],
+    fillOpacity: 0.9,
+    color: '#fff',
+    opacity: 0.8,
+    weight: 2
+}));
+
+// Eight compass points, matching the labels the API and the evacuation
+// router use
+const WIND_DIRECTIONS = Object.freeze(['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']);
+
+function getWindDirection(degrees) {
+    // & 7 also wraps negative bearings, where % 8 would go out of range
+    return WIND_DIRECTIONS[Math.round(degrees / 45) & 7];
+}
+
+// Brazilian states boundaries (simplified)
+const states = {
+    "Acre": {west: -74, south: -11.5, east: -66.5, north: -7},
+    "Amazonas": {west: -74, south: -10, east: -56, north: 2.5},
+    "Roraima": {west: -65, south: 0, east: -58, north: 5.5},
+    "Para": {west: -59, south: -10, east: -46, north: 3},
+    "Amapa": {west: -55, south: -1, east: -49, north: 5},
+    "Tocantins": {west: -51, south: -14, east: -45.5, north: -5},
+    "Maranhao": {west: -49, south: -11, east: -41, north: -1},
+    "Piaui": {west: -46, south: -11, east: -40.5, north: -2.5},
+    "Ceara": {west: -42, south: -8, east: -37, north: -2.5},
+    "Rio Grande do Norte": {west: -38.5, south: -7, east: -34.5, north: -4.5},
+    "Paraiba": {west: -39, south: -8.5, east: -34.5, north: -6},
+    "Pernambuco": {west: -41.5, south: -10, east: -34.5, north: -7},
+    "Alagoas": {west: -38.5, south: -10.5, east: -35, north: -8.5},
+    "Sergipe": {west: -38.5, south: -11.5, east: -36.5, north: -9.5},
+    "Bahia": {west: -47, south: -18.5, east: -37.5, north: -8.5},
+    "Minas Gerais": {west: -52, south: -23, east: -39.5, north: -14},
+    "Espirito Santo": {west: -42, south: -21.5, east: -39.5, north: -17.5},
+    "Rio de Janeiro": {west: -45, south: -23.5, east: -40.5, north: -20.5},
+    "Sao Paulo": {west: -54, south: -26, east: -44, north: -19.5},
+    "Parana": {west: -55, south: -27, east: -48, north: -22.5},
+    "Santa Catarina": {west: -54, south: -29.5, east: -48, north: -25.5},
+    "Rio Grande do Sul": {west: -58, south: -34, east: -49, north: -27},
+    "Mato Grosso do Sul": {west: -58, south: -25, east: -53, north: -17},
+    "Mato Grosso": {west: -62, south: -18, east: -50, north: -7},
+    "Goias": {west: -53.5, south: -20, east: -45.5, north: -12.5},
+    "Distrito Federal": {west: -48.5, south: -16.1, east: -47, north: -15.4},
+    "Rondonia": {west: -67, south: -14, east: -59.5, north: -7.5}
+};
+
+// 1-degree grid of candidate states per cell, kept in the same order as
+// the table above so overlapping boxes resolve exactly as a linear scan
+const stateGrid = new Map();
+for (const [name, bounds] of Object.entries(states)) {
+    for (let lat = Math.floor(bounds.south); lat <= Math.floor(bounds.north); lat++) {
+        for (let lon = Math.floor(bounds.west); lon <= Math.floor(bounds.east); lon++) {
+            const key = lat + ',' + lon;
+            if (!stateGrid.has(key)) stateGrid.set(key, []);
+            stateGrid.get(key).push(name);
+        }
+    }
+}
+
+function getStateName(lat, lon) {
+    const candidates = stateGrid.get(Math.floor(lat) + ',' + Math.floor(lon)) || [];
+    for (const name of candidates) {
+        const bounds = states[name];
+        if (lon >= bounds.west && lon <= bounds.east && lat >= bounds.south && lat <= bounds.north) {
+            return name;
+        }
+    }
+    return 'Brasil';
+}
+
+// One-decimal text for the non-negative figures shown (FRP, brightness),
+// from integer tenths instead of toFixed
+function fixed1(value) {
+    const tenths = Math.round(value * 10);
+    return (tenths - tenths % 10) / 10 + '.' + tenths % 10;
+}
+
+// DOM writes from data handlers are queued and applied together in the
+// next animation frame. A later write to the same target replaces the
+// queued one, and values that are already on screen are not written again
+const renderedStats = {};
+let pendingWrites = null;
+let writesFrame = 0;
+
+function queueWrite(key, write) {
+    if (!pendingWrites) {
+        pendingWrites = new Map();
+        writesFrame = requestAnimationFrame(flushWrites);
+    }
+    pendingWrites.set(key, write);
+}
+
+// Also called from the render frame, so writes queued while rendering
+// land in that same frame
+function flushWrites() {
+    if (!pendingWrites) return;
+    cancelAnimationFrame(writesFrame);
+    const writes = pendingWrites;
+    pendingWrites = null;
+    writes.forEach(write => write());
+}
+
+function applyStats(patch) {
+    for (const id in patch) {
+        const text = String(patch[id]);
+        queueWrite(id, () => {
+            if (renderedStats[id] === text) return;
+            renderedStats[id] = text;
+            element(id).textContent = text;
+        });
+    }
+}
+
+// Inline style and class writes, queued the same way
+function setStyle(id, property, value) {
+    queueWrite(id + '.' + property, () => {
+        const style = element(id).style;
+        if (style[property] !== value) style[property] = value;
+    });
+}
+
+function setClassName(id, className) {
+    queueWrite(id + '.className', () => {
+        const el = element(id);
+        if (el.className !== className) el.className = className;
+    });
+}
+
+function showLoading() {
+    element('loadingIndicator').classList.add('active');
+}
+
+function hideLoading() {
+    element('loadingIndicator').classList.remove('active');
+}
+
+// ========================================
+// API Calls
+// ========================================
+// Hotspot count, clusters, weather, risk and emissions for a region in one
+// request; the browser revalidates it by ETag, so the raw response is
+// returned. The hotspot list itself comes from fetchHotspotArrays
+function fetchDashboard(coords, days, days_without_rain, signal) {
+    const url = '/api/dashboard?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days +
+        '&lat=' + coords.center[0] + '&lon=' + coords.center[1] + '&days_without_rain=' + days_without_rain + '&records=0';
+    return fetch(url, { signal });
+}
+
+// Every hotspot of the region as packed little-endian records (see
+// HOTSPOT_RECORD_DTYPE in api/index.py), read straight into typed arrays;
+// falls back to the JSON endpoint if the binary one fails
+const HOTSPOT_RECORD_SIZE = 22;
+
+async function fetchHotspotArrays(coords, days, signal) {
+    const query = '?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days;
+    const response = await fetch('/api/hotspots.bin' + query, { signal });
+    if (response.ok) {
+        const view = new DataView(await response.arrayBuffer());
+        const count = Math.floor(view.byteLength / HOTSPOT_RECORD_SIZE);
+        const lat = new Float32Array(count);
+        const lon = new Float32Array(count);
+        const frp = new Float32Array(count);
+        for (let i = 0, o = 0; i < count; i++, o += HOTSPOT_RECORD_SIZE) {
+            lat[i] = view.getFloat32(o, true);
+            lon[i] = view.getFloat32(o + 4, true);
+            frp[i] = view.getFloat32(o + 8, true);
+        }
+        return { lat, lon, frp };
+    }
+
+    const data = await (await fetch('/api/hotspots' + query, { signal })).json();
+    const hotspots = data.hotspots || [];
+    const lat = new Float32Array(hotspots.length);
+    const lon = new Float32Array(hotspots.length);
+    const frp = new Float32Array(hotspots.length);
+    for (let i = 0; i < hotspots.length; i++) {
+        lat[i] = hotspots[i].latitude;
+        lon[i] = hotspots[i].longitude;
+        frp[i] = hotspots[i].frp;
+    }
+    return { lat, lon, frp };
+}
+
+async function fetchPrediction(lat, lon, area, wind_dir, hours, signal) {
+    const url = '/api/predict?lat=' + lat + '&lon=' + lon + '&area=' + area + '&wind_dir=' + wind_dir + '&hours=' + hours;
+    const response = await fetch(url, { signal });
+    return await response.json();
+}
+
+async function fetchLocationInfo(lat, lon, signal) {
+    await tabsReady;
+    const droughtDays = parseInt(element('droughtDays').value) || 5;
+    const url = '/api/location?lat=' + lat + '&lon=' + lon + '&days_without_rain=' + droughtDays;
+    const response = await fetch(url, { signal });
+    return await response.json();
+}
+
+async function fetchEvacuation(lat, lon, radius, signal) {
+    const url = '/api/evacuation?lat=' + lat + '&lon=' + lon + '&radius=' + radius;
+    const response = await fetch(url, { signal });
+    return await response.json();
+}
+
+// Server-clustered map markers for the visible part of the region
+async function fetchMapClusters(coords, days, signal) {
+    const url = '/api/hotspots/clusters?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days +
+        '&bbox=' + map.getBounds().toBBoxString() + '&zoom=' + map.getZoom();
+    const response = await fetch(url, { signal });
+    return await response.json();
+}
+
+async function fetchBurnedArea(coords, days) {
+    const url = '/api/burned-area?west=' + coords.west + '&south=' + coords.south + '&east=' + coords.east + '&north=' + coords.north + '&days=' + days;
+    const response = await fetch(url);
+    return await response.json();
+}
+
+// ========================================
+// Heat Map Functions
+// ========================================
+const HEAT_OPTIONS = {
+    radius: 25,
+    blur: 15,
+    maxZoom: 10,
+    max: 1.0,
+    gradient: {
+        0.0: '#ffffb2',
+        0.25: '#fecc5c',
+        0.5: '#fd8d3c',
+        0.75: '#f03b20',
+        1.0: '#bd0026'
+    }
+};
+
+// The heat map is drawn with WebGL. Points are projected to Web Mercator
+// world units by a worker (heat-worker.js) and uploaded once per data
+// refresh, so pans and zooms only change uniforms. Each point is a quad whose alpha fades from radius - blur to
+// radius + blur; overlapping quads accumulate alpha the way Leaflet.heat's
+// canvas does, and a second pass colours the result through the gradient
+const HEAT_POINT_VS = `
+attribute vec2 a_world;
+attribute vec2 a_corner;
+attribute float a_intensity;
+uniform vec2 u_origin;
+uniform float u_scale;
+uniform vec2 u_size;
+uniform float u_extent;
+uniform float u_weight;
+varying vec2 v_corner;
+varying float v_alpha;
+void main() {
+    vec2 px = (a_world - u_origin) * u_scale + a_corner * u_extent;
+    vec2 clip = px / u_size * 2.0 - 1.0;
+    gl_Position = vec4(clip.x, -clip.y, 0.0, 1.0);
+    v_corner = a_corner;
+    v_alpha = clamp(max(a_intensity * u_weight, 0.05), 0.0, 1.0);
+}`;
+
+const HEAT_POINT_FS = `
+precision mediump float;
+uniform float u_core;
+varying vec2 v_corner;
+varying float v_alpha;
+void main() {
+    gl_FragColor = vec4(0.0, 0.0, 0.0, v_alpha * (1.0 - smoothstep(u_core, 1.0, length(v_corner))));
+}`;
+
+const HEAT_COLOR_VS = `
+attribute vec2 a_position;
+varying vec2 v_uv;
+void main() {
+    v_uv = a_position * 0.5 + 0.5;
+    gl_Position = vec4(a_position, 0.0, 1.0);
+}`;
+
+const HEAT_COLOR_FS = `
+precision mediump float;
+uniform sampler2D u_heat;
+uniform sampler2D u_gradient;
+varying vec2 v_uv;
+void main() {
+    float a = texture2D(u_heat, v_uv).a;
+    gl_FragColor = vec4(texture2D(u_gradient, vec2(a, 0.5)).rgb * a, a);
+}`;
+
+function compileProgram(gl, vsSource, fsSource, attributes) {
+    const program = gl.createProgram();
+    for (const [source, type] of [[vsSource, gl.VERTEX_SHADER], [fsSource, gl.FRAGMENT_SHADER]]) {
+        const shader = gl.createShader(type);
+        gl.shaderSource(shader, source);
+        gl.compileShader(shader);
+        gl.attachShader(program, shader);
+    }
+    attributes.forEach((name, location) => gl.bindAttribLocation(program, location, name));
+    gl.linkProgram(program);
+    if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+        throw new Error(gl.getProgramInfoLog(program));
+    }
+    return program;
+}
+
+const HeatGLLayer = L.Layer.extend({
+    initialize: function (options) {
+        L.setOptions(this, options);
+        this._frp = null;
+        this._vertices = new Float32Array(0);
+        this._count = 0;
+        this._request = 0;
+        this._worker = new Worker(element('map').dataset.heatWorker);
+        this._worker.onmessage = event => this._setVertices(event.data);
+    },
+
+    // Each refresh brings new arrays, so identity tells whether data changed
+    setData: function (lat, lon, frp) {
+        if (frp === this._frp) return this;
+        this._frp = frp;
+        this._worker.postMessage({ id: ++this._request, lat, lon, frp });
+        return this;
+    },
+
+    // Vertices arrive from the worker; replies to superseded data are dropped
+    _setVertices: function ({ id, vertices }) {
+        if (id !== this._request) return;
+        this._vertices = vertices;
+        if (this._gl) {
+            this._upload();
+            this._redraw();
+        }
+    },
+
+    onAdd: function (map) {
+        const canvas = this._canvas = L.DomUtil.create('canvas', 'leaflet-heatmap-layer');
+        L.DomUtil.addClass(canvas, map._zoomAnimated ? 'leaflet-zoom-animated' : 'leaflet-zoom-hide');
+        canvas.width = canvas.height = 0;  // sized, with its texture, by _reset
+        map.getPanes().overlayPane.appendChild(canvas);
+
+        const gl = this._gl = canvas.getContext('webgl', { antialias: false, depth: false });
+        this._pointProgram = compileProgram(gl, HEAT_POINT_VS, HEAT_POINT_FS, ['a_world', 'a_corner', 'a_intensity']);
+        this._colorProgram = compileProgram(gl, HEAT_COLOR_VS, HEAT_COLOR_FS, ['a_position']);
+        this._pointBuffer = gl.createBuffer();
+        this._quadBuffer = gl.createBuffer();
+        gl.bindBuffer(gl.ARRAY_BUFFER, this._quadBuffer);
+        gl.bufferData(gl.ARRAY_BUFFER, new Float32Array([-1, -1, 1, -1, -1, 1, 1, 1]), gl.STATIC_DRAW);
+
+        // Accumulated alpha is rendered into a texture the size of the map
+        this._heatTexture = this._createTexture(gl.NEAREST);
+        this._framebuffer = gl.createFramebuffer();
+        this._gradientTexture = this._createTexture(gl.LINEAR);
+        gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA, gl.RGBA, gl.UNSIGNED_BYTE, this._gradientImage());
+
+        this._upload();
+        this._reset();
+    },
+
+    onRemove: function () {
+        const lose = this._gl.getExtension('WEBGL_lose_context');
+        if (lose) lose.loseContext();
+        this._gl = null;
+        L.DomUtil.remove(this._canvas);
+    },
+
+    getEvents: function () {
+        const events = { viewreset: this._reset, moveend: this._reset, resize: this._reset };
+        if (this._map._zoomAnimated) events.zoomanim = this._animateZoom;
+        return events;
+    },
+
+    _createTexture: function (filter) {
+        const gl = this._gl;
+        const texture = gl.createTexture();
+        gl.bindTexture(gl.TEXTURE_2D, texture);
+        gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, filter);
+        gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, filter);
+        gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE);
+        gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE);
+        return texture;
+    },
+
+    _gradientImage: function () {
+        const canvas = document.createElement('canvas');
+        canvas.width = 256;
+        canvas.height = 1;
+        const ctx = canvas.getContext('2d');
+        const gradient = ctx.createLinearGradient(0, 0, 256, 0);
+        for (const stop in this.options.gradient) {
+            gradient.addColorStop(+stop, this.options.gradient[stop]);
+        }
+        ctx.fillStyle = gradient;
+        ctx.fillRect(0, 0, 256, 1);
+        return canvas;
+    },
+
+    _upload: function () {
+        const gl = this._gl;
+        gl.bindBuffer(gl.ARRAY_BUFFER, this._pointBuffer);
+        gl.bufferData(gl.ARRAY_BUFFER, this._vertices, gl.STATIC_DRAW);
+        this._count = this._vertices.length / 30;
+    },
+
+    _reset: function () {
+        const gl = this._gl;
+        const size = this._map.getSize();
+        L.DomUtil.setPosition(this._canvas, this._map.containerPointToLayerPoint([0, 0]));
+
+        if (this._canvas.width !== size.x || this._canvas.height !== size.y) {
+            this._canvas.width = size.x;
+            this._canvas.height = size.y;
+            gl.bindTexture(gl.TEXTURE_2D, this._heatTexture);
+            gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA, size.x, size.y, 0, gl.RGBA, gl.UNSIGNED_BYTE, null);
+            gl.bindFramebuffer(gl.FRAMEBUFFER, this._framebuffer);
+            gl.framebufferTexture2D(gl.FRAMEBUFFER, gl.COLOR_ATTACHMENT0, gl.TEXTURE_2D, this._heatTexture, 0);
+        }
+        this._redraw();
+    },
+
+    _redraw: function () {
+        const gl = this._gl;
+        const map = this._map;
+        const options = this.options;
+        const width = this._canvas.width;
+        const height = this._canvas.height;
+        const scale = 256 * Math.pow(2, map.getZoom());
+        const origin = map.containerPointToLayerPoint([0, 0]).add(map.getPixelOrigin());
+        const extent = options.radius + options.blur;
+        gl.viewport(0, 0, width, height);
+
+        // Pass 1: accumulate point alpha, as "source-over" does on a canvas
+        gl.bindFramebuffer(gl.FRAMEBUFFER, this._framebuffer);
+        gl.clearColor(0, 0, 0, 0);
+        gl.clear(gl.COLOR_BUFFER_BIT);
+        gl.enable(gl.BLEND);
+        gl.blendFunc(gl.ONE, gl.ONE_MINUS_SRC_ALPHA);
+        gl.useProgram(this._pointProgram);
+        gl.bindBuffer(gl.ARRAY_BUFFER, this._pointBuffer);
+        gl.enableVertexAttribArray(0);
+        gl.enableVertexAttribArray(1);
+        gl.enableVertexAttribArray(2);
+        gl.vertexAttribPointer(0, 2, gl.FLOAT, false, 20, 0);
+        gl.vertexAttribPointer(1, 2, gl.FLOAT, false, 20, 8);
+        gl.vertexAttribPointer(2, 1, gl.FLOAT, false, 20, 16);
+        const program = this._pointProgram;
+        gl.uniform2f(gl.getUniformLocation(program, 'u_origin'), origin.x / scale, origin.y / scale);
+        gl.uniform1f(gl.getUniformLocation(program, 'u_scale'), scale);
+        gl.uniform2f(gl.getUniformLocation(program, 'u_size'), width, height);
+        gl.uniform1f(gl.getUniformLocation(program, 'u_extent'), extent);
+        gl.uniform1f(gl.getUniformLocation(program, 'u_core'), Math.max(0, options.radius - options.blur) / extent);
+        // Below maxZoom each point counts for less, as in Leaflet.heat
+        const zoomWeight = 1 / Math.pow(2, Math.max(0, Math.min(options.maxZoom - map.getZoom(), 12)));
+        gl.uniform1f(gl.getUniformLocation(program, 'u_weight'), zoomWeight / options.max);
+        gl.drawArrays(gl.TRIANGLES, 0, this._count * 6);
+        gl.disableVertexAttribArray(1);
+        gl.disableVertexAttribArray(2);
+
+        // Pass 2: colour the accumulated alpha through the gradient
+        gl.bindFramebuffer(gl.FRAMEBUFFER, null);
+        gl.disable(gl.BLEND);
+        gl.clear(gl.COLOR_BUFFER_BIT);
+        gl.useProgram(this._colorProgram);
+        gl.bindBuffer(gl.ARRAY_BUFFER, this._quadBuffer);
+        gl.vertexAttribPointer(0, 2, gl.FLOAT, false, 0, 0);
+        gl.activeTexture(gl.TEXTURE0);
+        gl.bindTexture(gl.TEXTURE_2D, this._heatTexture);
+        gl.activeTexture(gl.TEXTURE1);
+        gl.bindTexture(gl.TEXTURE_2D, this._gradientTexture);
+        gl.uniform1i(gl.getUniformLocation(this._colorProgram, 'u_heat'), 0);
+        gl.uniform1i(gl.getUniformLocation(this._colorProgram, 'u_gradient'), 1);
+        gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4);
+    },
+
+    _animateZoom: function (e) {
+        const scale = this._map.getZoomScale(e.zoom);
+        const offset = this._map._getCenterOffset(e.center)._multiplyBy(-scale).subtract(this._map._getMapPanePos());
+        L.DomUtil.setTransform(this._canvas, offset, scale);
+    }
+});
+
+const heatWebGL = (() => {
+    try {
+        return !!document.createElement('canvas').getContext('webgl');
+    } catch (e) {
+        return false;
+    }
+})();
+
+// Normalize FRP to heat intensity (the worker applies the same scale)
+function heatIntensity(frp) {
+    return Math.min(1, frp / 100);
+}
+
+function updateHeatMap() {
+    if (currentViewMode === 'markers') {
+        if (heatLayer) map.removeLayer(heatLayer);
+        return;
+    }
+
+    if (heatWebGL) {
+        if (!heatLayer) heatLayer = new HeatGLLayer(HEAT_OPTIONS);
+        heatLayer.setData(hotspotLat, hotspotLon, hotspotFRP);
+    } else {
+        // Without WebGL, fall back to Leaflet.heat's canvas renderer
+        const heatData = [];
+        for (let i = 0; i < hotspotLat.length; i++) {
+            heatData.push([hotspotLat[i], hotspotLon[i], heatIntensity(hotspotFRP[i])]);
+        }
+        if (heatLayer) map.removeLayer(heatLayer);
+        heatLayer = L.heatLayer(heatData, HEAT_OPTIONS);
+    }
+    if (!map.hasLayer(heatLayer)) heatLayer.addTo(map);
+}
+
+// Redraws requested within one frame (a refresh landing together with a
+// view toggle or another refresh) are merged into a single pass on the
+// next animation frame, which renders only the latest data
+const RENDER_MARKERS = 1; // map markers for the current view
+const RENDER_PANELS = 2;  // side panels, from panelData
+let renderFrame = 0;
+let renderDirty = 0;
+let panelData = null;
+
+function scheduleRender(flags) {
+    renderDirty |= flags;
+    if (!renderFrame) renderFrame = requestAnimationFrame(flushRender);
+}
+
+function flushRender() {
+    renderFrame = 0;
+    if (renderDirty & RENDER_PANELS) {
+        renderDirty &= ~RENDER_PANELS;
+        renderPanels(panelData);
+    }
+    // Markers are not kept while only the heat map is shown
+    if (renderDirty & RENDER_MARKERS && currentViewMode !== 'heatmap') {
+        renderDirty &= ~RENDER_MARKERS;
+        updateMap();
+    }
+    // Also drops the heat layer when only markers are shown
+    updateHeatMap();
+    flushWrites();
+}
+
+function setViewMode(mode) {
+    currentViewMode = mode;
+
+    // Update buttons
+    viewButtons.forEach(btn => btn.classList.toggle('active', btn.dataset.view === mode));
+
+    // Update layers
+    if (mode === 'markers') {
+        if (heatLayer) map.removeLayer(heatLayer);
+        map.addLayer(markers);
+    } else if (mode === 'heatmap') {
+        // Drop the markers rather than keep them hidden; they are fetched
+        // again for the view when markers come back
+        map.removeLayer(markers);
+        if (mapClustersController) mapClustersController.abort();
+        prefetchedMarkers = null;
+        markers.clearLayers();
+        markerByKey.clear();
+        renderDirty |= RENDER_MARKERS;
+    } else { // both
+        map.addLayer(markers);
+    }
+    scheduleRender(0);
+}
+
+// ========================================
+// Auto Refresh Functions
+// ========================================
+function toggleAutoRefresh() {
+    autoRefreshEnabled = !autoRefreshEnabled;
+    const btn = element('autoRefreshBtn');
+    const indicator = element('liveIndicator');
+
+    btn.classList.toggle('active', autoRefreshEnabled);
+    btn.textContent = autoRefreshEnabled ? '⏸ Pausar' : '▶ Auto (5s)';
+    indicator.style.display = autoRefreshEnabled ? 'flex' : 'none';
+    indicator.classList.toggle('pulse', autoRefreshEnabled);
+
+    if (autoRefreshEnabled) {
+        autoRefreshInterval = setInterval(autoRefreshTick, 5000);
+    } else {
+        clearInterval(autoRefreshInterval);
+    }
+}
+
+// Filter changes load after a short pause, so stepping through a select
+// issues one request; an auto-refresh tick landing meanwhile is folded in
+const FILTER_DEBOUNCE_MS = 250;
+let filterLoadTimer = 0;
+
+function scheduleFilterLoad() {
+    clearTimeout(filterLoadTimer);
+    filterLoadTimer = setTimeout(() => {
+        filterLoadTimer = 0;
+        loadAllData(false);
+    }, FILTER_DEBOUNCE_MS);
+}
+
+function autoRefreshTick() {
+    if (!filterLoadTimer) loadAllData(false);
+}
+
+// ========================================
+// Load All Data
+// ========================================
+// Refresh in flight; a newer refresh aborts it so slow responses cannot pile up
+let refreshController = null;
+// ETag of the bundle currently on screen
+let renderedEtag = null;
+// Region and window of the data on screen, for viewport marker requests
+let currentArea = null;
+
+function hotspotBounds() {
+    let south = Infinity, west = Infinity, north = -Infinity, east = -Infinity;
+    for (let i = 0; i < hotspotLat.length; i++) {
+        if (hotspotLat[i] < south) south = hotspotLat[i];
+        if (hotspotLat[i] > north) north = hotspotLat[i];
+        if (hotspotLon[i] < west) west = hotspotLon[i];
+        if (hotspotLon[i] > east) east = hotspotLon[i];
+    }
+    return [[south, west], [north, east]];
+}
+
+async function loadAllData(fitBounds = false) {
+    await filtersReady;
+    const region = element('regionSelect').value;
+    const days = element('daysSelect').value;
+    const coords = regions[region];
+    const droughtDays = parseInt(element('droughtDays').value) || 5;
+
+    if (refreshController) refreshController.abort();
+    const controller = refreshController = new AbortController();
+
+    if (!autoRefreshEnabled) showLoading();
+
+    // The panels, the hotspot arrays and the map markers come from separate
+    // endpoints; request them together so a refresh costs one round trip
+    const arraysRequest = fetchHotspotArrays(coords, days, controller.signal);
+    // Markers for the current view; a fitted map or the heat map fetches its
+    // own, and a failed request is left for updateMap to retry
+    const markersRequest = fitBounds || currentViewMode === 'heatmap' ? null :
+        fetchMapClusters(coords, days, controller.signal).catch(() => null);
+    // Awaited below, or dropped when the refresh stops early
+    arraysRequest.catch(() => {});
+
+    try {
+        // Load everything for the region, with weather and risk at its center
+        const response = await fetchDashboard(coords, days, droughtDays, controller.signal);
+        const etag = response.headers.get('ETag');
+        if (etag && etag === renderedEtag && !fitBounds) {
+            // Nothing changed since the last refresh: skip parsing and redrawing
+            controller.abort();
+            applyStats({ lastUpdate: new Date().toLocaleTimeString('pt-BR') });
+            hideLoading();
+            return;
+        }
+
+        const [data, arrays, markerData] = await Promise.all([response.json(), arraysRequest, markersRequest]);
+        if (data.error) throw new Error(data.error);
+        renderedEtag = etag;
+
+        hotspotLat = arrays.lat;
+        hotspotLon = arrays.lon;
+        hotspotFRP = arrays.frp;
+        currentClusters = data.clusters.clusters || [];
+        clusterById = new Map();
+        for (const c of currentClusters) clusterById.set(String(c.id), c);
+        indexClusterCentres();
+        currentWeather = data.weather;
+        currentArea = { coords, days };
+        prefetchedMarkers = markerData;
+
+        // Redraw the map and the panels on the next frame
+        panelData = data;
+        scheduleRender(RENDER_MARKERS | RENDER_PANELS);
+
+        // Update timestamp
+        applyStats({ lastUpdate: new Date().toLocaleTimeString('pt-BR') });
+
+        // Fit map only on first load or manual refresh
+        if (fitBounds && hotspotLat.length > 0) {
+            map.fitBounds(hotspotBounds(), { padding: [50, 50] });
+        }
+
+        // Hide loading indicator after successful load
+        hideLoading();
+
+    } catch (error) {
+        // An aborted refresh was superseded; the newer one owns the indicator
+        if (error.name === 'AbortError') return;
+        console.error('Error loading data:', error);
+        hideLoading();
+    } finally {
+        if (refreshController === controller) refreshController = null;
+    }
+}
+
+// ========================================
+// Update Functions
+// ========================================
+function renderPanels(data) {
+    const stats = clusterStats(data.clusters.clusters || []);
+    updateStatistics(data.hotspots, data.clusters, stats);
+    updateWeatherDisplay(data.weather);
+    updateRiskDisplay(data.risk);
+    updateBiomeInfo(data.emissions);
+    updateClusterList();
+    updateFireSelect();
+    updateAlertsTab(data.clusters, data.risk, stats);
+}
+
+// Popup markup is only built when a marker is opened, as one template
+// literal
+function buildFirePopup(h) {
+    const frpColor = TIER_POPUP_COLORS[frpTier(h.frp)];
+    return `<div style="font-family: sans-serif; min-width: 200px;">
+<h4 style="color: #ff6b35; margin: 0 0 8px 0; border-bottom: 1px solid #ddd; padding-bottom: 5px;">🔥 Foco de Incendio</h4>
+<p style="margin: 4px 0; font-weight: bold; color: #333;">📍 ${getStateName(h.latitude, h.longitude)}</p>
+<p style="margin: 4px 0; font-size: 0.85em; color: #666;">${h.latitude.toFixed(5)}, ${h.longitude.toFixed(5)}</p>
+<hr style="border: none; border-top: 1px solid #eee; margin: 8px 0;">
+<p style="margin: 4px 0;"><strong>FRP:</strong> <span style="color: ${frpColor}; font-weight: bold;">${fixed1(h.frp)} MW</span></p>
+<p style="margin: 4px 0;"><strong>Brilho:</strong> ${fixed1(h.brightness)} K</p>
+<p style="margin: 4px 0;"><strong>Confianca:</strong> ${h.confidence}</p>
+<p style="margin: 4px 0;"><strong>Satelite:</strong> ${h.satellite}</p>
+<p style="margin: 4px 0;"><strong>Data/Hora:</strong> ${h.acq_datetime}</p>
+<p style="margin: 4px 0;"><strong>Periodo:</strong> ${h.daynight === 'D' ? '☀️ Diurno' : '🌙 Noturno'}</p>
+<hr style="border: none; border-top: 1px solid #eee; margin: 8px 0;">
+<p style="margin: 4px 0; font-size: 0.8em; color: #888;">Clique para ver dados climaticos</p>
+</div>`;
+}
+
+// Markers on the map keyed by detection or cluster cell, reused across
+// refreshes and pans
+const markerByKey = new Map();
+let mapClustersController = null;
+let prefetchedMarkers = null;
+
+function hotspotKey(h) {
+    return h.latitude + ',' + h.longitude + ',' + h.acq_datetime + ',' + h.satellite;
+}
+
+function createHotspotMarker(h) {
+    const tier = frpTier(h.frp);
+    const marker = L.circleMarker([h.latitude, h.longitude], FIRE_MARKER_STYLES[tier]);
+    marker.hotspot = h;
+    marker.tier = tier;
+    marker.on('click', () => selectHotspot(marker.hotspot));
+    marker.bindPopup(() => buildFirePopup(marker.hotspot));
+    return marker;
+}
+
+function createClusterMarker(feature) {
+    const [lon, lat] = feature.geometry.coordinates;
+    const [west, south, east, north] = feature.bbox;
+    const marker = L.marker([lat, lon], {
+        icon: L.divIcon({
+            html: '<div style="background: rgba(255,107,53,0.9); color: white; border-radius: 50%; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; font-weight: bold; border: 2px solid #fff; box-shadow: 0 0 10px rgba(255,107,53,0.5);">' + feature.properties.point_count + '</div>',
+            className: 'hotspot-cluster',
+            iconSize: L.point(40, 40)
+        })
+    });
+    marker.on('click', () => map.fitBounds([[south, west], [north, east]], { padding: [50, 50] }));
+    return marker;
+}
+
+async function updateMap() {
+    if (!currentArea || currentViewMode === 'heatmap') return;
+    if (mapClustersController) mapClustersController.abort();
+
+    // loadAllData fetches the markers alongside the rest of the region
+    let data = prefetchedMarkers;
+    prefetchedMarkers = null;
+    if (!data) {
+        const controller = mapClustersController = new AbortController();
+        try {
+            data = await fetchMapClusters(currentArea.coords, currentArea.days, controller.signal);
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Error loading map markers:', error);
+            return;
+        } finally {
+            if (mapClustersController === controller) mapClustersController = null;
+        }
+    }
+
+    const seen = new Set();
+    for (const feature of data.features || []) {
+        const props = feature.properties;
+        const key = props.cluster ? 'cluster:' + props.cluster_id + ':' + props.point_count : hotspotKey(props);
+        seen.add(key);
+        const marker = markerByKey.get(key);
+        if (!marker) {
+            const created = props.cluster ? createClusterMarker(feature) : createHotspotMarker(props);
+            markerByKey.set(key, created);
+            markers.addLayer(created);
+            continue;
+        }
+        if (props.cluster) continue;
+        // Restyle only when the FRP moves the marker into another size/colour band
+        const tier = frpTier(props.frp);
+        if (marker.tier !== tier) {
+            marker.tier = tier;
+            marker.setStyle(FIRE_MARKER_STYLES[tier]);
+        }
+        marker.hotspot = props;
+    }
+
+    for (const [key, marker] of markerByKey) {
+        if (!seen.has(key)) {
+            markerByKey.delete(key);
+            markers.removeLayer(marker);
+        }
+    }
+}
+
+// Panning and zooming ask the server for the markers of the new view once
+// the map has settled
+let viewChangeTimer = 0;
+map.on('moveend', () => {
+    prefetchedMarkers = null;
+    clearTimeout(viewChangeTimer);
+    viewChangeTimer = setTimeout(updateMap, 150);
+});
+
+function updateStatistics(hotspotsData, clustersData, stats) {
+    const count = hotspotsData.count || 0;
+    const clusters = clustersData.clusters || [];
+
+    applyStats({ totalFires: count, headerFires: count, totalClusters: clusters.length });
+
+    if (count > 0) {
+        // One pass over positive FRP values; no spread, so no argument limit
+        let sumFRP = 0;
+        let maxFRP = 0;
+        let fires = 0;
+        for (let i = 0; i < hotspotFRP.length; i++) {
+            const f = hotspotFRP[i];
+            if (f > 0) {
+                sumFRP += f;
+                fires++;
+                if (f > maxFRP) maxFRP = f;
+            }
+        }
+        const avgFRP = fires > 0 ? sumFRP / fires : 0;
+
+        applyStats({
+            avgFRP: fixed1(avgFRP),
+            maxFRP: fixed1(maxFRP),
+            headerArea: Math.round(stats.totalArea)
+        });
+    }
+}
+
+function updateWeatherDisplay(weather) {
+    const temp = weather.temperature + '°C';
+    const humid = weather.humidity + '%';
+    const wind = weather.wind_speed + ' km/h';
+    const windDir = getWindDirection(weather.wind_direction);
+
+    // Map card and sidebar weather panel
+    applyStats({
+        weatherTemp: temp, weatherHumid: humid, weatherWind: wind, weatherDir: windDir,
+        sidebarTemp: temp, sidebarHumid: humid, sidebarWind: wind, sidebarWindDir: windDir
+    });
+}
+
+function riskColor(index) {
+    if (index >= 60) return 'red';
+    if (index >= 40) return 'yellow';
+    return 'green';
+}
+
+function updateRiskDisplay(risk) {
+    applyStats({
+        riskValue: risk.risk_index,
+        riskLevel: risk.risk_level,
+        headerRisk: risk.risk_level,
+        tempValue: risk.factors.temperature + '°C',
+        humidValue: risk.factors.humidity + '%',
+        windValue: risk.factors.wind_speed + ' km/h',
+        droughtValue: risk.factors.days_without_rain + ' dias'
+    });
+    setStyle('riskIndicator', 'left', risk.risk_index + '%');
+
+    // Color based on risk
+    setClassName('riskValue', 'risk-value ' + riskColor(risk.risk_index));
+
+    // Update factor bars
+    setStyle('tempBar', 'width', Math.min(100, (risk.factors.temperature - 20) * 4) + '%');
+    setStyle('humidBar', 'width', (100 - risk.factors.humidity) + '%');
+    setStyle('windBar', 'width', Math.min(100, risk.factors.wind_speed * 2) + '%');
+    setStyle('droughtBar', 'width', Math.min(100, risk.factors.days_without_rain * 5) + '%');
+}
+
+function updateBiomeInfo(data) {
+    applyStats({
+        biomeName: data.biome,
+        currentBiome: data.biome,
+        biomeCarbon: data.carbon_tons_ha,
+        biomeRecovery: data.recovery_years,
+        emissionsCO2: data.emissions.co2_tons.toLocaleString(),
+        emissionsCH4: data.emissions.ch4_tons,
+        emissionsPM25: data.emissions.pm25_tons,
+        emissionsEquiv: 'Equivalente a ' + data.emissions.cars_equivalent.toLocaleString() + ' carros/ano'
+    });
+}
+
+// Cluster rows are cloned from a template and kept per cluster id; a
+// refresh only rewrites text that changed and leaves the list alone when
+// the same rows come back in the same order
+const clusterRows = new Map();
+
+function clusterRow(c) {
+    let row = clusterRows.get(c.id);
+    if (!row) {
+        row = element('clusterRowTpl').content.firstElementChild.cloneNode(true);
+        row.fields = {};
+        row.querySelectorAll('[data-role]').forEach(el => { row.fields[el.dataset.role] = el; });
+        clusterRows.set(c.id, row);
+    }
+    row.dataset.arg = c.id;
+    // Rebuilt lists never kept the selection highlight; reused rows drop it too
+    if (row.style.borderLeftColor) row.style.borderLeftColor = '';
+    const text = {
+        state: c.state || 'Brasil',
+        count: c.count + ' focos',
+        biome: c.biome || '',
+        frp: 'FRP: ' + fixed1(c.total_frp) + ' MW',
+        area: 'Area: ' + c.estimated_area_ha + ' ha'
+    };
+    for (const role in text) {
+        if (row.fields[role].textContent !== text[role]) row.fields[role].textContent = text[role];
+    }
+    return row;
+}
+
+// The list is not rendered while it is out of view (another tab open or
+// scrolled away); it catches up with the latest clusters when it shows
+let clusterListVisible = true;
+let clusterListStale = false;
+
+new IntersectionObserver(entries => {
+    clusterListVisible = entries[entries.length - 1].isIntersecting;
+    if (clusterListVisible && clusterListStale) updateClusterList();
+}).observe(element('clusterList'));
+
+function updateClusterList() {
+    clusterListStale = !clusterListVisible;
+    if (clusterListStale) return;
+    const list = element('clusterList');
+
+    if (currentClusters.length === 0) {
+        clusterRows.clear();
+        list.innerHTML = '<div style="color: #666; text-align: center; padding: 20px;">Nenhum incendio detectado</div>';
+        return;
+    }
+
+    const shown = currentClusters.slice(0, 10);
+    const rows = shown.map(clusterRow);
+    const ids = new Set(shown.map(c => c.id));
+    for (const id of clusterRows.keys()) {
+        if (!ids.has(id)) clusterRows.delete(id);
+    }
+
+    const children = list.children;
+    if (children.length !== rows.length || rows.some((row, i) => children[i] !== row)) {
+        list.replaceChildren(...rows);
+    }
+}
+
+function updateFireSelect() {
+    // Placeholder plus the first 20 clusters, built off-document and
+    // swapped in at once
+    const frag = document.createDocumentFragment();
+    frag.appendChild(new Option('Selecione um incendio...', ''));
+    const n = Math.min(20, currentClusters.length);
+    for (let i = 0; i < n; i++) {
+        const c = currentClusters[i];
+        const location = c.state || 'Brasil';
+        frag.appendChild(new Option(location + ' - ' + c.count + ' focos (' + c.estimated_area_ha + ' ha)', c.id));
+    }
+    element('fireSelect').replaceChildren(frag);
+}
+
+// Estimated share of burned area that is forest
+const FOREST_SHARE = 0.65;
+
+// Risk bands of 20 points: alert level, share of clusters under alert
+// and the class for the level's colour
+const ALERT_BANDS = [
+    { level: 'NORMAL', share: 0, className: 'stat-value green' },
+    { level: 'BAIXO', share: 0.1, className: 'stat-value green' },
+    { level: 'MODERADO', share: 0.3, className: 'stat-value green' },
+    { level: 'ALTO', share: 0.7, className: 'stat-value yellow' },
+    { level: 'CRITICO', share: 1, className: 'stat-value red' }
+];
+
+function updateAlertsTab(clustersData, riskData, stats) {
+    const clusters = clustersData.clusters || [];
+
+    // Calculate total burned area; the non-forest part is what is left of
+    // the rounded total, so the two always add up to the figure shown
+    const totalArea = Math.round(stats.totalArea);
+    const forestArea = Math.round(totalArea * FOREST_SHARE);
+    const otherArea = totalArea - forestArea;
+
+    applyStats({
+        totalBurnedArea: totalArea,
+        burnedForest: forestArea,
+        burnedOther: otherArea
+    });
+
+    // Alert level by 20-point risk band
+    const riskIndex = riskData ? riskData.risk_index : 0;
+    const band = ALERT_BANDS[Math.max(0, Math.min(4, riskIndex / 20 | 0))];
+
+    applyStats({ alertLevel: band.level, alertsActive: Math.ceil(clusters.length * band.share) });
+    setClassName('alertLevel', band.className);
+
+    // Update risk areas list
+    updateRiskAreasList(stats);
+}
+
+// Cluster states get a stable integer id the first time they are seen
+const stateIndex = new Map();
+const stateNames = [];
+
+function stateId(name) {
+    let id = stateIndex.get(name);
+    if (id === undefined) {
+        id = stateNames.length;
+        stateIndex.set(name, id);
+        stateNames.push(name);
+    }
+    return id;
+}
+
+// Largest k ids by area, kept in a short sorted array rather than sorting
+// every state. Equal areas keep their input order, as a stable sort would
+const RISK_AREAS_SHOWN = 8;
+
+function topByArea(ids, area, k) {
+    const top = [];
+    for (const id of ids) {
+        if (top.length === k && area[id] <= area[top[k - 1]]) continue;
+        let i = top.length;
+        while (i > 0 && area[top[i - 1]] < area[id]) i--;
+        top.splice(i, 0, id);
+        if (top.length > k) top.pop();
+    }
+    return top;
+}
+
+// Cluster totals for one refresh, in a single pass: the overall burned
+// area, and count, area and FRP per state in typed arrays indexed by
+// state id. states lists the ids seen, in first-seen order
+function clusterStats(clusters) {
+    // States first seen in this refresh get ids past the current ones
+    const size = stateNames.length + clusters.length;
+    const count = new Int32Array(size);
+    const area = new Float64Array(size);
+    const frp = new Float64Array(size);
+    const seen = new Uint8Array(size);
+    const states = [];
+    let totalArea = 0;
+    for (let i = 0; i < clusters.length; i++) {
+        const c = clusters[i];
+        const s = stateId(c.state || 'Desconhecido');
+        const a = c.estimated_area_ha || 0;
+        if (!seen[s]) {
+            seen[s] = 1;
+            states.push(s);
+        }
+        totalArea += a;
+        count[s] += c.count;
+        area[s] += a;
+        frp[s] += c.total_frp || 0;
+    }
+    return { totalArea, states, count, area, frp };
+}
+
+function updateRiskAreasList(stats) {
+    const list = element('riskAreasList');
+
+    if (stats.states.length === 0) {
+        list.innerHTML = '<div style="color: #666; text-align: center; padding: 15px; font-size: 0.85em;">Nenhuma area em risco no momento</div>';
+        return;
+    }
+
+    const { count, area, frp } = stats;
+    const sorted = topByArea(stats.states, area, RISK_AREAS_SHOWN);
+
+    // Rows are cloned from the tab's template and filled through
+    // textContent, then swapped in with a single replaceChildren
+    const template = element('riskAreaRowTpl').content.firstElementChild;
+    const frag = document.createDocumentFragment();
+    sorted.forEach(s => {
+        const severity = area[s] > 100 ? 'red' : area[s] > 30 ? 'yellow' : 'green';
+        const row = template.cloneNode(true);
+        const fields = row.querySelectorAll('[data-role]');
+        fields[0].textContent = stateNames[s];
+        fields[1].textContent = count[s] + ' focos';
+        fields[2].textContent = Math.round(area[s]) + ' ha';
+        fields[2].style.color = 'var(--' + severity + ', #ff6b35)';
+        fields[3].textContent = 'FRP: ' + Math.round(frp[s]);
+        frag.appendChild(row);
+    });
+    list.replaceChildren(frag);
+}
+
+// ========================================
+// Cluster Functions
+// ========================================
+function focusCluster(id) {
+    const cluster = clusterById.get(id);
+    if (cluster) {
+        map.setView([cluster.center_lat, cluster.center_lon], 10);
+        selectCluster(cluster);
+        loadLocationData(cluster.center_lat, cluster.center_lon);
+    }
+}
+
+function selectCluster(cluster) {
+    selectedCluster = cluster;
+    element('fireSelect').value = cluster.id;
+
+    // Highlight selected in list
+    clusterRows.forEach((row, id) => {
+        row.style.borderLeftColor = id === cluster.id ? '#4ade80' : '#ff6b35';
+    });
+}
+
+// A hotspot belongs to the first cluster whose centre is within
+// CLUSTER_MATCH_KM on the sphere. The haversine term is compared against
+// its value at that distance, so no sqrt or asin is taken per cluster
+const EARTH_RADIUS_KM = 6371;
+const CLUSTER_MATCH_KM = 10;
+const CLUSTER_MATCH_HAV = Math.sin(CLUSTER_MATCH_KM / (2 * EARTH_RADIUS_KM)) ** 2;
+const DEG = Math.PI / 180;
+
+function indexClusterCentres() {
+    const n = currentClusters.length;
+    clusterLatRad = new Float64Array(n);
+    clusterLonRad = new Float64Array(n);
+    clusterCosLat = new Float64Array(n);
+    for (let i = 0; i < n; i++) {
+        clusterLatRad[i] = currentClusters[i].center_lat * DEG;
+        clusterLonRad[i] = currentClusters[i].center_lon * DEG;
+        clusterCosLat[i] = Math.cos(clusterLatRad[i]);
+    }
+}
+
+function clusterNear(lat, lon) {
+    const latRad = lat * DEG;
+    const lonRad = lon * DEG;
+    const cosLat = Math.cos(latRad);
+    for (let i = 0; i < clusterLatRad.length; i++) {
+        const sinLat = Math.sin((clusterLatRad[i] - latRad) / 2);
+        const sinLon = Math.sin((clusterLonRad[i] - lonRad) / 2);
+        if (sinLat * sinLat + clusterCosLat[i] * cosLat * sinLon * sinLon < CLUSTER_MATCH_HAV) {
+            return currentClusters[i];
+        }
+    }
+    return null;
+}
+
+function selectHotspot(hotspot) {
+    // Load location data for this hotspot
+    loadLocationData(hotspot.latitude, hotspot.longitude);
+
+    // Find cluster containing this hotspot
+    const cluster = clusterNear(hotspot.latitude, hotspot.longitude);
+
+    if (cluster) {
+        selectCluster(cluster);
+    }
+}
+
+// Location, prediction and evacuation requests in flight; a newer click
+// or run aborts the older request so its late reply cannot overwrite the
+// panels
+let locationController = null;
+let predictionController = null;
+let evacuationController = null;
+
+async function loadLocationData(lat, lon) {
+    if (locationController) locationController.abort();
+    const controller = locationController = new AbortController();
+    try {
+        const data = await fetchLocationInfo(lat, lon, controller.signal);
+
+        // Weather, biome and risk for this specific location
+        applyStats({
+            weatherTemp: data.weather.temperature + '°C',
+            weatherHumid: data.weather.humidity + '%',
+            weatherWind: data.weather.wind_speed + ' km/h',
+            weatherDir: getWindDirection(data.weather.wind_direction),
+            currentBiome: data.state + ' - ' + data.biome,
+            riskValue: data.risk.index,
+            riskLevel: data.risk.level,
+            headerRisk: data.risk.level,
+            tempValue: data.weather.temperature + '°C',
+            humidValue: data.weather.humidity + '%',
+            windValue: data.weather.wind_speed + ' km/h',
+            biomeName: data.biome,
+            biomeCarbon: data.biome_data.carbon_tons_ha,
+            biomeRecovery: data.biome_data.recovery_years
+        });
+        setStyle('riskIndicator', 'left', data.risk.index + '%');
+
+        // Color based on risk
+        setClassName('riskValue', 'risk-value ' + riskColor(data.risk.index));
+
+        // Update factor bars
+        setStyle('tempBar', 'width', Math.min(100, (data.weather.temperature - 20) * 4) + '%');
+        setStyle('humidBar', 'width', (100 - data.weather.humidity) + '%');
+        setStyle('windBar', 'width', Math.min(100, data.weather.wind_speed * 2) + '%');
+
+        // Update weather current location
+        currentWeather = data.weather;
+
+    } catch (error) {
+        if (error.name !== 'AbortError') console.error('Error loading location data:', error);
+    } finally {
+        if (locationController === controller) locationController = null;
+    }
+}
+
+// ========================================
+// Prediction Functions
+// ========================================
+async function runPrediction() {
+    const fireId = element('fireSelect').value;
+    const hours = parseInt(element('hoursSelect').value);
+
+    if (!fireId) {
+        alert('Selecione um incendio primeiro');
+        return;
+    }
+
+    const cluster = clusterById.get(fireId);
+    if (!cluster) return;
+
+    if (predictionController) predictionController.abort();
+    const controller = predictionController = new AbortController();
+    showLoading();
+
+    try {
+        const windDir = currentWeather ? currentWeather.wind_direction : 90;
+        const prediction = await fetchPrediction(
+            cluster.center_lat,
+            cluster.center_lon,
+            cluster.estimated_area_ha,
+            windDir,
+            hours,
+            controller.signal
+        );
+
+        displayPrediction(prediction, cluster);
+        hideLoading();
+
+    } catch (error) {
+        // A superseded run leaves the indicator to the newer one
+        if (error.name === 'AbortError') return;
+        hideLoading();
+        alert('Erro ao gerar previsao: ' + error.message);
+    } finally {
+        if (predictionController === controller) predictionController = null;
+    }
+}
+
+function displayPrediction(prediction, cluster) {
+    // Update spread stats
+    applyStats({
+        spreadRate: prediction.spread_rate,
+        spreadDir: getWindDirection(prediction.wind_direction)
+    });
+
+    // Draw prediction circles on map. Circles are kept between runs and
+    // moved into place; only a longer horizon creates new ones
+    prediction.predictions.forEach((p, i) => {
+        const popup = '<strong>+' + p.hour + 'h</strong><br>Area: ' + p.area_ha + ' ha<br>Raio: ' + p.radius_m + ' m';
+        let circle = predictionCircles[i];
+        if (circle) {
+            circle.setLatLng([p.center_lat, p.center_lon]);
+            circle.setRadius(p.radius_m);
+            circle.setPopupContent(popup);
+        } else {
+            circle = L.circle([p.center_lat, p.center_lon], {
+                radius: p.radius_m,
+                color: '#ff0000',
+                fillColor: '#ff0000',
+                fillOpacity: 0.1 - (i * 0.015),
+                weight: 2,
+                dashArray: '5, 5'
+            }).bindPopup(popup);
+            predictionCircles.push(circle);
+        }
+        if (!map.hasLayer(circle)) circle.addTo(map);
+    });
+    while (predictionCircles.length > prediction.predictions.length) {
+        map.removeLayer(predictionCircles.pop());
+    }
+
+    // Update timeline
+    const timeline = element('predictionTimeline');
+    timeline.innerHTML = prediction.predictions.map(p =>
+        '<div class="timeline-item">' +
+            '<div class="timeline-hour">+' + p.hour + ' hora' + (p.hour > 1 ? 's' : '') + '</div>' +
+            '<div class="timeline-data">' +
+                '<span>Area: ' + p.area_ha + ' ha</span>' +
+                '<span>Raio: ' + p.radius_m + ' m</span>' +
+            '</div>' +
+        '</div>'
+    ).join('');
+
+    // Update evacuation status
+    const lastPred = prediction.predictions[prediction.predictions.length - 1];
+    let status = 'MONITORAR';
+    let message = 'Situacao sob controle. Mantenha monitoramento.';
+
+    if (lastPred.area_ha > 500) {
+        status = 'EVACUAR';
+        message = 'Area critica! Iniciar evacuacao das comunidades proximas.';
+    } else if (lastPred.area_ha > 100) {
+        status = 'ALERTA';
+        message = 'Preparar plano de evacuacao. Alertar comunidades.';
+    }
+
+    applyStats({ evacuationStatus: status, evacuationMessage: message });
+
+    // Update evacuation routes in Alerts tab
+    updateEvacuationRoutes(cluster.center_lat, cluster.center_lon, lastPred.radius_m / 1000);
+
+    // Fit map to show predictions
+    // (bounds are merged directly: grouping the pooled circles would add
+    // an event parent to each of them on every run)
+    if (predictionCircles.length > 0) {
+        const bounds = L.latLngBounds([]);
+        predictionCircles.forEach(c => bounds.extend(c.getBounds()));
+        map.fitBounds(bounds, { padding: [50, 50] });
+    }
+}
+
+async function updateEvacuationRoutes(lat, lon, radius) {
+    if (evacuationController) evacuationController.abort();
+    const controller = evacuationController = new AbortController();
+    try {
+        const data = await fetchEvacuation(lat, lon, radius, controller.signal);
+        const routesDiv = element('evacuationRoutes');
+
+        if (data.routes && data.routes.length > 0) {
+            // Route and shelter rows are cloned from the tab's templates and
+            // go in with a single replaceChildren
+            const frag = document.createDocumentFragment();
+            const routeTpl = element('routeRowTpl').content.firstElementChild;
+            data.routes.forEach(r => {
+                const row = routeTpl.cloneNode(true);
+                const [name, road, distance, time] = row.querySelectorAll('[data-role]');
+                row.classList.toggle('recommended', Boolean(r.recommended));
+                name.textContent = (r.recommended ? '✓ ' : '') + 'Rota ' + r.direction;
+                road.textContent = r.road_type;
+                distance.textContent = r.distance_km + ' km';
+                time.textContent = r.estimated_time_min + ' min';
+                frag.appendChild(row);
+            });
+
+            // Add shelter info
+            if (data.shelter_points && data.shelter_points.length > 0) {
+                const shelters = element('shelterListTpl').content.firstElementChild.cloneNode(true);
+                const shelterTpl = element('shelterRowTpl').content.firstElementChild;
+                data.shelter_points.forEach(sp => {
+                    const row = shelterTpl.cloneNode(true);
+                    const [name, distance] = row.querySelectorAll('[data-role]');
+                    name.textContent = sp.name;
+                    distance.textContent = sp.distance_km + ' km';
+                    shelters.appendChild(row);
+                });
+                frag.appendChild(shelters);
+            }
+            routesDiv.replaceChildren(frag);
+        }
+    } catch (error) {
+        if (error.name !== 'AbortError') console.error('Error loading evacuation routes:', error);
+    } finally {
+        if (evacuationController === controller) evacuationController = null;
+    }
+}
+
+function clearPrediction() {
+    // Circles leave the map but stay pooled for the next prediction
+    predictionCircles.forEach(c => map.removeLayer(c));
+    element('predictionTimeline').innerHTML =
+        '<div style="color: #666; text-align: center; padding: 20px; font-size: 0.85em;">Selecione um incendio para ver a previsao</div>';
+    applyStats({
+        spreadRate: '-',
+        spreadDir: '-',
+        evacuationStatus: '-',
+        evacuationMessage: 'Execute uma previsao para ver recomendacoes de evacuacao.'
+    });
+}
+
+// ========================================
+// Event Listeners
+// ========================================
+// Buttons declare data-action (and data-arg); one delegated listener
+// also covers markup injected later (tab panels, cluster list)
+const actions = {
+    loadAllData: () => loadAllData(true),
+    toggleAutoRefresh: () => toggleAutoRefresh(),
+    setViewMode: mode => setViewMode(mode),
+    focusCluster: id => focusCluster(id),
+    runPrediction: () => runPrediction(),
+    clearPrediction: () => clearPrediction()
+};
+
+document.addEventListener('click', event => {
+    const target = event.target.closest('[data-action]');
+    if (target) actions[target.dataset.action](target.dataset.arg);
+});
+
+// Region, window and drought inputs reload the dashboard; the drought
+// field lives in a tab injected later, hence the delegated listener
+const FILTER_INPUTS = new Set(['regionSelect', 'daysSelect', 'droughtDays']);
+
+document.addEventListener('change', event => {
+    const id = event.target.id;
+    if (!FILTER_INPUTS.has(id)) return;
+    if (id === 'regionSelect') {
+        const coords = regions[event.target.value];
+        map.setView(coords.center, coords.zoom);
+    }
+    scheduleFilterLoad();
+});
+
+// ========================================
+// Initialize
+// ========================================
+loadAllData(true);
+
+// Start auto-refresh by default
+setTimeout(() => {
+    toggleAutoRefresh();
+}, 1000);
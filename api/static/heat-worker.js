@@ -0,0 +1,32 @@
+// Heat map vertex builder, run off the main thread. Receives hotspot
+// latitude, longitude and FRP arrays, projects the points to Web Mercator
+// world units and expands each into two triangles for the WebGL heat layer.
+const CORNERS = [-1, -1, 1, -1, -1, 1, -1, 1, 1, -1, 1, 1];
+const MAX_LAT = 85.0511287798;
+
+function buildVertices(lats, lons, frps) {
+    const count = lats.length;
+    const vertices = new Float32Array(count * 30);
+    for (let i = 0, o = 0; i < count; i++) {
+        const lat = Math.max(-MAX_LAT, Math.min(MAX_LAT, lats[i]));
+        const sin = Math.sin(lat * Math.PI / 180);
+        const x = lons[i] / 360 + 0.5;
+        const y = 0.5 - Math.log((1 + sin) / (1 - sin)) / (4 * Math.PI);
+        const intensity = Math.min(1, frps[i] / 100);  // Normalize intensity
+        for (let c = 0; c < 12; c += 2, o += 5) {
+            vertices[o] = x;
+            vertices[o + 1] = y;
+            vertices[o + 2] = CORNERS[c];
+            vertices[o + 3] = CORNERS[c + 1];
+            vertices[o + 4] = intensity;
+        }
+    }
+    return vertices;
+}
+
+self.onmessage = event => {
+    const { id, lat, lon, frp } = event.data;
+    const vertices = buildVertices(lat, lon, frp);
+    // Hand the buffer back without copying it
+    self.postMessage({ id, vertices }, [vertices.buffer]);
+};
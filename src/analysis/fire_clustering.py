@@ -5,11 +5,14 @@ Groups nearby fire hotspots into clusters representing individual fires.
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from collections import deque
 from typing import List, Optional, Dict, Any, Tuple
 import math
 
+import numpy as np
+
 from src.core.geo_utils import (
-    haversine_distance,
+    EARTH_RADIUS_KM,
     calculate_centroid,
     calculate_convex_hull,
     calculate_polygon_area,
@@ -137,24 +140,26 @@ def cluster_hotspots(
     if not hotspots:
         return []
 
+    points = _HotspotArrays(hotspots, time_threshold_hours is not None)
+
     # Initialize each hotspot as unvisited
-    visited = [False] * len(hotspots)
+    visited = np.zeros(len(hotspots), dtype=bool)
     clusters = []
     cluster_count = 0
 
-    for i, hotspot in enumerate(hotspots):
+    for i in range(len(hotspots)):
         if visited[i]:
             continue
 
         # Find all neighbors
         neighbors = _find_neighbors(
-            hotspots, i, distance_threshold_km, time_threshold_hours
+            points, i, distance_threshold_km, time_threshold_hours
         )
 
         if len(neighbors) >= 1:  # At least 1 neighbor (including self)
             cluster_count += 1
             cluster_hotspots_list = _expand_cluster(
-                hotspots, visited, i, neighbors,
+                hotspots, points, visited, neighbors,
                 distance_threshold_km, time_threshold_hours
             )
 
@@ -171,64 +176,73 @@ def cluster_hotspots(
     return clusters
 
 
+class _HotspotArrays:
+    """Hotspot coordinates (and detection times) as NumPy arrays."""
+
+    def __init__(self, hotspots: List[Any], with_times: bool):
+        n = len(hotspots)
+        self.latitude = np.fromiter((h.latitude for h in hotspots), dtype=np.float64, count=n)
+        self.longitude = np.fromiter((h.longitude for h in hotspots), dtype=np.float64, count=n)
+        self.cos_lat = np.cos(np.radians(self.latitude))
+        self.hours = None
+        if with_times:
+            # Offsets from the first detection; differences are what matter
+            origin = hotspots[0].datetime
+            self.hours = np.fromiter(
+                ((h.datetime - origin).total_seconds() / 3600 for h in hotspots),
+                dtype=np.float64, count=n
+            )
+
+
 def _find_neighbors(
-    hotspots: List[Any],
+    points: _HotspotArrays,
     index: int,
     distance_km: float,
     time_hours: Optional[float]
-) -> List[int]:
-    """Find all hotspots within distance threshold."""
-    neighbors = []
-    target = hotspots[index]
-
-    for i, hotspot in enumerate(hotspots):
-        dist = haversine_distance(
-            target.latitude, target.longitude,
-            hotspot.latitude, hotspot.longitude
-        )
+) -> np.ndarray:
+    """Find all hotspots within distance threshold (haversine, in one pass)."""
+    delta_lat = np.radians(points.latitude - points.latitude[index])
+    delta_lon = np.radians(points.longitude - points.longitude[index])
+    a = (
+        np.sin(delta_lat / 2) ** 2 +
+        points.cos_lat[index] * points.cos_lat * np.sin(delta_lon / 2) ** 2
+    )
+    dist = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
-        if dist <= distance_km:
-            # Check time threshold if specified
-            if time_hours is not None:
-                time_diff = abs(
-                    (target.datetime - hotspot.datetime).total_seconds() / 3600
-                )
-                if time_diff <= time_hours:
-                    neighbors.append(i)
-            else:
-                neighbors.append(i)
+    within = dist <= distance_km
+    if time_hours is not None:
+        within &= np.abs(points.hours[index] - points.hours) <= time_hours
 
-    return neighbors
+    return np.flatnonzero(within)
 
 
 def _expand_cluster(
     hotspots: List[Any],
-    visited: List[bool],
-    seed_index: int,
-    neighbors: List[int],
+    points: _HotspotArrays,
+    visited: np.ndarray,
+    neighbors: np.ndarray,
     distance_km: float,
     time_hours: Optional[float]
 ) -> List[Any]:
     """Expand cluster from seed point."""
     cluster_hotspots = []
-    queue = list(neighbors)
+    queue = deque(neighbors.tolist())
+    queued = np.zeros(len(hotspots), dtype=bool)
+    queued[neighbors] = True
 
     while queue:
-        current = queue.pop(0)
+        current = queue.popleft()
         if visited[current]:
             continue
 
         visited[current] = True
         cluster_hotspots.append(hotspots[current])
 
-        # Find new neighbors
-        new_neighbors = _find_neighbors(
-            hotspots, current, distance_km, time_hours
-        )
-
-        for neighbor in new_neighbors:
-            if not visited[neighbor] and neighbor not in queue:
-                queue.append(neighbor)
+        # Find new neighbors not yet visited or waiting in the queue
+        new_neighbors = _find_neighbors(points, current, distance_km, time_hours)
+        new_neighbors = new_neighbors[~(visited[new_neighbors] | queued[new_neighbors])]
+        queued[new_neighbors] = True
+        queue.extend(new_neighbors.tolist())
 
     return cluster_hotspots
 
@@ -255,10 +255,8 @@ _alert_manager = AlertManager()
 # System Routes
 # ============================================================================
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Welcome page."""
-    return """
+# Welcome page, encoded once at import and served as-is on every hit
+WELCOME_PAGE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -328,7 +326,14 @@ async def root():
         </p>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+WELCOME_CACHE_CONTROL = "public, max-age=3600"
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Welcome page."""
+    return HTMLResponse(content=WELCOME_PAGE, headers={"Cache-Control": WELCOME_CACHE_CONTROL})
 
 
 @app.get("/health", response_model=HealthResponse, tags=["System"])
@@ -7,6 +7,8 @@ import math
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
 # Earth's radius in kilometers
 EARTH_RADIUS_KM = 6371.0
 
@@ -144,6 +146,39 @@ def destination_point(
     return (math.degrees(dest_lat), math.degrees(dest_lon))
 
 
+def destination_points(
+    lat: float, lon: float,
+    distances_km: np.ndarray,
+    bearings_degrees: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized destination_point for many distances/bearings from one start.
+
+    Args:
+        lat, lon: Start point coordinates in decimal degrees
+        distances_km: Array of distances in kilometers
+        bearings_degrees: Array of bearings in degrees, broadcast with distances_km
+
+    Returns:
+        Tuple of (latitudes, longitudes) arrays of the destination points
+    """
+    lat_rad = math.radians(lat)
+    sin_lat = math.sin(lat_rad)
+    cos_lat = math.cos(lat_rad)
+    bearing_rad = np.radians(bearings_degrees)
+    angular_distance = np.asarray(distances_km, dtype=np.float64) / EARTH_RADIUS_KM
+    sin_ad = np.sin(angular_distance)
+    cos_ad = np.cos(angular_distance)
+
+    dest_lat = np.arcsin(sin_lat * cos_ad + cos_lat * sin_ad * np.cos(bearing_rad))
+    dest_lon = math.radians(lon) + np.arctan2(
+        np.sin(bearing_rad) * sin_ad * cos_lat,
+        cos_ad - sin_lat * np.sin(dest_lat)
+    )
+
+    return np.degrees(dest_lat), np.degrees(dest_lon)
+
+
 def point_in_polygon(
     point: Tuple[float, float],
     polygon: List[Tuple[float, float]]
@@ -194,11 +229,9 @@ def create_buffer_polygon(
     Returns:
         List of (latitude, longitude) tuples forming the polygon
     """
-    points = []
-    for i in range(num_points):
-        bearing = (360 / num_points) * i
-        lat, lon = destination_point(center_lat, center_lon, radius_km, bearing)
-        points.append((lat, lon))
+    bearings = (360 / num_points) * np.arange(num_points)
+    lats, lons = destination_points(center_lat, center_lon, radius_km, bearings)
+    points = list(zip(lats.tolist(), lons.tolist()))
 
     # Close the polygon
     points.append(points[0])
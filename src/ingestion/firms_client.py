@@ -11,7 +11,6 @@ Data sources:
 API Documentation: https://firms.modaps.eosdis.nasa.gov/api/
 """
 
-import csv
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -20,9 +19,18 @@ from io import StringIO
 from typing import Optional
 
 import httpx
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# String columns kept verbatim (acq_time keeps its leading zeros), in the
+# order FireHotspot takes them after the numeric fields
+_TEXT_COLUMNS = (
+    "acq_date", "acq_time", "satellite", "instrument",
+    "confidence", "version", "daynight",
+)
+_REQUIRED_COLUMNS = ("latitude", "longitude", "scan", "track", "frp") + _TEXT_COLUMNS
+
 
 class DataSource(str, Enum):
     """Available satellite data sources from NASA FIRMS."""
@@ -143,35 +151,73 @@ class FIRMSClient:
         self._client.close()
     
     def _parse_csv(self, csv_text: str) -> list[FireHotspot]:
-        """Parse CSV response into FireHotspot objects."""
-        hotspots = []
-        reader = csv.DictReader(StringIO(csv_text))
-        
-        for row in reader:
-            try:
-                hotspot = FireHotspot(
-                    latitude=float(row["latitude"]),
-                    longitude=float(row["longitude"]),
-                    brightness=float(row.get("bright_ti4", row.get("brightness", 0))),
-                    scan=float(row["scan"]),
-                    track=float(row["track"]),
-                    acq_date=row["acq_date"],
-                    acq_time=row["acq_time"],
-                    satellite=row["satellite"],
-                    instrument=row["instrument"],
-                    confidence=row["confidence"],
-                    version=row["version"],
-                    bright_t31=float(row.get("bright_ti5", row.get("bright_t31", 0))),
-                    frp=float(row["frp"]),
-                    daynight=row["daynight"],
-                )
-                hotspots.append(hotspot)
-            except (KeyError, ValueError) as e:
-                logger.warning(f"Failed to parse hotspot row: {e}")
-                continue
-        
-        return hotspots
-    
+        """Parse CSV response into FireHotspot objects.
+
+        The CSV is read column-wise by pandas' C parser; rows with missing
+        or non-numeric values are dropped, as the row-by-row parser did.
+        """
+        if not csv_text.strip():
+            return []
+
+        try:
+            df = pd.read_csv(
+                StringIO(csv_text),
+                dtype={column: str for column in _TEXT_COLUMNS},
+                keep_default_na=False,
+            )
+        except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+            logger.warning(f"Failed to parse hotspot CSV: {e}")
+            return []
+
+        missing = [column for column in _REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            logger.warning(f"Failed to parse hotspot rows: missing columns {missing}")
+            return []
+
+        brightness = df["bright_ti4"] if "bright_ti4" in df.columns else df.get("brightness", 0)
+        bright_t31 = df["bright_ti5"] if "bright_ti5" in df.columns else df.get("bright_t31", 0)
+        numeric = pd.DataFrame({
+            "latitude": df["latitude"],
+            "longitude": df["longitude"],
+            "brightness": brightness,
+            "scan": df["scan"],
+            "track": df["track"],
+            "bright_t31": bright_t31,
+            "frp": df["frp"],
+        }, index=df.index).apply(pd.to_numeric, errors="coerce")
+
+        valid = numeric.notna().all(axis=1)
+        dropped = int((~valid).sum())
+        if dropped:
+            logger.warning(f"Failed to parse {dropped} hotspot rows")
+            numeric = numeric[valid]
+            df = df[valid]
+
+        return [
+            FireHotspot(
+                latitude=lat,
+                longitude=lon,
+                brightness=bright,
+                scan=scan,
+                track=track,
+                acq_date=acq_date,
+                acq_time=acq_time,
+                satellite=satellite,
+                instrument=instrument,
+                confidence=confidence,
+                version=version,
+                bright_t31=t31,
+                frp=frp,
+                daynight=daynight,
+            )
+            for lat, lon, bright, scan, track, t31, frp,
+                acq_date, acq_time, satellite, instrument, confidence, version, daynight
+            in zip(
+                *(numeric[column].tolist() for column in numeric.columns),
+                *(df[column].tolist() for column in _TEXT_COLUMNS),
+            )
+        ]
+
     def get_area_hotspots(
         self,
         west: float,
@@ -188,6 +188,13 @@ BIOME_BOUNDARIES: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# (name, (south, west, north, east)) in BIOME_BOUNDARIES order, built once;
+# the first biome containing a point wins
+_BIOME_BOXES: List[Tuple[str, Tuple[float, float, float, float]]] = [
+    (biome, info["approximate_bounds"]) for biome, info in BIOME_BOUNDARIES.items()
+]
+DEFAULT_BIOME = "Cerrado"
+
 
 @dataclass
 class VegetationData:
@@ -321,18 +328,12 @@ class MapBiomasClient:
             Biome name
         """
         # Check each biome's approximate bounds
-        for biome, info in BIOME_BOUNDARIES.items():
-            bounds = info["approximate_bounds"]
-            south, west, north, east = bounds
-
+        for biome, (south, west, north, east) in _BIOME_BOXES:
             if south <= latitude <= north and west <= longitude <= east:
-                # Additional distance check from center
-                center = info["center"]
-                # Simple heuristic - could be improved with actual boundaries
                 return biome
 
         # Default to Cerrado if no match (largest biome in central Brazil)
-        return "Cerrado"
+        return DEFAULT_BIOME
 
     def get_vegetation_data(
         self,
@@ -9,6 +9,20 @@ from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _parse_json(response: httpx.Response) -> Dict[str, Any]:
+    """Decode a JSON response body, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class WeatherVariable(str, Enum):
     """Available weather variables from Open-Meteo."""
@@ -245,7 +259,7 @@ class WeatherClient:
 
         response = self._get_client().get(self.BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = _parse_json(response)
 
         current = data.get("current", {})
 
@@ -299,7 +313,7 @@ class WeatherClient:
 
         response = self._get_client().get(self.BASE_URL, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = _parse_json(response)
 
         hourly_data = data.get("hourly", {})
         times = hourly_data.get("time", [])
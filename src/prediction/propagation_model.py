@@ -8,8 +8,11 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import math
 
+import numpy as np
+
 from src.core.geo_utils import (
     destination_point,
+    destination_points,
     create_buffer_polygon,
     calculate_polygon_area,
 )
@@ -313,26 +316,23 @@ def _create_elliptical_polygon(
     a = radius_km * math.sqrt(elongation)  # Major axis (in wind direction)
     b = radius_km / math.sqrt(elongation)  # Minor axis
 
-    points = []
     direction_rad = math.radians(direction_degrees)
+    theta = (2 * math.pi / num_points) * np.arange(num_points)
 
-    for i in range(num_points):
-        theta = (2 * math.pi * i) / num_points
-
-        # Ellipse point in local coordinates
-        x = a * math.cos(theta)
-        y = b * math.sin(theta)
+    # Ellipse points in local coordinates
+    x = a * np.cos(theta)
+    y = b * np.sin(theta)
 
-        # Rotate by direction
-        x_rot = x * math.cos(direction_rad) - y * math.sin(direction_rad)
-        y_rot = x * math.sin(direction_rad) + y * math.cos(direction_rad)
+    # Rotate by direction
+    x_rot = x * math.cos(direction_rad) - y * math.sin(direction_rad)
+    y_rot = x * math.sin(direction_rad) + y * math.cos(direction_rad)
 
-        # Convert to bearing and distance
-        distance = math.sqrt(x_rot**2 + y_rot**2)
-        bearing = math.degrees(math.atan2(x_rot, y_rot))
+    # Convert to bearing and distance
+    distance = np.hypot(x_rot, y_rot)
+    bearing = np.degrees(np.arctan2(x_rot, y_rot))
 
-        lat, lon = destination_point(center_lat, center_lon, distance, bearing)
-        points.append((lat, lon))
+    lats, lons = destination_points(center_lat, center_lon, distance, bearing)
+    points = list(zip(lats.tolist(), lons.tolist()))
 
     points.append(points[0])  # Close polygon
     return points
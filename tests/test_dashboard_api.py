@@ -0,0 +1,914 @@
+"""
+Tests for the serverless dashboard API helpers (api/index.py)
+"""
+import asyncio
+import gzip
+import http.client
+import io
+import json
+import threading
+from http.server import HTTPServer
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, '.')
+
+from api import index
+
+
+class TestClusterHotspots:
+    """Test suite for dashboard hotspot clustering."""
+
+    def test_empty_input(self):
+        """Test clustering with no hotspots."""
+        assert index.cluster_hotspots([]) == []
+
+    def test_nearby_hotspots_grouped(self, sample_hotspots):
+        """Test nearby hotspots end up in the same cluster."""
+        clusters = index.cluster_hotspots(sample_hotspots)
+
+        assert len(clusters) == 2
+        counts = sorted(c["count"] for c in clusters)
+        assert counts == [1, 2]
+
+    def test_cluster_aggregates(self, sample_hotspots):
+        """Test cluster FRP aggregates and centre."""
+        clusters = index.cluster_hotspots(sample_hotspots)
+        pair = next(c for c in clusters if c["count"] == 2)
+
+        assert pair["total_frp"] == pytest.approx(80.0)
+        assert pair["max_frp"] == pytest.approx(50.0)
+        assert pair["avg_frp"] == pytest.approx(40.0)
+        assert pair["center_lat"] == pytest.approx(-22.505)
+        assert pair["center_lon"] == pytest.approx(-45.505)
+        assert "state" in pair and "biome" in pair
+
+    def test_sorted_by_total_frp(self, sample_hotspots):
+        """Test clusters are returned by descending total FRP."""
+        clusters = index.cluster_hotspots(sample_hotspots)
+        frps = [c["total_frp"] for c in clusters]
+
+        assert frps == sorted(frps, reverse=True)
+
+    def test_neighbours_across_cell_edges(self):
+        """Test hotspots on either side of a grid cell edge are grouped."""
+        hotspots = [
+            {"latitude": -10.0, "longitude": -45.044, "frp": 10.0},
+            {"latitude": -10.0, "longitude": -45.046, "frp": 20.0},
+            {"latitude": -10.001, "longitude": -45.009, "frp": 5.0},
+            {"latitude": -10.0, "longitude": -44.9, "frp": 1.0},
+        ]
+        clusters = index.cluster_hotspots(hotspots)
+
+        assert [c["count"] for c in clusters] == [3, 1]
+        assert clusters[0]["total_frp"] == pytest.approx(35.0)
+
+    def test_seed_radius_not_transitive(self):
+        """Test a chain of hotspots is split at the seed's search radius."""
+        hotspots = [
+            {"latitude": -10.0, "longitude": -45.0 + 0.03 * k, "frp": 1.0}
+            for k in range(4)
+        ]
+        clusters = index.cluster_hotspots(hotspots)
+
+        assert sorted(c["count"] for c in clusters) == [2, 2]
+
+    def test_non_finite_hotspots_are_singletons(self, monkeypatch):
+        """Test hotspots with NaN or infinite coordinates each seed their own cluster."""
+        monkeypatch.setattr(index, "NUMBA_AVAILABLE", False)
+        hotspots = [
+            {"latitude": float("nan"), "longitude": -45.0, "frp": 10.0},
+            {"latitude": float("nan"), "longitude": -45.0, "frp": 20.0},
+            {"latitude": -10.0, "longitude": -45.0, "frp": 5.0},
+            {"latitude": -10.0, "longitude": float("inf"), "frp": 1.0},
+        ]
+        clusters = index.cluster_hotspots(hotspots)
+
+        assert [c["count"] for c in clusters] == [1, 1, 1, 1]
+        assert [c["total_frp"] for c in clusters] == pytest.approx([20.0, 10.0, 5.0, 1.0])
+
+    def test_label_kernel_matches_walk(self, monkeypatch):
+        """Test the compilable label kernel matches the NumPy walk, non-finite rows included."""
+        rng = np.random.default_rng(7)
+        table = {
+            "latitude": (-10.0 + rng.random(300) * 0.4).astype(np.float32),
+            "longitude": (-45.0 + rng.random(300) * 0.4).astype(np.float32),
+            "frp": (rng.random(300) * 50.0).astype(np.float32),
+        }
+        table["latitude"][[3, 4, 150]] = np.nan
+        table["longitude"][[4, 200]] = [np.nan, np.inf]
+        monkeypatch.setattr(index, "NUMBA_AVAILABLE", False)
+        walked = index.cluster_hotspots(table)
+        monkeypatch.setattr(index, "NUMBA_AVAILABLE", True)
+
+        # NaN centres compare unequal as floats, so compare the serialized forms
+        assert json.dumps(index.cluster_hotspots(table)) == json.dumps(walked)
+
+
+class TestRegionLookup:
+    """Test suite for state/biome raster lookup."""
+
+    def test_state_interior_point(self):
+        """Test a point well inside a state."""
+        assert index.get_state(-30.03, -51.23) == "Rio Grande do Sul"
+
+    def test_state_closed_edge(self):
+        """Test points on a rectangle edge still match it."""
+        assert index.get_state(-15.4, -47.8) == index._scan_state(-15.4, -47.8)
+        assert index.get_state(5.5, -60.0) == "Roraima"
+
+    def test_outside_brazil(self):
+        """Test coordinates outside every region."""
+        assert index.get_state(40.0, 10.0) == "Brasil"
+        assert index.get_biome(40.0, 10.0)[0] == "Desconhecido"
+
+    def test_non_finite_coordinates(self):
+        """Test NaN and infinite coordinates match no region instead of raising."""
+        for lat, lon in ((float("nan"), -50.0), (-10.0, float("inf")), (float("-inf"), float("nan"))):
+            assert index.get_state(lat, lon) == "Brasil"
+            assert index.get_biome(lat, lon)[0] == "Desconhecido"
+            assert index.get_states_bulk([lat], [lon]) == ["Brasil"]
+            assert index.get_biomes_bulk([lat], [lon]) == ["Desconhecido"]
+
+    def test_bulk_matches_scalar(self):
+        """Test bulk lookups agree with the scalar helpers."""
+        lats = [-3.12, -15.4, -22.0, -30.03, 40.0]
+        lons = [-60.02, -47.8, -48.0, -51.23, 10.0]
+
+        assert index.get_states_bulk(lats, lons) == [index.get_state(a, o) for a, o in zip(lats, lons)]
+        assert index.get_biomes_bulk(lats, lons) == [index.get_biome(a, o)[0] for a, o in zip(lats, lons)]
+
+    def test_scalar_lookups_memoised(self):
+        """Test repeated exact coordinates are served from the cache."""
+        index.get_state.cache_clear()
+        index.get_state(-12.34, -50.67)
+        index.get_state(-12.34, -50.67)
+
+        assert index.get_state.cache_info().hits == 1
+
+    def test_bulk_grid_line_points(self):
+        """Test bulk lookups on grid lines use the exact edge scan."""
+        lats = [-15.4, 5.5, -10.0, 0.0]
+        lons = [-47.8, -60.0, -56.0, -50.0]
+
+        assert index.get_states_bulk(lats, lons) == [index._scan_state(a, o) for a, o in zip(lats, lons)]
+        assert index.get_biomes_bulk(lats, lons) == [index._scan_biome(a, o)[0] for a, o in zip(lats, lons)]
+
+
+SAMPLE_CSV = (
+    "latitude,longitude,bright_ti4,acq_date,acq_time,satellite,confidence,frp,daynight\n"
+    "-22.50000,-45.50000,350.5,2026-01-27,1430,N20,n,50.0,D\n"
+    "-22.51000,-45.51000,320.0,2026-01-27,1435,N20,h,30.0,D\n"
+    "-23.50000,-46.50000,400.0,2026-01-27,1440,N20,n,75.0,N\n"
+)
+
+
+class TestParseCsvHotspots:
+    """Test suite for FIRMS CSV parsing."""
+
+    def test_parse_well_formed(self):
+        """Test a clean CSV is parsed into a column table."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+
+        assert index.hotspot_count(table) == 3
+        assert index.dequantize(table["latitude"], "latitude").tolist() == [-22.5, -22.51, -23.5]
+        assert index.dequantize(table["frp"], "frp").tolist() == [50.0, 30.0, 75.0]
+        assert table["acq_datetime"][0] == "2026-01-27 1430"
+        assert [table["daynight_labels"][c] for c in table["daynight"]] == ["D", "D", "N"]
+
+    def test_parse_quantized_columns(self):
+        """Test numeric columns are float32 and text columns are label codes."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+
+        assert table["latitude"].dtype == index.np.float32
+        assert table["confidence"].dtype == index.np.uint8
+        assert table["confidence_labels"] == ["n", "h"]
+        assert table["confidence"].tolist() == [0, 1, 0]
+
+    def test_parse_skips_malformed_rows(self):
+        """Test short rows are skipped and blank FRP defaults to zero."""
+        csv_text = SAMPLE_CSV + "-24.0,-47.0\n" + "-24.5,-47.5,310.0,2026-01-27,1500,N20,l,,D\n"
+        records = index.hotspots_to_records(index.parse_csv_hotspots(csv_text))
+
+        assert len(records) == 4
+        assert records[-1]["frp"] == 0.0
+        assert records[-1]["confidence"] == "l"
+
+    def test_parse_header_only(self):
+        """Test a response without data rows."""
+        assert index.hotspot_count(index.parse_csv_hotspots("latitude,longitude\n")) == 0
+
+    def test_records_round_trip(self, sample_hotspots):
+        """Test table/records conversion is lossless."""
+        table = index.hotspots_to_table(sample_hotspots)
+
+        assert index.hotspots_to_records(table) == sample_hotspots
+        assert len(index.hotspots_to_records(table, 2)) == 2
+
+    def test_cluster_accepts_table(self, sample_hotspots):
+        """Test clustering a column table matches clustering records."""
+        table = index.hotspots_to_table(sample_hotspots)
+
+        assert index.cluster_hotspots(table) == index.cluster_hotspots(sample_hotspots)
+
+
+class TestMapClusters:
+    """Test suite for viewport map clustering."""
+
+    def test_low_zoom_groups_everything(self):
+        """Test nearby hotspots share one cluster feature at country zoom."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        result = index.map_clusters(table, -74, -34, -34, 5, 4)
+
+        assert result["total_hotspots"] == 3
+        assert len(result["features"]) == 1
+        props = result["features"][0]["properties"]
+        assert props["cluster"] is True
+        assert props["point_count"] == 3
+        assert props["max_frp"] == 75.0
+        assert result["features"][0]["bbox"] == [-46.5, -23.5, -45.5, -22.5]
+
+    def test_singletons_carry_records(self):
+        """Test a hotspot alone in its cell comes back as its record."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        features = index.map_clusters(table, -74, -34, -34, 5, 8)["features"]
+
+        points = [f for f in features if not f["properties"].get("cluster")]
+        clusters = [f for f in features if f["properties"].get("cluster")]
+        assert [p["properties"] for p in points] == index.hotspots_to_records(table)[2:]
+        assert points[0]["geometry"]["coordinates"] == [-46.5, -23.5]
+        assert [c["properties"]["point_count"] for c in clusters] == [2]
+
+    def test_past_max_zoom_unclustered(self):
+        """Test every hotspot is its own feature past the max zoom."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        result = index.map_clusters(table, -74, -34, -34, 5, index.MAP_CLUSTER_MAX_ZOOM + 3)
+
+        assert result["zoom"] == index.MAP_CLUSTER_MAX_ZOOM + 1
+        assert [f["properties"] for f in result["features"]] == index.hotspots_to_records(table)
+
+    def test_viewport_filter(self):
+        """Test hotspots outside the viewport are left out."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        result = index.map_clusters(table, -46, -23, -45, -22, 4)
+
+        assert result["total_hotspots"] == 2
+        assert result["features"][0]["properties"]["point_count"] == 2
+
+
+class TestRiskIndex:
+    """Test suite for the fire risk index."""
+
+    def test_bulk_matches_scalar(self):
+        """Test bulk risk indices agree with the scalar helper."""
+        temps = [15, 20, 25, 32.5, 45, 60]
+        humids = [90, 100, 50, 35, 5, 0]
+        winds = [0, 0, 10, 20, 80, 100]
+        days = [0, 1, 3, 10, 40, 30]
+
+        bulk = index.calculate_risk_index_bulk(temps, humids, winds, days)
+        scalar = [index.calculate_risk_index(*args) for args in zip(temps, humids, winds, days)]
+
+        assert [round(r, 1) for r in bulk.tolist()] == scalar
+
+    def test_bulk_broadcasts(self):
+        """Test scalar inputs broadcast against arrays."""
+        bulk = index.calculate_risk_index_bulk([25, 35], 40, 12, 5)
+
+        assert [round(r, 1) for r in bulk.tolist()] == [index.calculate_risk_index(t, 40, 12, 5) for t in (25, 35)]
+
+
+class TestPredictFirePerimeter:
+    """Test suite for perimeter prediction."""
+
+    def test_hourly_growth(self):
+        """Test one prediction per hour with growing area."""
+        predictions = index.predict_fire_perimeter(-22.5, -45.5, 50, 90, hours=6)
+
+        assert [p["hour"] for p in predictions] == [1, 2, 3, 4, 5, 6]
+        areas = [p["area_ha"] for p in predictions]
+        assert areas == sorted(areas)
+        assert areas[0] == pytest.approx(50 * 1.17, abs=0.05)
+
+    def test_wind_pushes_centre(self):
+        """Test an easterly wind direction moves the centre east."""
+        predictions = index.predict_fire_perimeter(-22.5, -45.5, 50, 90, hours=3)
+
+        assert all(p["center_lon"] > -45.5 for p in predictions)
+        assert all(p["center_lat"] == pytest.approx(-22.5, abs=1e-6) for p in predictions)
+
+    def test_batch_matches_scalar(self):
+        """Test batch prediction rows agree with single-fire predictions."""
+        batch = index.predict_fire_perimeter_batch([-22.5, -10.0], [-45.5, -60.0], [50, 300], [90, 200], hours=4)
+
+        assert batch["area_ha"].shape == (2, 4)
+        single = index.predict_fire_perimeter(-10.0, -60.0, 300, 200, hours=4)
+        assert batch["area_ha"][1].tolist() == pytest.approx([p["area_ha"] for p in single], abs=0.05)
+        assert batch["center_lon"][1].tolist() == pytest.approx([p["center_lon"] for p in single], abs=1e-6)
+
+
+class TestTTLCache:
+    """Test suite for the upstream response cache."""
+
+    def test_get_and_set(self):
+        """Test stored values are returned until they expire."""
+        cache = index.TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_expiry(self, monkeypatch):
+        """Test entries are dropped after the TTL."""
+        now = [1000.0]
+        monkeypatch.setattr(index.time, "monotonic", lambda: now[0])
+        cache = index.TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+
+        now[0] += 61
+        assert cache.get("a") is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = index.TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_byte_budget(self):
+        """Test entries are evicted to stay under the byte budget."""
+        cache = index.TTLCache(maxsize=10, ttl=60, max_bytes=100)
+        cache.set("a", 1, size=60)
+        cache.set("b", 2, size=60)
+        cache.set("huge", 3, size=500)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("huge") is None
+
+    def test_fetch_weather_uses_cache(self, monkeypatch):
+        """Test repeated nearby weather lookups hit the cache."""
+        calls = []
+
+        def fake_http_get(url, timeout, limit=None):
+            calls.append(url)
+            return b'{"current": {"temperature_2m": 31}}'
+
+        monkeypatch.setattr(index, "http_get", fake_http_get)
+        index._weather_cache.clear()
+
+        first, _ = index.fetch_weather(-22.0001, -48.0001)
+        second, _ = index.fetch_weather(-22.0002, -48.0002)
+
+        assert first["temperature"] == second["temperature"] == 31
+        assert len(calls) == 1
+        index._weather_cache.clear()
+
+    def test_concurrent_misses_fetch_once(self, monkeypatch):
+        """Test simultaneous misses on one cell share a single upstream fetch."""
+        calls = []
+        release = threading.Event()
+
+        def fake_http_get(url, timeout, limit=None):
+            calls.append(url)
+            release.wait(5)
+            return b'{"current": {"temperature_2m": 31}}'
+
+        monkeypatch.setattr(index, "http_get", fake_http_get)
+        index._weather_cache.clear()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(index.fetch_weather(-22.0, -48.0)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert [w["temperature"] for w, _ in results] == [31] * 4
+        assert not index._weather_cache._loading
+        index._weather_cache.clear()
+
+
+def run_asgi(path, method="GET", query=b"", headers=()):
+    """Drive the ASGI app for one request and collect what it sends."""
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": list(headers)}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(index.app(scope, receive, send))
+    return sent[0], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+class TestRouting:
+    """Test suite for transport-independent routing and the ASGI app."""
+
+    def test_route_health(self):
+        """Test the health endpoint through the router."""
+        status, headers, body = index.route_request("/api/health", {})
+
+        assert status == 200
+        assert ("Access-Control-Allow-Origin", "*") in headers
+        assert json.loads(body)["status"] == "healthy"
+
+    def test_route_not_found(self):
+        """Test unknown paths return 404."""
+        status, _, body = index.route_request("/nope", {})
+
+        assert status == 404
+        assert json.loads(body) == {"error": "Not found"}
+
+    def test_asgi_matches_router(self):
+        """Test the ASGI app serves the same response as the router."""
+        start, body = run_asgi("/api/evacuation", query=b"lat=-10&lon=-50&radius=5")
+        status, _, expected = index.route_request("/api/evacuation", {"lat": ["-10"], "lon": ["-50"], "radius": ["5"]})
+
+        assert start["status"] == status == 200
+        assert (b"content-length", str(len(body)).encode()) in start["headers"]
+        assert body == expected
+
+    def test_dashboard_cached_bytes(self):
+        """Test the dashboard is served from the pre-encoded page with an ETag."""
+        status, headers, body = index.route_request("/", {})
+
+        assert status == 200
+        assert body is index.DASHBOARD_PAGE
+        assert ("ETag", index.DASHBOARD_ETAG) in headers
+        assert "stale-while-revalidate" in dict(headers)["Cache-Control"]
+
+    def test_dashboard_not_modified(self):
+        """Test a matching If-None-Match gets an empty 304."""
+        status, headers, body = index.route_request("/", {}, {"if-none-match": index.DASHBOARD_ETAG})
+
+        assert status == 304
+        assert body == b""
+        assert ("ETag", index.DASHBOARD_ETAG) in headers
+
+    def test_dashboard_stale_etag(self):
+        """Test a different ETag gets the full page."""
+        status, _, body = index.route_request("/", {}, {"if-none-match": '"stale"'})
+
+        assert status == 200
+        assert body == index.DASHBOARD_PAGE
+
+    def test_dashboard_gzip(self):
+        """Test gzip-capable clients get the pre-compressed page."""
+        status, headers, body = index.route_request("/", {}, {"accept-encoding": "gzip, deflate"})
+
+        assert status == 200
+        assert ("Content-Encoding", "gzip") in headers
+        assert ("Vary", "Accept-Encoding") in headers
+        assert gzip.decompress(body) == index.DASHBOARD_PAGE
+        assert dict(headers)["ETag"] != index.DASHBOARD_ETAG
+
+    def test_dashboard_zstd(self):
+        """Test zstd is preferred when the client accepts it."""
+        zstandard = pytest.importorskip("zstandard")
+        status, headers, body = index.route_request("/", {}, {"accept-encoding": "gzip, br, zstd"})
+
+        assert ("Content-Encoding", "zstd") in headers
+        assert zstandard.ZstdDecompressor().decompress(body) == index.DASHBOARD_PAGE
+
+    def test_dashboard_refused_encoding(self):
+        """Test q=0 codings are not used."""
+        status, headers, body = index.route_request("/", {}, {"accept-encoding": "gzip;q=0, br;q=0"})
+
+        assert "Content-Encoding" not in dict(headers)
+        assert body == index.DASHBOARD_PAGE
+
+    def test_dashboard_stylesheet(self):
+        """Test the stylesheet is linked by content hash and served immutable."""
+        assert index.DASHBOARD_CSS_PATH.encode() in index.DASHBOARD_PAGE
+        assert b"<style>" not in index.DASHBOARD_PAGE
+
+        status, headers, body = index.route_request(index.DASHBOARD_CSS_PATH, {})
+
+        assert status == 200
+        assert dict(headers)["Content-Type"].startswith("text/css")
+        assert "immutable" in dict(headers)["Cache-Control"]
+        assert body == index.DASHBOARD_CSS
+        assert len(body) < len(index.get_dashboard_css())
+
+    def test_dashboard_script_module(self):
+        """Test the page script is preloaded and served as an immutable module."""
+        path = index.DASHBOARD_JS_PATH.encode()
+        assert b'<link rel="modulepreload" href="' + path in index.DASHBOARD_PAGE
+        assert b'<script type="module" src="' + path in index.DASHBOARD_PAGE
+
+        status, headers, body = index.route_request(index.DASHBOARD_JS_PATH, {})
+
+        assert status == 200
+        assert dict(headers)["Content-Type"].startswith("text/javascript")
+        assert "immutable" in dict(headers)["Cache-Control"]
+        assert body == index.DASHBOARD_JS
+
+    def test_heat_worker_script(self):
+        """Test the heat map worker is linked from the page and served immutable."""
+        assert b'data-heat-worker="' + index.HEAT_WORKER_JS_PATH.encode() in index.DASHBOARD_PAGE
+
+        status, headers, body = index.route_request(index.HEAT_WORKER_JS_PATH, {})
+
+        assert status == 200
+        assert dict(headers)["Content-Type"].startswith("text/javascript")
+        assert "immutable" in dict(headers)["Cache-Control"]
+        assert body == index.HEAT_WORKER_JS
+
+    def test_dashboard_tab_fragments(self):
+        """Test hidden tabs are left out of the page and served on their own."""
+        assert b'id="riskValue"' not in index.DASHBOARD_PAGE
+        assert b'data-src="/dashboard/tab/analysis"' in index.DASHBOARD_PAGE
+
+        status, headers, body = index.route_request("/dashboard/tab/analysis", {})
+
+        assert status == 200
+        assert dict(headers)["Content-Type"].startswith("text/html")
+        assert b'id="riskValue"' in body
+
+        status, _, _ = index.route_request("/dashboard/tab/unknown", {})
+        assert status == 404
+
+    def test_stat_grids_rendered(self):
+        """Test generated stat boxes are spliced into the page and tabs."""
+        assert b'<div class="stat-value" id="totalFires">-</div>' in index.DASHBOARD_PAGE
+        assert b"$" not in index.DASHBOARD_PAGE
+        assert 'id="alertsActive">0<' in index.get_dashboard_tab("alerts")
+        assert '<div class="stat-box full">' in index.get_dashboard_tab("analysis")
+
+    def test_filter_schema(self):
+        """Test select options come from the cached filter schema."""
+        assert b'<option value="saopaulo"' not in index.DASHBOARD_PAGE
+        assert b'data-schema="regions"' in index.DASHBOARD_PAGE
+
+        status, headers, body = index.route_request("/api/schema/filters", {})
+        schema = json.loads(body)
+
+        assert status == 200
+        assert "stale-while-revalidate" in dict(headers)["Cache-Control"]
+        assert schema["regions"]["default"] in [o["value"] for o in schema["regions"]["options"]]
+        assert {"west", "south", "east", "north", "center", "zoom"} <= set(schema["regions"]["options"][0])
+
+    def test_minify_css_fallback(self):
+        """Test the stdlib CSS minifier keeps strings and drops comments."""
+        css = """/* Header */
+        .a > .b ,  .c {
+            font-family: 'Segoe  UI', sans-serif;
+            color: red !important;
+        }"""
+
+        assert index._minify_css_fallback(css) == ".a>.b,.c{font-family:'Segoe  UI',sans-serif;color:red!important}"
+
+    def test_vendor_css_loader(self, tmp_path, monkeypatch):
+        """Test the bundled vendor stylesheet is optional."""
+        bundle = tmp_path / "vendor.css"
+        monkeypatch.setattr(index, "VENDOR_CSS_FILE", str(bundle))
+        assert index._load_vendor_css() is None
+
+        bundle.write_bytes(b".leaflet-pane { z-index: 400; }")
+        assert index._load_vendor_css() == b".leaflet-pane { z-index: 400; }"
+
+    def test_vendor_css_linked(self):
+        """Test the page links either the bundle or the CDN stylesheets."""
+        if index.VENDOR_CSS_PATH:
+            assert index.VENDOR_CSS_PATH.encode() in index.DASHBOARD_PAGE
+            assert index.route_request(index.VENDOR_CSS_PATH, {})[0] == 200
+        else:
+            assert b"unpkg.com/leaflet@1.9.4/dist/leaflet.css" in index.DASHBOARD_PAGE
+
+    def test_asgi_not_modified(self):
+        """Test the ASGI app passes request headers and omits Content-Length on 304."""
+        start, body = run_asgi("/dashboard", headers=[(b"if-none-match", index.DASHBOARD_ETAG.encode())])
+
+        assert start["status"] == 304
+        assert body == b""
+        assert not any(name == b"content-length" for name, _ in start["headers"])
+
+    def test_asgi_rejects_post(self):
+        """Test non-GET requests are refused."""
+        start, _ = run_asgi("/api/health", method="POST")
+
+        assert start["status"] == 405
+
+    def test_asgi_head(self):
+        """Test HEAD sends the GET headers, including length, without a body."""
+        start, body = run_asgi("/", method="HEAD")
+        headers = dict(start["headers"])
+
+        assert start["status"] == 200
+        assert headers[b"content-length"] == str(len(index.DASHBOARD_PAGE)).encode()
+        assert body == b""
+
+    def test_handler_head(self):
+        """Test the serverless handler answers HEAD without a body."""
+        server = HTTPServer(("127.0.0.1", 0), index.handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("HEAD", "/api/health")
+            response = conn.getresponse()
+
+            assert response.status == 200
+            assert int(response.getheader("Content-Length")) > 0
+            assert response.read() == b""
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_handler_single_write(self):
+        """Test the handler sends headers and a small body in one write."""
+        writes = []
+
+        class CountingHandler(index.handler):
+            def setup(self):
+                super().setup()
+                raw = self.wfile
+
+                class Writer:
+                    def write(self, data):
+                        writes.append(bytes(data))
+                        return raw.write(data)
+
+                    def flush(self):
+                        raw.flush()
+
+                self.wfile = Writer()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), CountingHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", "/api/health")
+            response = conn.getresponse()
+            body = response.read()
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response.status == 200
+        assert json.loads(body)["status"]
+        assert len(writes) == 1
+        assert writes[0].endswith(body)
+
+    def test_dashboard_bundle_matches_endpoints(self, monkeypatch):
+        """Test /api/dashboard returns the same payloads as the single endpoints."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        weather = {"temperature": 33, "humidity": 30, "wind_speed": 15, "wind_direction": 90, "precipitation": 0}
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (table, None))
+        monkeypatch.setattr(index, "fetch_weather", lambda lat, lon: (dict(weather), None))
+
+        region = {"days": ["2"], "lat": ["-22"], "lon": ["-45"], "days_without_rain": ["7"]}
+        status, _, body = index.route_request("/api/dashboard", region)
+        bundle = json.loads(body)
+
+        assert status == 200
+        for key, path in (("hotspots", "/api/hotspots"), ("clusters", "/api/clusters"),
+                          ("weather", "/api/weather"), ("risk", "/api/risk")):
+            assert bundle[key] == json.loads(index.route_request(path, region)[2])
+        area = str(bundle["clusters"]["total_area"])
+        emissions = index.route_request("/api/emissions", dict(region, area=[area]))[2]
+        assert bundle["emissions"] == json.loads(emissions)
+
+    def test_dashboard_bundle_not_modified(self, monkeypatch):
+        """Test an unchanged bundle revalidates as a header-only 304."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        weather = {"temperature": 33, "humidity": 30, "wind_speed": 15, "wind_direction": 90, "precipitation": 0}
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (table, None))
+        monkeypatch.setattr(index, "fetch_weather", lambda lat, lon: (dict(weather), None))
+
+        status, headers, _ = index.route_request("/api/dashboard", {})
+        etag = dict(headers)["ETag"]
+        assert dict(headers)["Cache-Control"] == "no-cache"
+
+        status, headers, body = index.route_request("/api/dashboard", {}, {"if-none-match": etag})
+        assert status == 304
+        assert body == b""
+        assert ("ETag", etag) in headers
+
+        weather["temperature"] = 34
+        status, _, _ = index.route_request("/api/dashboard", {}, {"if-none-match": etag})
+        assert status == 200
+
+    def test_dashboard_bundle_upstream_error(self, monkeypatch):
+        """Test a failed hotspot fetch fails the whole bundle."""
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (None, "FIRMS down"))
+        monkeypatch.setattr(index, "fetch_weather", lambda lat, lon: ({}, None))
+
+        status, _, body = index.route_request("/api/dashboard", {})
+
+        assert status == 500
+        assert json.loads(body) == {"error": "FIRMS down"}
+
+    def test_map_clusters_route(self, monkeypatch):
+        """Test the map cluster endpoint clusters the viewport and revalidates by ETag."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (table, None))
+
+        query = {"bbox": ["-46,-23,-45,-22"], "zoom": ["4"]}
+        status, headers, body = index.route_request("/api/hotspots/clusters", query)
+        assert status == 200
+        assert json.loads(body) == json.loads(index.dumps_json(index.map_clusters(table, -46, -23, -45, -22, 4)))
+
+        etag = dict(headers)["ETag"]
+        status, _, body = index.route_request("/api/hotspots/clusters", query, {"if-none-match": etag})
+        assert (status, body) == (304, b"")
+
+        assert index.route_request("/api/hotspots/clusters", {"bbox": ["1,2"]})[0] == 400
+
+    def test_hotspots_binary(self, monkeypatch):
+        """Test /api/hotspots.bin packs every hotspot into fixed-size records."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (table, None))
+
+        status, headers, body = index.route_request("/api/hotspots.bin", {})
+        records = index.np.frombuffer(body, dtype=index.HOTSPOT_RECORD_DTYPE)
+
+        assert status == 200
+        assert dict(headers)["Content-Type"] == "application/octet-stream"
+        assert index.HOTSPOT_RECORD_DTYPE.itemsize == 22
+        assert records["latitude"].tolist() == table["latitude"].tolist()
+        assert records["frp"].tolist() == table["frp"].tolist()
+        labels = dict(headers)["X-Daynight-Labels"].split(",")
+        assert [labels[c] for c in records["daynight"]] == ["D", "D", "N"]
+        # 2026-01-27 14:30 UTC
+        assert int(records["acq_time"][0]) == 1769524200
+
+        etag = dict(headers)["ETag"]
+        status, _, body = index.route_request("/api/hotspots.bin", {}, {"if-none-match": etag})
+        assert (status, body) == (304, b"")
+
+    def test_dashboard_bundle_without_records(self, monkeypatch):
+        """Test records=0 drops the hotspot list but keeps the count."""
+        table = index.parse_csv_hotspots(SAMPLE_CSV)
+        monkeypatch.setattr(index, "fetch_hotspots", lambda *args: (table, None))
+        monkeypatch.setattr(index, "fetch_weather", lambda lat, lon: ({"temperature": 30, "humidity": 40, "wind_speed": 10}, None))
+
+        bundle = json.loads(index.route_request("/api/dashboard", {"records": ["0"]})[2])
+
+        assert bundle["hotspots"]["count"] == 3
+        assert bundle["hotspots"]["hotspots"] == []
+
+    def test_emissions_cacheable(self):
+        """Test emissions are publicly cacheable and revalidate by ETag."""
+        query = {"lat": ["-3.1"], "lon": ["-60"], "area": ["250"]}
+        status, headers, body = index.route_request("/api/emissions", query)
+
+        assert status == 200
+        assert dict(headers)["Cache-Control"] == index.EMISSIONS_CACHE_CONTROL
+        assert json.loads(body) == json.loads(index.dumps_json(index.emissions_payload(-3.1, -60, 250)))
+
+        etag = dict(headers)["ETag"]
+        status, _, body = index.route_request("/api/emissions", query, {"if-none-match": etag})
+        assert (status, body) == (304, b"")
+
+    def test_dynamic_json_compressed(self, monkeypatch):
+        """Test large JSON responses are compressed when the client accepts it."""
+        monkeypatch.setattr(index, "DYNAMIC_COMPRESS_MIN_BYTES", 64)
+        monkeypatch.setattr(index, "DYNAMIC_ENCODINGS", index.DYNAMIC_ENCODINGS[-1:])
+        query = {"lat": ["-10"], "lon": ["-50"], "radius": ["5"]}
+        _, headers, identity = index.route_request("/api/evacuation", query)
+        status, headers, body = index.route_request("/api/evacuation", query, {"accept-encoding": "gzip"})
+
+        assert status == 200
+        assert dict(headers)["Content-Encoding"] == "gzip"
+        assert dict(headers)["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(body) == identity
+
+    def test_small_json_not_compressed(self):
+        """Test responses under the threshold are sent as-is."""
+        status, headers, body = index.route_request("/api/health", {}, {"accept-encoding": "gzip"})
+
+        assert len(body) < index.DYNAMIC_COMPRESS_MIN_BYTES
+        assert "Content-Encoding" not in dict(headers)
+        assert json.loads(body)["status"] == "healthy"
+
+    def test_dynamic_json_weak_etag(self, monkeypatch):
+        """Test compressed conditional responses revalidate with their weak ETag."""
+        monkeypatch.setattr(index, "DYNAMIC_COMPRESS_MIN_BYTES", 64)
+        query = {"lat": ["-3.1"], "lon": ["-60"], "area": ["250"]}
+        accept = {"accept-encoding": "gzip, br, zstd"}
+        _, headers, _ = index.route_request("/api/emissions", query, accept)
+        etag = dict(headers)["ETag"]
+        status, not_modified, body = index.route_request("/api/emissions", query, dict(accept, **{"if-none-match": etag}))
+
+        assert "Content-Encoding" in dict(headers)
+        assert etag.startswith("W/")
+        assert (status, body) == (304, b"")
+        assert dict(not_modified)["ETag"] == etag
+        assert dict(not_modified)["Vary"] == dict(headers)["Vary"] == "Accept-Encoding"
+        assert "Content-Encoding" not in dict(not_modified)
+
+    def test_location_cacheable(self, monkeypatch):
+        """Test location details are cached no longer than the weather they embed."""
+        weather = {"temperature": 33, "humidity": 30, "wind_speed": 15, "wind_direction": 90, "precipitation": 0}
+        monkeypatch.setattr(index, "fetch_weather", lambda lat, lon: (dict(weather), None))
+
+        status, headers, _ = index.route_request("/api/location", {"lat": ["-15.8"], "lon": ["-47.9"]})
+
+        assert status == 200
+        assert "max-age={}".format(index.WEATHER_CACHE_TTL) in dict(headers)["Cache-Control"]
+        assert "ETag" in dict(headers)
+
+    def test_json_numpy_values(self, monkeypatch):
+        """Test NumPy values serialize with and without orjson."""
+        payload = {"values": index.np.arange(3), "total": index.np.float64(1.5)}
+
+        for available in (index.ORJSON_AVAILABLE, False):
+            monkeypatch.setattr(index, "ORJSON_AVAILABLE", available)
+            assert json.loads(index.dumps_json(payload)) == {"values": [0, 1, 2], "total": 1.5}
+
+
+class TestReadBody:
+    """Test suite for upstream body reads."""
+
+    class FakeResponse:
+        def __init__(self, data, headers):
+            self.stream = io.BytesIO(data)
+            self.headers = headers
+
+        def read(self, amt=None):
+            return self.stream.read(amt)
+
+        def readinto(self, buf):
+            return self.stream.readinto(buf)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+    def test_known_length_read_into_buffer(self):
+        """Test a Content-Length body is read into one buffer."""
+        response = self.FakeResponse(b"latitude,longitude\n", {"Content-Length": "19"})
+
+        assert index._read_body(response, 100) == b"latitude,longitude\n"
+
+    def test_unknown_length_capped(self):
+        """Test bodies without Content-Length are capped at the limit."""
+        response = self.FakeResponse(b"x" * 50, {})
+
+        assert len(index._read_body(response, 10)) == 10
+
+    def test_oversized_length_capped(self):
+        """Test a Content-Length above the limit is not trusted."""
+        response = self.FakeResponse(b"x" * 50, {"Content-Length": "50"})
+
+        assert len(index._read_body(response, 10)) == 10
+
+
+class TestHttpGet:
+    """Test suite for the shared upstream HTTP client."""
+
+    def test_pooled_client_caps_body(self, monkeypatch):
+        """Test the pooled client returns the body up to the limit."""
+        httpx = pytest.importorskip("httpx")
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 50))
+        monkeypatch.setattr(index, "_http_client", httpx.Client(transport=transport))
+
+        assert index.http_get("https://example.test/a", 5) == b"x" * 50
+        assert index.http_get("https://example.test/a", 5, limit=10) == b"x" * 10
+
+    def test_pooled_client_raises_on_error_status(self, monkeypatch):
+        """Test HTTP error statuses raise like urlopen does."""
+        httpx = pytest.importorskip("httpx")
+        transport = httpx.MockTransport(lambda request: httpx.Response(429, content=b"slow down"))
+        monkeypatch.setattr(index, "_http_client", httpx.Client(transport=transport))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            index.http_get("https://example.test/a", 5)
+
+    def test_urlopen_fallback(self, monkeypatch):
+        """Test requests fall back to urlopen without httpx."""
+        seen = []
+
+        def fake_urlopen(req, timeout=None):
+            seen.append(req.get_header("User-agent"))
+            return TestReadBody.FakeResponse(b"latitude\n", {})
+
+        monkeypatch.setattr(index, "_http_client", None)
+        monkeypatch.setattr(index, "urlopen", fake_urlopen)
+
+        assert index.http_get("https://example.test/a", 5) == b"latitude\n"
+        assert seen == [index.USER_AGENT]
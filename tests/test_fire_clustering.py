@@ -0,0 +1,87 @@
+"""
+Tests for hotspot clustering (src/analysis/fire_clustering.py)
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+import sys
+sys.path.insert(0, '.')
+
+from src.analysis.fire_clustering import (
+    _HotspotArrays,
+    _find_neighbors,
+    cluster_hotspots,
+)
+
+
+# Longitude steps along the equator: 0.03 deg is about 3.3 km, 0.06 deg about
+# 6.7 km, so with a 5 km threshold points 0-1-2 form a chain in which 0 and 2
+# are only joined through 1, and point 3 is isolated noise
+POINTS = [
+    (0.0, 0.00),
+    (0.0, 0.03),
+    (0.0, 0.06),
+    (0.0, 1.00),
+    (0.5, 0.50),
+    (0.5, 0.52),
+]
+
+
+def make_hotspots(points):
+    return [
+        SimpleNamespace(latitude=lat, longitude=lon, frp=10.0, confidence="n", datetime=None)
+        for lat, lon in points
+    ]
+
+
+def cluster_labels(clusters, hotspots):
+    """Map each hotspot's position to the id of the cluster holding it."""
+    labels = {}
+    for cluster in clusters:
+        for hotspot in cluster.hotspots:
+            labels[hotspots.index(hotspot)] = cluster.cluster_id
+    return [labels[i] for i in range(len(hotspots))]
+
+
+class TestFindNeighbors:
+    """Test suite for the vectorized neighbour search."""
+
+    def test_direct_neighbours_only(self):
+        """Test neighbours are the points within the threshold, self included."""
+        points = _HotspotArrays(make_hotspots(POINTS), with_times=False)
+
+        assert _find_neighbors(points, 0, 5.0, None).tolist() == [0, 1]
+        assert _find_neighbors(points, 1, 5.0, None).tolist() == [0, 1, 2]
+        assert _find_neighbors(points, 3, 5.0, None).tolist() == [3]
+        assert _find_neighbors(points, 4, 5.0, None).tolist() == [4, 5]
+
+    def test_time_threshold(self):
+        """Test the time window excludes spatial neighbours detected too far apart."""
+        hotspots = make_hotspots(POINTS[:3])
+        points = _HotspotArrays(hotspots, with_times=False)
+        points.hours = np.array([0.0, 1.0, 10.0])
+
+        assert _find_neighbors(points, 1, 5.0, 2.0).tolist() == [0, 1]
+
+
+class TestClusterHotspots:
+    """Test suite for DBSCAN-like clustering."""
+
+    def test_pinned_labels(self):
+        """Test labels on a fixed point set with a chain and a noise point."""
+        hotspots = make_hotspots(POINTS)
+        clusters = cluster_hotspots(hotspots, distance_threshold_km=5.0)
+
+        assert cluster_labels(clusters, hotspots) == [
+            "FIRE-0001", "FIRE-0001", "FIRE-0001", "FIRE-0002", "FIRE-0003", "FIRE-0003",
+        ]
+        assert [c.hotspot_count for c in clusters] == [3, 2, 1]
+
+    def test_chain_joins_transitively(self):
+        """Test a chain longer than the threshold ends up in one cluster."""
+        hotspots = make_hotspots([(0.0, 0.03 * k) for k in range(6)])
+        clusters = cluster_hotspots(hotspots, distance_threshold_km=5.0)
+
+        assert len(clusters) == 1
+        assert clusters[0].hotspot_count == 6
@@ -0,0 +1,109 @@
+"""
+Tests for FIRMS CSV parsing (src/ingestion/firms_client.py)
+"""
+import csv
+from io import StringIO
+
+import pytest
+
+import sys
+sys.path.insert(0, '.')
+
+from src.ingestion.firms_client import FIRMSClient, FireHotspot
+
+
+VIIRS_HEADER = "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight\n"
+MODIS_HEADER = "latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_t31,frp,daynight\n"
+
+VIIRS_ROWS = (
+    "-22.50000,-45.50000,350.5,0.39,0.36,2026-01-27,0430,N20,VIIRS,n,2.0NRT,290.1,50.0,D\n"
+    "-22.51000,-45.51000,320.0,0.40,0.37,2026-01-27,1435,N20,VIIRS,h,2.0NRT,288.0,30.0,N\n"
+)
+
+
+def dict_reader_hotspots(csv_text):
+    """Row-by-row csv.DictReader parse that _parse_csv replaced."""
+    hotspots = []
+    for row in csv.DictReader(StringIO(csv_text)):
+        try:
+            hotspots.append(FireHotspot(
+                latitude=float(row["latitude"]),
+                longitude=float(row["longitude"]),
+                brightness=float(row.get("bright_ti4", row.get("brightness", 0))),
+                scan=float(row["scan"]),
+                track=float(row["track"]),
+                acq_date=row["acq_date"],
+                acq_time=row["acq_time"],
+                satellite=row["satellite"],
+                instrument=row["instrument"],
+                confidence=row["confidence"],
+                version=row["version"],
+                bright_t31=float(row.get("bright_ti5", row.get("bright_t31", 0))),
+                frp=float(row["frp"]),
+                daynight=row["daynight"],
+            ))
+        except (KeyError, ValueError):
+            continue
+    return hotspots
+
+
+class TestParseCsv:
+    """Test suite for the pandas FIRMS CSV parser."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client = FIRMSClient(api_key="test_api_key")
+
+    def teardown_method(self):
+        """Close the HTTP client."""
+        self.client.__exit__()
+
+    def assert_matches_dict_reader(self, csv_text):
+        parsed = self.client._parse_csv(csv_text)
+        expected = dict_reader_hotspots(csv_text)
+
+        assert parsed == expected
+        for hotspot in parsed:
+            assert all(type(v) is float for v in (hotspot.latitude, hotspot.frp, hotspot.bright_t31))
+            assert type(hotspot.acq_time) is str
+        return parsed
+
+    def test_viirs_rows(self):
+        """Test VIIRS rows match the DictReader parse, leading zeros included."""
+        parsed = self.assert_matches_dict_reader(VIIRS_HEADER + VIIRS_ROWS)
+
+        assert len(parsed) == 2
+        assert parsed[0].acq_time == "0430"
+        assert parsed[0].brightness == pytest.approx(350.5)
+        assert parsed[1].bright_t31 == pytest.approx(288.0)
+
+    def test_modis_columns(self):
+        """Test MODIS brightness column names are picked up."""
+        parsed = self.assert_matches_dict_reader(MODIS_HEADER + VIIRS_ROWS)
+
+        assert parsed[0].brightness == pytest.approx(350.5)
+
+    def test_empty_input(self):
+        """Test empty and blank responses."""
+        assert self.assert_matches_dict_reader("") == []
+        assert self.assert_matches_dict_reader("\n  \n") == []
+
+    def test_header_only(self):
+        """Test a response without data rows."""
+        assert self.assert_matches_dict_reader(VIIRS_HEADER) == []
+
+    def test_missing_columns(self):
+        """Test rows without the required columns are all dropped."""
+        assert self.assert_matches_dict_reader("latitude,longitude\n-22.5,-45.5\n") == []
+
+    def test_malformed_numeric_fields(self):
+        """Test rows with non-numeric or blank numbers are dropped."""
+        csv_text = (
+            VIIRS_HEADER
+            + "abc,-45.50000,350.5,0.39,0.36,2026-01-27,1430,N20,VIIRS,n,2.0NRT,290.1,50.0,D\n"
+            + VIIRS_ROWS
+            + "-23.0,-46.0,350.5,0.39,0.36,2026-01-27,1500,N20,VIIRS,l,2.0NRT,290.1,,D\n"
+        )
+        parsed = self.assert_matches_dict_reader(csv_text)
+
+        assert [h.acq_time for h in parsed] == ["0430", "1435"]
@@ -0,0 +1,75 @@
+"""
+Tests for geodesic helpers (src/core/geo_utils.py) and fire-shape polygons
+"""
+import math
+
+import numpy as np
+import pytest
+
+import sys
+sys.path.insert(0, '.')
+
+from src.core.geo_utils import (
+    calculate_polygon_area,
+    create_buffer_polygon,
+    destination_point,
+    destination_points,
+    haversine_distance,
+)
+from src.prediction.propagation_model import _create_elliptical_polygon
+
+
+class TestDestinationPoints:
+    """Test suite for the vectorized destination point."""
+
+    @pytest.mark.parametrize("lat,lon", [(-22.5, -45.5), (0.0, 0.0), (-89.0, 179.9), (60.0, -170.0)])
+    def test_matches_scalar(self, lat, lon):
+        """Test every distance/bearing pair agrees with destination_point."""
+        distances = np.array([0.0, 0.05, 1.0, 25.0, 500.0, 5000.0])
+        bearings = np.array([-90.0, 0.0, 45.0, 90.0, 180.0, 270.0, 359.9, 725.0])
+        dist_grid, bearing_grid = np.meshgrid(distances, bearings)
+
+        lats, lons = destination_points(lat, lon, dist_grid, bearing_grid)
+
+        assert lats.shape == dist_grid.shape
+        for d, b, got_lat, got_lon in zip(dist_grid.ravel(), bearing_grid.ravel(), lats.ravel(), lons.ravel()):
+            want_lat, want_lon = destination_point(lat, lon, d, b)
+            assert got_lat == pytest.approx(want_lat, abs=1e-12)
+            assert got_lon == pytest.approx(want_lon, abs=1e-12)
+
+    def test_scalar_distance_broadcasts(self):
+        """Test one distance is applied to every bearing."""
+        lats, lons = destination_points(-10.0, -50.0, 3.0, np.array([0.0, 120.0, 240.0]))
+
+        assert lats.tolist() == pytest.approx([destination_point(-10.0, -50.0, 3.0, b)[0] for b in (0.0, 120.0, 240.0)], abs=1e-12)
+        assert lons.tolist() == pytest.approx([destination_point(-10.0, -50.0, 3.0, b)[1] for b in (0.0, 120.0, 240.0)], abs=1e-12)
+
+
+class TestFirePolygons:
+    """Test suite for buffer and propagation polygons."""
+
+    def test_buffer_polygon_shape(self):
+        """Test a buffer is a closed ring of vertices at the radius."""
+        polygon = create_buffer_polygon(-22.5, -45.5, 2.0, num_points=16)
+
+        assert len(polygon) == 17
+        assert polygon[0] == polygon[-1]
+        for lat, lon in polygon:
+            assert haversine_distance(-22.5, -45.5, lat, lon) == pytest.approx(2.0, rel=1e-6)
+
+    def test_propagation_polygon_shape(self):
+        """Test the fire ellipse is closed, sized by its area and elongated."""
+        area_ha = 400.0
+        elongation = 2.0
+        polygon = _create_elliptical_polygon(-22.5, -45.5, area_ha, 30.0, elongation=elongation)
+
+        assert len(polygon) == 33
+        assert polygon[0] == polygon[-1]
+
+        radius_km = math.sqrt(area_ha / 100 / math.pi)
+        distances = [haversine_distance(-22.5, -45.5, lat, lon) for lat, lon in polygon[:-1]]
+        assert max(distances) == pytest.approx(radius_km * math.sqrt(elongation), rel=1e-6)
+        assert min(distances) == pytest.approx(radius_km / math.sqrt(elongation), rel=1e-6)
+        assert distances[0] == pytest.approx(max(distances))
+        # A 32-gon covers a little less than the ellipse it is inscribed in
+        assert calculate_polygon_area(polygon) == pytest.approx(area_ha / 100, rel=0.02)